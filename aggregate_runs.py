@@ -93,6 +93,8 @@ def aggregate(results_dir: str, include_env: bool = False) -> pd.DataFrame:
         row["n_items"] = metrics.get("n_items")
         row["tools_used_any"] = metrics.get("tools_used_any")
         row.update(_flatten_summary(metrics.get("summary_flat")))
+        row.update(metrics.get("throughput") or {})
+        row.update(metrics.get("timing_flat") or {})
 
         # Optional: include env/git metadata columns for auditing.
         if include_env and manifest and isinstance(manifest.get("env"), dict):
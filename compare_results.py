@@ -135,7 +135,22 @@ def main() -> None:
 
     metric_cols = [
         c
-        for c in ["mean_acc", "mean_shd", "novelty", "reasoning_depth", "efficiency", "consistency_rate"]
+        for c in [
+            "mean_acc",
+            "mean_shd",
+            "novelty",
+            "reasoning_depth",
+            "efficiency",
+            "consistency_rate",
+            "error_rate",
+            "p50_latency_s",
+            "p95_latency_s",
+            "p99_latency_s",
+            "tokens_per_s",
+            "mean_retries",
+            "cached_token_rate",
+            "mean_ttft_s",
+        ]
         if c in all_df.columns
     ]
     group_cols = ["benchmark", "provider", "model", "scenario", "task_type", "split"]
@@ -181,6 +196,8 @@ def main() -> None:
                 "mean_acc",
                 "mean_shd",
                 "consistency_rate",
+                "p95_latency_s",
+                "error_rate",
             ]
             if c in ranked.columns
         ]
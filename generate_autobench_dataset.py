@@ -6,13 +6,70 @@ It produces JSONL tasks compatible with `src/data/loaders/autobench_loader.py`.
 
 Usage:
   python generate_autobench_dataset.py --out data/autobench/generated_autobench.jsonl --n 200
+
+  # Parallel: 16 worker processes, one shard each, plus a manifest
+  python generate_autobench_dataset.py --out data/autobench/generated_autobench.jsonl --n 100000 --workers 16
+  #   -> data/autobench/generated_autobench-00000-of-00016.jsonl ... -00015-of-00016.jsonl
+  #   -> data/autobench/generated_autobench.manifest.json
+
+  # Binary sidecar: sample tables go to generated_autobench.samples.npy
+  python generate_autobench_dataset.py --out data/autobench/generated_autobench.jsonl --n 100000 --samples npy
+
+Task i is identical whether it is generated serially or in any shard, so the
+sharded dataset is the serial dataset split into contiguous index ranges.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from src.data.generators.autobench_generator import AutoBenchGenConfig, iter_autobench_tasks, write_jsonl
+from src.data.sample_store import SAMPLE_FORMATS
+
+
+def _shard_path(out: str, shard: int, n_shards: int) -> str:
+    stem, ext = os.path.splitext(out)
+    return f"{stem}-{shard:05d}-of-{n_shards:05d}{ext or '.jsonl'}"
+
+
+def _manifest_path(out: str) -> str:
+    stem, _ = os.path.splitext(out)
+    return f"{stem}.manifest.json"
 
-from src.data.generators.autobench_generator import AutoBenchGenConfig, generate_autobench_tasks, write_jsonl
+
+def _write_shard(cfg: AutoBenchGenConfig, start: int, stop: int, path: str, samples: str) -> int:
+    # Runs in a worker process; tasks are streamed to disk as they are generated.
+    return write_jsonl(path, iter_autobench_tasks(cfg, start, stop), samples=samples)
+
+
+def generate_sharded(cfg: AutoBenchGenConfig, out: str, n_shards: int, workers: int, samples: str = "json") -> Dict[str, Any]:
+    bounds = [(k * cfg.n_tasks // n_shards, (k + 1) * cfg.n_tasks // n_shards) for k in range(n_shards)]
+    shards: List[Dict[str, Any]] = [
+        {"path": _shard_path(out, k, n_shards), "start": a, "stop": b, "count": None} for k, (a, b) in enumerate(bounds)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_write_shard, cfg, s["start"], s["stop"], s["path"], samples): s for s in shards}
+        for fut in as_completed(futures):
+            shard = futures[fut]
+            shard["count"] = fut.result()
+            print(f"  wrote {shard['count']} tasks to {shard['path']}")
+
+    manifest = {
+        "generator": "autobench",
+        "config": asdict(cfg),
+        "n_tasks": sum(s["count"] for s in shards),
+        "samples": samples,
+        "shards": [{**s, "path": os.path.basename(s["path"])} for s in shards],
+    }
+    with open(_manifest_path(out), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
 
 
 def main() -> None:
@@ -21,12 +78,21 @@ def main() -> None:
     ap.add_argument("--n", type=int, default=200)
     ap.add_argument("--nodes", type=int, default=6)
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes; >1 writes sharded output")
+    ap.add_argument("--shards", type=int, default=None, help="Number of output shards (default: --workers)")
+    ap.add_argument("--samples", choices=SAMPLE_FORMATS, default="json", help="Store sample tables inline (json) or in a .samples.npy sidecar (npy)")
     args = ap.parse_args()
 
     cfg = AutoBenchGenConfig(n_tasks=args.n, n_nodes=args.nodes, seed=args.seed)
-    items = generate_autobench_tasks(cfg)
-    write_jsonl(args.out, items)
-    print(f"Wrote {len(items)} tasks to {args.out}")
+
+    n_shards = args.shards or args.workers
+    if n_shards > 1 or args.workers > 1:
+        manifest = generate_sharded(cfg, args.out, n_shards=max(1, n_shards), workers=max(1, args.workers), samples=args.samples)
+        print(f"Wrote {manifest['n_tasks']} tasks in {len(manifest['shards'])} shards; manifest: {_manifest_path(args.out)}")
+        return
+
+    n = write_jsonl(args.out, iter_autobench_tasks(cfg), samples=args.samples)
+    print(f"Wrote {n} tasks to {args.out}")
 
 
 if __name__ == "__main__":
@@ -2,114 +2,121 @@
 
 Usage:
     python run_experiment.py experiments/<config>.yaml
+    python run_experiment.py --resume <run_id>
 
 The runner reads the YAML config, initialises the evaluator, executes the
 benchmark, and writes all output artifacts to ``results/``.
 """
 
 import argparse
-import os
-import platform
-import subprocess
-import sys
 import time
-from typing import List, Optional
+from typing import Iterable, Optional
 
 import yaml
 from dotenv import load_dotenv
 
+from src.adapters.base import BaseAdapter
 from src.config import ExperimentConfig
+from src.data.schemas import TaskItem
 from src.eval.evaluator import Evaluator
-from src.eval.reporters import save_reports
+from src.eval.metrics_science import merge_throughput
+from src.eval.reporters import load_metrics, save_reports
 from src.utils.io import ensure_dirs
+from src.utils.manifest import build_manifest, load_manifest, make_run_id, write_manifest
+from src.utils.tracing import read_chrome_trace, trace_path
+
+
+def run_config(
+    cfg: ExperimentConfig,
+    run_id: str,
+    manifest: dict,
+    resume: bool = False,
+    items: Optional[Iterable[TaskItem]] = None,
+    adapter: Optional[BaseAdapter] = None,
+) -> Evaluator:
+    """Evaluate one config and write its artifacts; `run_sweep.py` calls this once per config."""
+    write_manifest(run_id, manifest)
+
+    evaluator = Evaluator(cfg, run_id=run_id, resume=resume, items=items, adapter=adapter)
+    summary_df, per_item_df = evaluator.run()
 
-
-def _slug(s: str) -> str:
-    return (s or "").strip().lower().replace(" ", "-").replace("_", "-")
-
-
-def _git_metadata() -> dict:
-    """Return git commit + dirty flag if available; otherwise None values."""
-
-    def _run(cmd: List[str]) -> str:
-        return subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode("utf-8").strip()
-
-    try:
-        commit = _run(["git", "rev-parse", "HEAD"])
-        try:
-            status = _run(["git", "status", "--porcelain"])
-            dirty = bool(status)
-        except Exception:
-            dirty = None
-        return {"commit": commit, "dirty": dirty}
-    except Exception:
-        return {"commit": None, "dirty": None}
-
-
-def _pip_freeze() -> Optional[List[str]]:
-    """Best-effort dependency snapshot."""
-    try:
-        out = subprocess.check_output([sys.executable, "-m", "pip", "freeze"]).decode("utf-8")
-        return [ln.strip() for ln in out.splitlines() if ln.strip()]
-    except Exception:
-        return None
-
-
-def _write_manifest(run_id: str, cfg_path: str, raw_cfg: dict):
-    manifest = {
-        "run_id": run_id,
-        "timestamp": int(time.time()),
-        "config_path": os.path.abspath(cfg_path),
-        "config": raw_cfg,
-        "env": {
-            "python": sys.version,
-            "executable": sys.executable,
-            "platform": platform.platform(),
-            "git": _git_metadata(),
-            "pip_freeze": _pip_freeze(),
-        },
-    }
-    out_path = os.path.join("results", f"{run_id}_manifest.yaml")
-    with open(out_path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(manifest, f, sort_keys=False, allow_unicode=True)
-
-
-def main(cfg_path: str):
+    previous = load_metrics(run_id) if resume else {}
+    if resume and evaluator.throughput["n_items"] == 0:
+        # Nothing new was generated: the earlier invocations' figures still describe the run.
+        timing, throughput = previous.get("timing_flat"), previous.get("throughput")
+    else:
+        timing = previous.get("timing_flat")
+        if evaluator.tracer is not None:
+            if resume:
+                # Summarise the spans of every invocation, not just this one.
+                evaluator.tracer.extend(read_chrome_trace(trace_path(run_id)))
+            evaluator.tracer.write_chrome_trace(trace_path(run_id))
+            timing = evaluator.tracer.summary()
+        throughput = merge_throughput(previous.get("throughput"), evaluator.throughput)
+
+    # results/{run_id}_predictions.jsonl is kept: score_run.py re-scores from it.
+    save_reports(summary_df, per_item_df, run_id, timing=timing, throughput=throughput)
+
+    if evaluator.cache is not None:
+        manifest["cache"] = evaluator.cache.stats()
+        write_manifest(run_id, manifest)
+    return evaluator
+
+
+def main(cfg_path: Optional[str], cache: Optional[str] = None, resume: Optional[str] = None, trace: bool = False):
     # Load environment variables from .env files in the project root (if present).
     # Existing shell environment variables are preserved.
     load_dotenv()
 
-    with open(cfg_path, 'r', encoding='utf-8') as f:
-        raw = yaml.safe_load(f)
+    if resume:
+        # Resuming reuses the run_id and the exact config recorded at start.
+        run_id = resume
+        manifest = load_manifest(run_id)
+        raw = manifest["config"]
+    else:
+        with open(cfg_path, 'r', encoding='utf-8') as f:
+            raw = yaml.safe_load(f)
     cfg = ExperimentConfig(**raw)
-
-    # Thesis-grade run_id: timestamp + cfg.name + structured tags so downstream aggregation is reliable.
-    # Example:
-    #   1700000000_autobench-study_autobench_openai_gpt4_agentic-tool-use
-    ts = int(time.time())
-    tag_parts = [
-        _slug(cfg.name),
-        _slug(cfg.data.loader),
-        _slug(cfg.model.provider),
-        _slug(cfg.model.model),
-        _slug(cfg.scenario.name),
-    ]
-    tag_parts = [p for p in tag_parts if p]
-    run_id = f"{ts}_" + "_".join(tag_parts)
+    if cache is not None:
+        cfg.run.cache = cache
+    if trace:
+        cfg.run.trace = True
 
     ensure_dirs(['results', 'logs'])
-    _write_manifest(run_id, cfg_path, raw)
-
-    evaluator = Evaluator(cfg, run_id=run_id)
-    summary_df, per_item_df = evaluator.run()
+    if resume:
+        manifest.setdefault("resumed_at", []).append(int(time.time()))
+    else:
+        run_id = make_run_id(cfg)
+        manifest = build_manifest(run_id, cfg_path, raw)
 
-    save_reports(summary_df, per_item_df, run_id)
+    evaluator = run_config(cfg, run_id, manifest, resume=bool(resume))
+    if evaluator.cache is not None:
+        print(f"  cache: {manifest['cache']['hits']} hits / {manifest['cache']['misses']} misses")
 
     print(f"✔ Done. See results/{run_id}_summary.csv and results/{run_id}_report.md")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("config", help="Path to experiment YAML")
+    parser.add_argument("config", nargs="?", help="Path to experiment YAML (omit with --resume)")
+    parser.add_argument(
+        "--cache",
+        choices=["off", "read", "readwrite"],
+        default=None,
+        help="Response cache mode (overrides run.cache in the YAML)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Continue an interrupted run from results/{RUN_ID}_predictions.jsonl",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record span timings to results/{RUN_ID}_trace.json (Chrome trace / Perfetto)",
+    )
     args = parser.parse_args()
-    main(args.config)
+    if not args.config and not args.resume:
+        parser.error("a config path is required unless --resume is given")
+    main(args.config, cache=args.cache, resume=args.resume, trace=args.trace)
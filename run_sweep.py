@@ -0,0 +1,171 @@
+"""Run many experiment configs in one process.
+
+Usage:
+    python run_sweep.py experiments/study_*.yaml
+    python run_sweep.py experiments/study_*.yaml --parallel 8 --max-concurrency 32
+
+Compared with one ``run_experiment.py`` process per config, a sweep:
+  - imports everything and snapshots the environment once,
+  - loads each distinct dataset (loader, path, limit) once and shares the items,
+  - shares one pooled provider client per provider/API key/connection
+    settings (see src/adapters/clients.py) and one rate budget per provider
+    and model,
+  - runs up to ``--parallel`` configs at a time, with ``--max-concurrency``
+    capping in-flight provider calls across all of them.
+
+Every config still gets its own run_id, its own adapter (so adapter state
+such as the mock's prompt-cache simulation does not leak between runs) and
+the usual per-run artifacts in ``results/``. Since rate budgets are shared,
+configs for the same provider and model must set the same ``rpm``, ``tpm``
+and ``max_retries``; the sweep refuses to start otherwise. A failing config is reported at the end and does not stop the
+others.
+"""
+
+import argparse
+import glob
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from dotenv import load_dotenv
+
+from src.adapters.base import BaseAdapter
+from src.adapters.bounded import BoundedAdapter
+from src.config import ExperimentConfig, ModelSpec
+from src.data.schemas import TaskItem
+from src.eval.evaluator import LOADER_MAP, build_adapter
+from src.utils.io import ensure_dirs
+from src.utils.manifest import build_manifest, env_snapshot, make_run_id
+
+from run_experiment import run_config
+
+
+def _expand(patterns: List[str]) -> List[str]:
+    """Expand globs the shell left alone (e.g. on Windows), keeping order and dropping repeats."""
+    paths: Dict[str, None] = {}
+    for p in patterns:
+        for path in sorted(glob.glob(p)) or [p]:
+            paths.setdefault(path, None)
+    return list(paths)
+
+
+def _check_rate_budgets(configs: List[Tuple[str, dict, ExperimentConfig]]) -> None:
+    """Fail when two configs give one (provider, model) different budgets; the last would silently win."""
+    seen: Dict[Tuple[str, str], Tuple[Tuple, str]] = {}
+    for path, _, cfg in configs:
+        m = cfg.model
+        budget = (m.rpm, m.tpm, m.max_retries)
+        first, first_path = seen.setdefault((m.provider, m.model), (budget, path))
+        if budget != first:
+            raise ValueError(
+                f"{path} sets rpm/tpm/max_retries={budget} for {m.provider}/{m.model}, but {first_path} sets {first}; "
+                "rate budgets are shared per provider and model, so every config of a sweep must use the same ones"
+            )
+
+
+def main(
+    patterns: List[str],
+    parallel: int = 4,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[str] = None,
+    trace: bool = False,
+) -> int:
+    load_dotenv()
+    ensure_dirs(['results', 'logs'])
+
+    # Validate every config before starting any run.
+    configs: List[Tuple[str, dict, ExperimentConfig]] = []
+    for path in _expand(patterns):
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = yaml.safe_load(f)
+        cfg = ExperimentConfig(**raw)
+        if cache is not None:
+            cfg.run.cache = cache
+        if trace:
+            cfg.run.trace = True
+        configs.append((path, raw, cfg))
+    if not configs:
+        print("No configs to run.")
+        return 1
+    _check_rate_budgets(configs)
+
+    env = env_snapshot()
+
+    datasets: Dict[Tuple, List[TaskItem]] = {}
+    for _, _, cfg in configs:
+        key = (cfg.data.loader, cfg.data.path, cfg.data.limit)
+        if key not in datasets:
+            datasets[key] = list(LOADER_MAP[cfg.data.loader](cfg.data.path, cfg.data.limit))
+
+    slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def _adapter(model: ModelSpec) -> BaseAdapter:
+        adapter = build_adapter(model)
+        return BoundedAdapter(adapter, slots) if slots is not None else adapter
+
+    ts = int(time.time())
+    run_ids: Dict[str, None] = {}
+    jobs = []
+    for path, raw, cfg in configs:
+        run_id = make_run_id(cfg, ts)
+        n = 2
+        while run_id in run_ids:
+            run_id = f"{make_run_id(cfg, ts)}-{n}"
+            n += 1
+        run_ids[run_id] = None
+        jobs.append((path, run_id, build_manifest(run_id, path, raw, env=env), cfg, _adapter(cfg.model)))
+
+    print(
+        f"Sweep: {len(jobs)} configs, {len(datasets)} datasets; "
+        f"parallel={parallel}, max_concurrency={max_concurrency or 'unbounded'}"
+    )
+    failed: List[Tuple[str, str]] = []
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="config") as pool:
+        futures = {
+            pool.submit(
+                run_config,
+                cfg,
+                run_id,
+                manifest,
+                items=datasets[(cfg.data.loader, cfg.data.path, cfg.data.limit)],
+                adapter=adapter,
+            ): (path, run_id)
+            for path, run_id, manifest, cfg, adapter in jobs
+        }
+        for fut in as_completed(futures):
+            path, run_id = futures[fut]
+            try:
+                fut.result()
+                print(f"✔ {path} -> results/{run_id}_summary.csv")
+            except Exception as e:
+                failed.append((path, f"{type(e).__name__}: {e}"))
+                print(f"✘ {path}: {type(e).__name__}: {e}")
+
+    print(f"Done: {len(jobs) - len(failed)}/{len(jobs)} configs succeeded.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("configs", nargs="+", help="Experiment YAMLs or glob patterns")
+    parser.add_argument("--parallel", type=int, default=4, help="Configs evaluated at the same time")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Cap on provider calls in flight across all configs (default: no cap beyond run.concurrency)",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=["off", "read", "readwrite"],
+        default=None,
+        help="Response cache mode for every config (overrides run.cache in the YAMLs)",
+    )
+    parser.add_argument("--trace", action="store_true", help="Record span timings for every config (results/{RUN_ID}_trace.json)")
+    args = parser.parse_args()
+    if args.parallel < 1 or (args.max_concurrency is not None and args.max_concurrency < 1):
+        parser.error("--parallel and --max-concurrency must be at least 1")
+    sys.exit(main(args.configs, parallel=args.parallel, max_concurrency=args.max_concurrency, cache=args.cache, trace=args.trace))
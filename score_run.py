@@ -0,0 +1,71 @@
+"""Re-score a finished run from its stored predictions, without calling any model.
+
+Usage:
+    python score_run.py <run_id>
+    python score_run.py <run_id> --workers 8
+
+Reads ``results/{run_id}_predictions.jsonl`` and the metrics settings recorded
+in ``results/{run_id}_manifest.yaml``, scores every prediction with the
+current scorers and rewrites the run's summary, items, report and metrics
+files. Useful after a scorer or metric changes. Items whose model call
+failed have no stored prediction and are left out. The run's throughput and
+timing blocks in ``metrics.json`` are kept as they were.
+"""
+
+import argparse
+import os
+import time
+from typing import Optional
+
+import pandas as pd
+
+from src.config import ExperimentConfig
+from src.eval.checkpoint import ItemCheckpoint
+from src.eval.metrics_science import summarize_metrics
+from src.eval.reporters import load_metrics, save_reports
+from src.eval.scoring import novelty_sketch, predictions_path, score_records
+from src.tools.retrieval_tool import RetrievalTool
+from src.utils.manifest import load_manifest, write_manifest
+from src.utils.paths import data_path
+
+
+def main(run_id: str, workers: Optional[int] = None):
+    manifest = load_manifest(run_id)
+    cfg = ExperimentConfig(**manifest["config"])
+
+    path = predictions_path(run_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Cannot re-score {run_id}: {path} not found")
+    records = ItemCheckpoint(path).records()
+
+    retrieval = RetrievalTool(
+        corpus_path=data_path("corpus", "mini_science_corpus.jsonl"),
+        index_path=os.path.join("results", "cache", "retrieval_bm25.pkl"),
+    )
+    sketch = novelty_sketch(cfg.metrics, retrieval)
+
+    workers = workers or cfg.run.score_workers
+    rows = score_records(records, workers=workers, corpus_sketch=sketch)
+    per_item_df = pd.DataFrame(rows)
+    summary_df = summarize_metrics(per_item_df)
+    # Throughput and span timings describe the original inference run, which
+    # re-scoring does not repeat, so they are carried over unchanged.
+    previous = load_metrics(run_id)
+    save_reports(summary_df, per_item_df, run_id, timing=previous.get("timing_flat"), throughput=previous.get("throughput"))
+
+    manifest.setdefault("rescored_at", []).append(int(time.time()))
+    write_manifest(run_id, manifest)
+    print(f"✔ Re-scored {len(rows)} predictions. See results/{run_id}_summary.csv")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("run_id", help="Run ID of a finished run in results/")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Scoring processes (overrides run.score_workers recorded for the run)",
+    )
+    args = parser.parse_args()
+    main(args.run_id, workers=args.workers)
@@ -1,17 +1,59 @@
 """LLM provider adapters.
 
 Each adapter wraps a provider's API behind the common `BaseAdapter.generate()`
-interface so the evaluation loop is provider-agnostic.
+interface (and its asyncio counterpart `agenerate()`) so the evaluation loop
+is provider-agnostic.
+
+Provider SDKs are slow to import (seconds for openai + anthropic + google),
+so `ADAPTERS` maps each provider to its module and imports it on first
+lookup: a ``provider: mock`` run never loads any SDK.
 """
 
-from .mock_adapter import MockAdapter
-from .openai_adapter import OpenAIAdapter
-from .anthropic_adapter import AnthropicAdapter
-from .google_adapter import GoogleAdapter
+import importlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, Type
+
+from .base import BaseAdapter
 
-ADAPTERS = {
-    "mock": MockAdapter,
-    "openai": OpenAIAdapter,
-    "anthropic": AnthropicAdapter,
-    "google": GoogleAdapter,
+_ADAPTER_PATHS = {
+    "mock": ("mock_adapter", "MockAdapter"),
+    "openai": ("openai_adapter", "OpenAIAdapter"),
+    "anthropic": ("anthropic_adapter", "AnthropicAdapter"),
+    "google": ("google_adapter", "GoogleAdapter"),
 }
+
+
+class _LazyAdapters(Mapping):
+    """Read-only provider -> adapter class mapping that imports each adapter module on demand."""
+
+    def __init__(self, paths: Dict[str, tuple]):
+        self._paths = paths
+        self._loaded: Dict[str, Type[BaseAdapter]] = {}
+
+    def __getitem__(self, provider: str) -> Type[BaseAdapter]:
+        cls = self._loaded.get(provider)
+        if cls is None:
+            module, name = self._paths[provider]
+            cls = getattr(importlib.import_module(f".{module}", __name__), name)
+            self._loaded[provider] = cls
+        return cls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __repr__(self) -> str:
+        return f"ADAPTERS({list(self._paths)})"
+
+
+ADAPTERS = _LazyAdapters(_ADAPTER_PATHS)
+
+
+def __getattr__(name: str):
+    # Keep `from src.adapters import OpenAIAdapter` working without importing every SDK up front.
+    for provider, (_, cls_name) in _ADAPTER_PATHS.items():
+        if cls_name == name:
+            return ADAPTERS[provider]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
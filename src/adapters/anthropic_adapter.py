@@ -1,11 +1,17 @@
-from .base import BaseAdapter
-from typing import Dict, Any
+from .base import BaseAdapter, split_prompt, split_rationale
+from .batch import BatchResult, collect_results, wait_for_batch
+from .clients import HttpOptions, shared_async_client, shared_client
+from .rate_limit import AdapterError
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 import os
 import anthropic
 
 class AnthropicAdapter(BaseAdapter):
-    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None):
-        super().__init__(model, temperature, top_p, max_tokens, tools)
+    provider = "anthropic"
+    supports_stream = True
+
+    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None, http: Optional[HttpOptions] = None):
+        super().__init__(model, temperature, top_p, max_tokens, tools, http)
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError(
@@ -15,42 +21,129 @@ class AnthropicAdapter(BaseAdapter):
                 "2. Set it, e.g.: export ANTHROPIC_API_KEY='YOUR_ANTHROPIC_KEY_HERE'\n"
                 "3. Or use the mock adapter by changing 'provider: anthropic' to 'provider: mock' in your YAML"
             )
-        self.client = anthropic.Anthropic(api_key=api_key)
-    
-    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        self._api_key = api_key
+        self.client = shared_client(
+            self.provider,
+            api_key,
+            self.http,
+            lambda: anthropic.Anthropic(
+                api_key=api_key,
+                max_retries=0,
+                timeout=self.http.timeout_s,
+                http_client=anthropic.DefaultHttpxClient(limits=self.http.limits(), http2=self.http.http2),
+            ),
+        )
+
+    @property
+    def async_client(self) -> anthropic.AsyncAnthropic:
+        return shared_async_client(
+            self.provider,
+            self._api_key,
+            self.http,
+            lambda: anthropic.AsyncAnthropic(
+                api_key=self._api_key,
+                max_retries=0,
+                timeout=self.http.timeout_s,
+                http_client=anthropic.DefaultAsyncHttpxClient(limits=self.http.limits(), http2=self.http.http2),
+            ),
+        )
+
+    def _request(self, prompt: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        prefix, suffix = split_prompt(prompt, meta)
+        if prefix:
+            # Cache breakpoint after the stable prefix; later calls sharing it read it from the cache.
+            content: Any = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+            if suffix:
+                content.append({"type": "text", "text": suffix})
+        else:
+            content = prompt
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    def _parse(self, response) -> Dict[str, Any]:
+        content = response.content[0].text if response.content else ""
+        prediction, rationale = split_rationale(content)
+        usage = self._prompt_usage(response.usage)
+        usage["completion_tokens"] = response.usage.output_tokens
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return {
+            "content": prediction,
+            "rationale": rationale,
+            "usage": usage,
+        }
+
+    @staticmethod
+    def _prompt_usage(usage) -> Dict[str, int]:
+        # input_tokens excludes cached tokens: add them back so prompt_tokens means the same for every provider.
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return {
+            "prompt_tokens": usage.input_tokens + cache_read + cache_write,
+            "cached_tokens": cache_read,
+            "cache_write_tokens": cache_write,
+        }
+
+    @classmethod
+    def _stream_event(cls, event, usage: Dict[str, int]) -> str:
+        """Text carried by a streaming event; usage events update `usage`."""
+        if event.type == "message_start":
+            usage.update(cls._prompt_usage(event.message.usage))
+        elif event.type == "message_delta":
+            usage["completion_tokens"] = event.usage.output_tokens
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return event.delta.text
+        return ""
+
+    def _stream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        stream = self.client.messages.create(**self._request(prompt, meta), stream=True)
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                top_p=self.top_p,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            content = response.content[0].text if response.content else ""
-            
-            # Extract rationale (everything after "Rationale:" if present)
-            parts = content.split("Rationale:", 1)
-            if len(parts) == 2:
-                prediction = parts[0].strip()
-                rationale = parts[1].strip()
+            for event in stream:
+                text = self._stream_event(event, usage)
+                if text:
+                    yield text
+        finally:
+            stream.close()
+
+    async def _astream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> AsyncIterator[str]:
+        stream = await self.async_client.messages.create(**self._request(prompt, meta), stream=True)
+        try:
+            async for event in stream:
+                text = self._stream_event(event, usage)
+                if text:
+                    yield text
+        finally:
+            await stream.close()
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._request(prompt, meta)
+        response = self._call(lambda: self.client.messages.create(**request), prompt)
+        return self._parse(response)
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._request(prompt, meta)
+        response = await self._acall(lambda: self.async_client.messages.create(**request), prompt)
+        return self._parse(response)
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[BatchResult]:
+        """Run the requests as one Anthropic Message Batch."""
+        batch_requests = [{"custom_id": str(i), "params": self._request(prompt, meta)} for i, (prompt, meta) in enumerate(requests)]
+        job = self._call_api(lambda: self.client.messages.batches.create(requests=batch_requests))
+        job = wait_for_batch(
+            lambda: self._call_api(lambda: self.client.messages.batches.retrieve(job.id)),
+            lambda j: j.processing_status == "ended",
+            poll_s,
+        )
+
+        found: Dict[int, BatchResult] = {}
+        for entry in self._call_api(lambda: list(self.client.messages.batches.results(job.id))):
+            result = entry.result
+            if result.type == "succeeded":
+                found[int(entry.custom_id)] = self._parse(result.message)
             else:
-                prediction = content.strip()
-                rationale = "Generated scientific hypothesis using language model reasoning."
-            
-            return {
-                "content": prediction,
-                "rationale": rationale,
-                "usage": {
-                    "prompt_tokens": response.usage.input_tokens,
-                    "completion_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
-                }
-            }
-        except Exception as e:
-            # Fallback for errors
-            return {
-                "content": f"Error: {str(e)}",
-                "rationale": "Failed to generate response due to API error.",
-                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-            }
+                found[int(entry.custom_id)] = AdapterError(f"Batch request {result.type}: {getattr(result, 'error', None)}")
+        return collect_results(len(requests), found, job.processing_status)
@@ -1,7 +1,37 @@
 """Abstract base class that all LLM provider adapters must implement."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .clients import HttpOptions
+from .rate_limit import AdapterError, ProviderLimits, acall_with_retries, call_with_retries, provider_limits
+
+DEFAULT_RATIONALE = "Generated scientific hypothesis using language model reasoning."
+
+# Completion predicate for streamed answers: the length of the finished answer
+# at the start of the text received so far, or None while it is incomplete.
+StreamEnd = Callable[[str], Optional[int]]
+
+
+def split_rationale(content: str) -> Tuple[str, str]:
+    """Split raw model text into (prediction, rationale) at the first "Rationale:" marker."""
+    parts = content.split("Rationale:", 1)
+    if len(parts) == 2:
+        return parts[0].strip(), parts[1].strip()
+    return content.strip(), DEFAULT_RATIONALE
+
+
+def split_prompt(prompt: str, meta: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """Split a prompt into (stable prefix, varying suffix) at ``meta["cache_prefix_chars"]``.
+
+    Scenarios that send several prompts sharing a head (the agentic loop) set
+    the key; providers can then cache the prefix across calls. Without it the
+    prefix is empty.
+    """
+    n = int((meta or {}).get("cache_prefix_chars") or 0)
+    return prompt[:n], prompt[n:]
 
 
 class BaseAdapter(ABC):
@@ -9,15 +39,157 @@ class BaseAdapter(ABC):
 
     Subclasses must implement `generate()`, which takes a prompt string and
     task metadata and returns a dict with keys: content, rationale, usage.
+    ``usage`` holds prompt_tokens, completion_tokens and total_tokens, plus
+    cached_tokens: the prompt tokens the provider served from its prompt cache.
+
+    `agenerate()` is the asyncio counterpart used by the async evaluation
+    path. The default implementation runs `generate()` in a worker thread;
+    provider adapters override it with their SDK's native async client so
+    many requests can be in flight on one event loop.
+
+    `generate_stream()` / `agenerate_stream()` answer through the provider's
+    streaming endpoint and cancel the request as soon as a completion
+    predicate says the answer is finished (see `streaming.py`). Adapters
+    with such an endpoint set ``supports_stream`` and implement
+    `_stream_chunks()` / `_astream_chunks()`; the others answer with
+    `generate()`.
+
+    `generate_batch()` answers many prompts at once for ``run.backend: batch``.
+    The default calls `generate()` for each; adapters with a provider batch
+    endpoint override it (see `batch.py`).
+
+    Provider calls should go through `_call()` / `_acall()`, which apply the
+    provider's shared rate limits and retry policy (see `rate_limit.py`) and
+    raise `AdapterError` when a request ultimately fails. SDK clients come
+    from `clients.py`, which shares them (and their connection pools) across
+    all adapters in the process.
     """
 
-    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools: Optional[List[str]] = None):
+    provider: str = "base"
+    supports_stream: bool = False
+
+    def __init__(
+        self,
+        model: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+        tools: Optional[List[str]] = None,
+        http: Optional[HttpOptions] = None,
+        limits: Optional[ProviderLimits] = None,
+    ):
+        """`limits` lets a wrapper adapter share its inner adapter's budgets instead of registering its own."""
         self.model = model
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
         self.tools = tools or []
+        self.http = http or HttpOptions()
+        self.limits = limits if limits is not None else provider_limits(self.provider, model)
+
+    def _estimate_tokens(self, prompt: str) -> int:
+        # Providers count the completion budget against TPM up front; ~4 chars per prompt token.
+        return len(prompt) // 4 + int(self.max_tokens)
+
+    def _call(self, fn: Callable[[], Any], prompt: str) -> Any:
+        result, _ = call_with_retries(fn, self.limits, self._estimate_tokens(prompt))
+        return result
+
+    def _call_api(self, fn: Callable[[], Any]) -> Any:
+        # Batch bookkeeping calls (upload, create, poll) carry no prompt tokens.
+        result, _ = call_with_retries(fn, self.limits, 0)
+        return result
+
+    async def _acall(self, fn: Callable[[], Awaitable[Any]], prompt: str) -> Any:
+        result, _ = await acall_with_retries(fn, self.limits, self._estimate_tokens(prompt))
+        return result
 
     @abstractmethod
     def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
         ...
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.generate, prompt, meta)
+
+    def _stream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        """Yield completion text as it arrives, filling `usage` from stream events; closing the generator cancels the request."""
+        raise NotImplementedError
+
+    def _astream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _stream_output(prompt: str, text: str, usage: Dict[str, int], ttft_s: Optional[float], stopped: bool) -> Dict[str, Any]:
+        prediction, rationale = split_rationale(text)
+        # A cancelled stream never gets the provider's final token counts. The
+        # missing ones are estimated from word counts and flagged, so efficiency
+        # and token throughput leave the item out (see metrics_science.py).
+        if "prompt_tokens" not in usage or "completion_tokens" not in usage:
+            usage.setdefault("prompt_tokens", len(prompt.split()))
+            usage.setdefault("completion_tokens", len(text.split()))
+            usage["usage_estimated"] = True
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return {
+            "content": prediction,
+            "rationale": rationale,
+            "usage": usage,
+            "stream": {"ttft_s": ttft_s, "stopped_early": stopped},
+        }
+
+    def _read_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd]) -> Dict[str, Any]:
+        usage: Dict[str, int] = {}
+        text, ttft_s, stopped = "", None, False
+        start = time.perf_counter()
+        chunks = self._stream_chunks(prompt, meta, usage)
+        try:
+            for chunk in chunks:
+                if ttft_s is None and chunk:
+                    ttft_s = time.perf_counter() - start
+                text += chunk
+                n = end(text) if end is not None else None
+                if n is not None:
+                    text, stopped = text[:n], True
+                    break
+        finally:
+            chunks.close()
+        return self._stream_output(prompt, text, usage, ttft_s, stopped)
+
+    async def _aread_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd]) -> Dict[str, Any]:
+        usage: Dict[str, int] = {}
+        text, ttft_s, stopped = "", None, False
+        start = time.perf_counter()
+        chunks = self._astream_chunks(prompt, meta, usage)
+        try:
+            async for chunk in chunks:
+                if ttft_s is None and chunk:
+                    ttft_s = time.perf_counter() - start
+                text += chunk
+                n = end(text) if end is not None else None
+                if n is not None:
+                    text, stopped = text[:n], True
+                    break
+        finally:
+            await chunks.aclose()
+        return self._stream_output(prompt, text, usage, ttft_s, stopped)
+
+    def generate_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd] = None) -> Dict[str, Any]:
+        """`generate()` over a stream, cut at `end(text)`; the output gains ``stream: {ttft_s, stopped_early}``."""
+        if not self.supports_stream:
+            return self.generate(prompt, meta)
+        # A stream that fails part-way is retried from the start, like any other call.
+        return self._call(lambda: self._read_stream(prompt, meta, end), prompt)
+
+    async def agenerate_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd] = None) -> Dict[str, Any]:
+        if not self.supports_stream:
+            return await self.agenerate(prompt, meta)
+        return await self._acall(lambda: self._aread_stream(prompt, meta, end), prompt)
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[Any]:
+        """Answer (prompt, meta) requests; one output dict or `AdapterError` per request, in order."""
+        results: List[Any] = []
+        for prompt, meta in requests:
+            try:
+                results.append(self.generate(prompt, meta))
+            except AdapterError as e:
+                results.append(e)
+        return results
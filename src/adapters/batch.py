@@ -0,0 +1,132 @@
+"""Provider batch jobs: submit many prompts at once, poll, map results back.
+
+With ``run.backend: batch`` the evaluator builds the prompts of a whole
+chunk of items (``run.batch_size``) and hands them to
+`BaseAdapter.generate_batch()`. Adapters with a batch endpoint (OpenAI
+Batches, Anthropic Message Batches) submit them as one job, wait for it with
+`wait_for_batch()` and return one result per request, in request order: the
+usual output dict, or an `AdapterError` for a request that failed.
+
+Batch endpoints have much higher throughput limits and lower per-token
+prices than the interactive ones, at the cost of latency (minutes to hours).
+
+`LocalBatchServer` is an in-process stand-in for such an endpoint (upload a
+JSONL request file, create a job, poll it, download the JSONL output file).
+The mock adapter runs its batches through it, so the whole submit/poll/map
+path is exercised offline.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple, TypeVar, Union
+
+from .rate_limit import AdapterError
+
+T = TypeVar("T")
+
+BatchRequest = Tuple[str, Dict[str, Any]]  # (prompt, meta), as passed to generate()
+BatchResult = Union[Dict[str, Any], AdapterError]
+
+# Providers complete batches within 24 h; allow an hour on top for queueing.
+MAX_WAIT_S = 25 * 3600
+
+
+def encode_jsonl(rows: Iterable[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+
+
+def decode_jsonl(data: Union[str, bytes]) -> List[Dict[str, Any]]:
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def wait_for_batch(poll: Callable[[], T], done: Callable[[T], bool], poll_s: float, timeout_s: float = MAX_WAIT_S) -> T:
+    """Call `poll` every `poll_s` seconds until `done(job)`; return the final job."""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        job = poll()
+        if done(job):
+            return job
+        if time.monotonic() >= deadline:
+            raise AdapterError(f"Batch job not finished after {timeout_s:.0f}s")
+        time.sleep(poll_s)
+
+
+def collect_results(n: int, found: Dict[int, BatchResult], status: str) -> List[BatchResult]:
+    """Results in request order; requests the job returned nothing for become errors."""
+    return [found.get(i, AdapterError(f"No result for batch request {i} (job status: {status})")) for i in range(n)]
+
+
+class LocalBatchServer:
+    """In-process batch endpoint modelled on the OpenAI Files + Batches API.
+
+    Request lines are ``{"custom_id": ..., "body": {...}}``; `handler(body)`
+    produces each response body. Output lines are ``{"custom_id": ...,
+    "response": {"body": ...}}`` or ``{"custom_id": ..., "error": {"message": ...}}``.
+    A job reports ``in_progress`` for its first `polls_until_done` retrievals
+    and ``completed`` after that.
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]], polls_until_done: int = 0):
+        self.handler = handler
+        self.polls_until_done = polls_until_done
+        self._files: Dict[str, bytes] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}_{next(self._ids)}"
+
+    def upload(self, data: bytes) -> str:
+        file_id = self._new_id("file")
+        self._files[file_id] = data
+        return file_id
+
+    def content(self, file_id: str) -> bytes:
+        return self._files[file_id]
+
+    def create(self, input_file_id: str) -> Dict[str, Any]:
+        out = []
+        for line in decode_jsonl(self._files[input_file_id]):
+            try:
+                out.append({"custom_id": line["custom_id"], "response": {"body": self.handler(line["body"])}})
+            except Exception as e:
+                out.append({"custom_id": line["custom_id"], "error": {"message": f"{type(e).__name__}: {e}"}})
+        job = {
+            "id": self._new_id("batch"),
+            "status": "in_progress",
+            "output_file_id": self.upload(encode_jsonl(out)),
+            "_polls_left": self.polls_until_done,
+        }
+        self._jobs[job["id"]] = job
+        return self.retrieve(job["id"], count=False)
+
+    def retrieve(self, batch_id: str, count: bool = True) -> Dict[str, Any]:
+        job = self._jobs[batch_id]
+        with self._lock:
+            if count and job["_polls_left"] > 0:
+                job["_polls_left"] -= 1
+            if job["_polls_left"] == 0:
+                job["status"] = "completed"
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def run(self, requests: List[BatchRequest], poll_s: float, timeout_s: float = MAX_WAIT_S) -> List[BatchResult]:
+        """Submit `requests` as one job, wait for it and return results in request order."""
+        file_id = self.upload(encode_jsonl({"custom_id": str(i), "body": {"prompt": p, "meta": m}} for i, (p, m) in enumerate(requests)))
+        batch_id = self.create(file_id)["id"]
+        job = wait_for_batch(lambda: self.retrieve(batch_id), lambda j: j["status"] == "completed", poll_s, timeout_s)
+        found: Dict[int, BatchResult] = {}
+        for line in decode_jsonl(self.content(job["output_file_id"])):
+            i = int(line["custom_id"])
+            if line.get("error"):
+                found[i] = AdapterError(line["error"]["message"])
+            else:
+                found[i] = line["response"]["body"]
+        return collect_results(len(requests), found, job["status"])
@@ -0,0 +1,84 @@
+"""Adapter wrapper that caps in-flight requests across several runs.
+
+Within one run `run.concurrency` bounds the number of items in flight. When
+several runs share an adapter (see `run_sweep.py`) their workers add up;
+wrapping the shared adapter in a `BoundedAdapter` holding one semaphore keeps
+the total number of concurrent provider calls under a single cap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseAdapter, StreamEnd
+
+_POLL_S = 0.1
+
+
+class BoundedAdapter(BaseAdapter):
+    """Forwards to `inner` while holding one slot of a shared `threading.BoundedSemaphore`."""
+
+    def __init__(self, inner: BaseAdapter, slots: threading.BoundedSemaphore):
+        super().__init__(inner.model, inner.temperature, inner.top_p, inner.max_tokens, inner.tools, limits=inner.limits)
+        self.inner = inner
+        self.provider = inner.provider
+        self.slots = slots
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        with self.slots:
+            return self.inner.generate(prompt, meta)
+
+    async def _acquire(self) -> None:
+        # Runs on different event loops share the semaphore, so it cannot be an
+        # asyncio one; wait for a slot off the loop only when none is free.
+        if self.slots.acquire(blocking=False):
+            return
+        lock = threading.Lock()
+        state = {"cancelled": False, "held": False}
+
+        def wait() -> None:
+            # Poll so a cancelled wait stops within _POLL_S instead of pinning a thread.
+            while not state["cancelled"]:
+                if self.slots.acquire(timeout=_POLL_S):
+                    with lock:
+                        if state["cancelled"]:
+                            self.slots.release()
+                        else:
+                            state["held"] = True
+                    return
+
+        try:
+            await asyncio.to_thread(wait)
+        except asyncio.CancelledError:
+            # The waiting thread outlives the cancelled await; whichever side
+            # sees the other's flag hands the slot back, so it is never leaked.
+            with lock:
+                state["cancelled"] = True
+                if state["held"]:
+                    self.slots.release()
+            raise
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        await self._acquire()
+        try:
+            return await self.inner.agenerate(prompt, meta)
+        finally:
+            self.slots.release()
+
+    def generate_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd] = None) -> Dict[str, Any]:
+        with self.slots:
+            return self.inner.generate_stream(prompt, meta, end)
+
+    async def agenerate_stream(self, prompt: str, meta: Dict[str, Any], end: Optional[StreamEnd] = None) -> Dict[str, Any]:
+        await self._acquire()
+        try:
+            return await self.inner.agenerate_stream(prompt, meta, end)
+        finally:
+            self.slots.release()
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[Any]:
+        # A batch job is one request to the provider, however many prompts it carries.
+        with self.slots:
+            return self.inner.generate_batch(requests, poll_s=poll_s)
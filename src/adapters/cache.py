@@ -0,0 +1,169 @@
+"""Persistent, content-addressed cache for adapter responses.
+
+Responses are stored in a SQLite file (default ``results/cache/responses.sqlite``)
+keyed on a hash of everything that determines the request: provider, model,
+sampling parameters and the exact prompt. Re-running a config after changing
+only a scorer then replays stored outputs instead of paying for new calls.
+
+Only successful responses are written; failed calls raise `AdapterError`
+before anything is stored. With ``temperature > 0`` a hit replays one earlier
+sample rather than drawing a new one, so enable the cache for stochastic
+configs only when that is intended.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseAdapter
+
+CACHE_MODES = ("off", "read", "readwrite")
+
+
+def cache_key(provider: str, model: str, temperature: float, top_p: float, max_tokens: int, prompt: str) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([provider, model, float(temperature), float(top_p), int(max_tokens), prompt_hash])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with size-bounded LRU eviction.
+
+    `mode` is one of:
+      - "read":      serve hits, never write
+      - "readwrite": serve hits and store new responses
+    """
+
+    def __init__(self, path: str, mode: str = "readwrite", max_bytes: int = 1024 * 1024 * 1024):
+        if mode not in ("read", "readwrite"):
+            raise ValueError(f"Unsupported cache mode: {mode!r} (expected 'read' or 'readwrite')")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_access)")
+        self._total_bytes = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.mode == "readwrite":
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        if self.mode != "readwrite":
+            return
+        blob = json.dumps(value, ensure_ascii=False)
+        size = len(blob.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses(key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, size, time.time()),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self.writes += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the store fits in `max_bytes`."""
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else None,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "size_bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedAdapter(BaseAdapter):
+    """Wraps any adapter and serves repeated requests from a `ResponseCache`."""
+
+    def __init__(self, inner: BaseAdapter, provider: str, cache: ResponseCache):
+        super().__init__(inner.model, inner.temperature, inner.top_p, inner.max_tokens, inner.tools, limits=inner.limits)
+        self.inner = inner
+        self.provider = provider
+        self.cache = cache
+
+    def _key(self, prompt: str) -> str:
+        return cache_key(self.provider, self.model, self.temperature, self.top_p, self.max_tokens, prompt)
+
+    def _put(self, key: str, out: Dict[str, Any]) -> None:
+        # A stream cut short by a completion check is not the whole answer to the prompt.
+        if not (out.get("stream") or {}).get("stopped_early"):
+            self.cache.put(key, out)
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        key = self._key(prompt)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        out = self.inner.generate(prompt, meta)
+        self._put(key, out)
+        return out
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        key = self._key(prompt)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        out = await self.inner.agenerate(prompt, meta)
+        self._put(key, out)
+        return out
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[Any]:
+        """Serve hits from the cache and send only the misses to the provider as one batch."""
+        keys = [self._key(prompt) for prompt, _ in requests]
+        results: List[Any] = [self.cache.get(key) for key in keys]
+        misses = [i for i, hit in enumerate(results) if hit is None]
+        if misses:
+            outs = self.inner.generate_batch([requests[i] for i in misses], poll_s=poll_s)
+            for i, out in zip(misses, outs):
+                results[i] = out
+                if isinstance(out, dict):
+                    self._put(keys[i], out)
+        return results
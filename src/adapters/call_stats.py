@@ -0,0 +1,100 @@
+"""Per-item adapter call statistics: calls made, retries, time spent waiting.
+
+The evaluator opens a `collect_call_stats()` block around each item; every
+adapter call made inside it (by the evaluator or by an agentic scenario) is
+wrapped in `timed_call()`, and `rate_limit.call_with_retries` reports retried
+attempts through `add_retries()`; streamed calls add their time to first
+token through `record_stream()`. The stats live in a contextvar, so
+concurrent items (threads or asyncio tasks) each count their own calls.
+Outside a collecting block all of this is a no-op.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    retries: int = 0
+    adapter_s: float = 0.0
+    streamed: int = 0
+    first_token_s: float = 0.0
+    stopped_early: int = 0
+
+    def as_row(self) -> Dict[str, float]:
+        row = {"adapter_calls": self.calls, "retries": self.retries, "adapter_latency_s": self.adapter_s}
+        if self.streamed:
+            # Mean time to first token over the item's streamed calls.
+            row["ttft_s"] = self.first_token_s / self.streamed
+            row["stopped_early"] = self.stopped_early
+        return row
+
+
+_CURRENT: ContextVar[Optional[CallStats]] = ContextVar("call_stats", default=None)
+
+
+@contextlib.contextmanager
+def collect_call_stats() -> Iterator[CallStats]:
+    stats = CallStats()
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+class _TimedCall:
+    __slots__ = ("stats", "start")
+
+    def __init__(self, stats: CallStats):
+        self.stats = stats
+
+    def __enter__(self) -> "_TimedCall":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stats.calls += 1
+        self.stats.adapter_s += time.perf_counter() - self.start
+        return False
+
+
+class _NoCall:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoCall":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NO_CALL = _NoCall()
+
+
+def timed_call():
+    """Context manager counting one adapter call (and its duration) for the current item."""
+    stats = _CURRENT.get()
+    return _NO_CALL if stats is None else _TimedCall(stats)
+
+
+def record_stream(ttft_s: Optional[float], stopped_early: bool) -> None:
+    """Count one streamed call (see `streaming.StreamingAdapter`) for the current item."""
+    stats = _CURRENT.get()
+    if stats is None or ttft_s is None:
+        return
+    stats.streamed += 1
+    stats.first_token_s += ttft_s
+    stats.stopped_early += int(stopped_early)
+
+
+def add_retries(n: int) -> None:
+    stats = _CURRENT.get()
+    if stats is not None and n:
+        stats.retries += n
@@ -0,0 +1,90 @@
+"""Process-wide provider SDK clients over pooled HTTP connections.
+
+Adapters do not build their own SDK client: they ask `shared_client()` for
+the one keyed by (provider, API key, `HttpOptions`), so every adapter and
+every `Evaluator` in the process (a sweep runs many) reuses the same
+keep-alive connection pool instead of paying new TLS handshakes per run.
+
+The pool is an httpx one sized by ``model.max_connections`` (all of them kept
+alive, so high-concurrency runs do not churn connections), with
+``model.timeout_s`` per request and optional HTTP/2 (``model.http2``, needs
+the ``h2`` package).
+
+Async clients are bound to the event loop they are used on, so
+`shared_async_client()` keeps one per loop; `aclose_loop_clients()` closes
+those of the running loop before it ends (the async evaluator does this).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HttpOptions:
+    """Connection settings of a provider client (from `ModelSpec`)."""
+
+    timeout_s: float = 600.0
+    max_connections: int = 100
+    http2: bool = False
+
+    def limits(self):
+        import httpx
+
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+
+    def check(self) -> None:
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ValueError("model.http2: true needs the h2 package: pip install 'httpx[http2]'") from None
+
+
+_LOCK = threading.Lock()
+_SYNC: Dict[Tuple, Any] = {}
+_ASYNC: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _key(provider: str, api_key: str, opts: HttpOptions) -> Tuple:
+    # Hash the key so it never shows up in a repr of the registry.
+    return (provider, hashlib.sha256(api_key.encode("utf-8")).hexdigest(), opts)
+
+
+def shared_client(provider: str, api_key: str, opts: HttpOptions, build: Callable[[], T]) -> T:
+    """The process-wide client for (provider, api_key, opts); `build()` creates it on first use."""
+    key = _key(provider, api_key, opts)
+    with _LOCK:
+        client = _SYNC.get(key)
+        if client is None:
+            opts.check()
+            client = _SYNC[key] = build()
+    return client
+
+
+def shared_async_client(provider: str, api_key: str, opts: HttpOptions, build: Callable[[], T]) -> T:
+    """Like `shared_client()`, for the running event loop."""
+    loop = asyncio.get_running_loop()
+    key = _key(provider, api_key, opts)
+    with _LOCK:
+        clients = _ASYNC.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            opts.check()
+            client = clients[key] = build()
+    return client
+
+
+async def aclose_loop_clients() -> None:
+    """Close and forget the async clients of the running event loop."""
+    with _LOCK:
+        clients = _ASYNC.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
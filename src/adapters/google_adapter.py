@@ -1,28 +1,34 @@
 """Google Gemini adapter for the benchmark pipeline.
 
-Uses the google-generativeai SDK to call Gemini models.
-Includes automatic retry with exponential back-off for free-tier
-rate limits (HTTP 429).
+Uses the google-generativeai SDK to call Gemini models. Free-tier rate
+limits (HTTP 429) are handled by the shared retry/backoff policy in
+`rate_limit.py`; set `model.rpm` in the YAML to pace requests up front.
 """
 
 import os
-import time
 
 import google.generativeai as genai
 
-from typing import Dict, Any
-from .base import BaseAdapter
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from .base import BaseAdapter, split_rationale
+from .clients import HttpOptions, shared_client
 
-# Retry settings for free-tier rate limits
-_MAX_RETRIES = 5
-_INITIAL_WAIT = 15  # seconds
+
+def _configure(api_key: str):
+    # genai keeps process-global gRPC clients; configuring again would drop them
+    # (and their connections), so do it once per key through the shared registry.
+    genai.configure(api_key=api_key)
+    return genai
 
 
 class GoogleAdapter(BaseAdapter):
     """Adapter that wraps Google Generative AI (Gemini) models."""
 
-    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None):
-        super().__init__(model, temperature, top_p, max_tokens, tools)
+    provider = "google"
+    supports_stream = True
+
+    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None, http: Optional[HttpOptions] = None):
+        super().__init__(model, temperature, top_p, max_tokens, tools, http)
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError(
@@ -32,63 +38,86 @@ class GoogleAdapter(BaseAdapter):
                 "2. Set it, e.g.: export GOOGLE_API_KEY='YOUR_GOOGLE_KEY_HERE'\n"
                 "3. Or use mock adapter by changing 'provider: google' to 'provider: mock' in your YAML"
             )
-        genai.configure(api_key=api_key)
-        self.model_instance = genai.GenerativeModel(model)
+        # Pool size and HTTP/2 do not apply to the gRPC transport; the timeout does.
+        client = shared_client(self.provider, api_key, HttpOptions(), lambda: _configure(api_key))
+        self.model_instance = client.GenerativeModel(model)
+        self.request_options = {"timeout": self.http.timeout_s}
 
-    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
-        generation_config = genai.types.GenerationConfig(
+    def _generation_config(self):
+        return genai.types.GenerationConfig(
             max_output_tokens=self.max_tokens,
             temperature=self.temperature,
             top_p=self.top_p,
         )
 
-        # Retry loop to handle free-tier 429 rate limits
-        last_err: Exception | None = None
-        for attempt in range(_MAX_RETRIES):
-            try:
-                response = self.model_instance.generate_content(
-                    prompt,
-                    generation_config=generation_config,
-                )
-
-                content = response.text if response.text else ""
-
-                # Extract rationale (everything after "Rationale:" if present)
-                parts = content.split("Rationale:", 1)
-                if len(parts) == 2:
-                    prediction = parts[0].strip()
-                    rationale = parts[1].strip()
-                else:
-                    prediction = content.strip()
-                    rationale = "Generated scientific hypothesis using language model reasoning."
-
-                # Estimate token counts from word counts
-                prompt_tokens = len(prompt.split())
-                completion_tokens = len(content.split())
-
-                return {
-                    "content": prediction,
-                    "rationale": rationale,
-                    "usage": {
-                        "prompt_tokens": prompt_tokens,
-                        "completion_tokens": completion_tokens,
-                        "total_tokens": prompt_tokens + completion_tokens,
-                    },
-                }
-            except Exception as e:
-                last_err = e
-                err_str = str(e)
-                if "429" in err_str or "quota" in err_str.lower():
-                    wait = _INITIAL_WAIT * (2 ** attempt)
-                    print(f"  [rate-limit] attempt {attempt + 1}/{_MAX_RETRIES}, waiting {wait}s …")
-                    time.sleep(wait)
-                    continue
-                # Non-retryable error — break immediately
-                break
-
-        # All retries exhausted or non-retryable error
+    @staticmethod
+    def _usage(metadata) -> Dict[str, int]:
+        """Token counts from a response's (or the last stream chunk's) ``usage_metadata``."""
+        prompt_tokens = getattr(metadata, "prompt_token_count", None)
+        completion_tokens = getattr(metadata, "candidates_token_count", None)
+        if prompt_tokens is None or completion_tokens is None:
+            return {}
         return {
-            "content": f"Error: {str(last_err)}",
-            "rationale": "Failed to generate response due to API error.",
-            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            "prompt_tokens": int(prompt_tokens),
+            "completion_tokens": int(completion_tokens),
+            # Gemini caches shared prompt prefixes implicitly (the scenarios put the
+            # stable part first) and reports the hits here.
+            "cached_tokens": int(getattr(metadata, "cached_content_token_count", None) or 0),
         }
+
+    @classmethod
+    def _parse(cls, prompt: str, response) -> Dict[str, Any]:
+        content = response.text if response.text else ""
+        prediction, rationale = split_rationale(content)
+
+        usage: Dict[str, Any] = cls._usage(getattr(response, "usage_metadata", None))
+        if not usage:
+            # No counts reported: estimate from word counts and flag it, as for a cancelled stream.
+            usage = {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(content.split()),
+                "cached_tokens": 0,
+                "usage_estimated": True,
+            }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        return {
+            "content": prediction,
+            "rationale": rationale,
+            "usage": usage,
+        }
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        generation_config = self._generation_config()
+        response = self._call(
+            lambda: self.model_instance.generate_content(prompt, generation_config=generation_config, request_options=self.request_options),
+            prompt,
+        )
+        return self._parse(prompt, response)
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        generation_config = self._generation_config()
+        response = await self._acall(
+            lambda: self.model_instance.generate_content_async(prompt, generation_config=generation_config, request_options=self.request_options),
+            prompt,
+        )
+        return self._parse(prompt, response)
+
+    # Every chunk carries usage_metadata with the counts so far; the last one has the totals.
+    def _stream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        response = self.model_instance.generate_content(
+            prompt, generation_config=self._generation_config(), request_options=self.request_options, stream=True
+        )
+        for chunk in response:
+            usage.update(self._usage(getattr(chunk, "usage_metadata", None)))
+            if chunk.text:
+                yield chunk.text
+
+    async def _astream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> AsyncIterator[str]:
+        response = await self.model_instance.generate_content_async(
+            prompt, generation_config=self._generation_config(), request_options=self.request_options, stream=True
+        )
+        async for chunk in response:
+            usage.update(self._usage(getattr(chunk, "usage_metadata", None)))
+            if chunk.text:
+                yield chunk.text
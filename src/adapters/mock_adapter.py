@@ -1,8 +1,10 @@
 """Mock adapter for offline pipeline testing without API calls."""
 
-from typing import Any, Dict
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
 
-from .base import BaseAdapter
+from .base import BaseAdapter, split_prompt
+from .batch import LocalBatchServer
 
 
 class MockAdapter(BaseAdapter):
@@ -12,6 +14,24 @@ class MockAdapter(BaseAdapter):
     API costs.  Not intended for thesis evaluation runs.
     """
 
+    provider = "mock"
+    supports_stream = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Prompt prefixes seen so far, to report cached tokens the way providers do.
+        self._prefixes: set = set()
+        self._prefix_lock = threading.Lock()
+
+    def _cached_tokens(self, prompt: str, meta: Dict[str, Any]) -> int:
+        prefix, _ = split_prompt(prompt, meta)
+        if not prefix:
+            return 0
+        with self._prefix_lock:
+            seen = prefix in self._prefixes
+            self._prefixes.add(prefix)
+        return len(prefix.split()) if seen else 0
+
     def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
         # A deterministic but fake "scientific" response for pipeline testing
         task = meta.get("task_type", "unknown")
@@ -28,5 +48,33 @@ class MockAdapter(BaseAdapter):
         return {
             "content": content,
             "rationale": rationale,
-            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 30, "total_tokens": tokens_used},
+            "usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": 30,
+                "total_tokens": tokens_used,
+                "cached_tokens": self._cached_tokens(prompt, meta),
+            },
         }
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        # No I/O to wait on; answer inline instead of hopping to a worker thread.
+        return self.generate(prompt, meta)
+
+    def _stream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        # Stream the full text (answer, then rationale) a few words at a time, like a provider would.
+        out = self.generate(prompt, meta)
+        usage["prompt_tokens"] = out["usage"]["prompt_tokens"]
+        usage["cached_tokens"] = out["usage"]["cached_tokens"]
+        words = f"{out['content']}\nRationale: {out['rationale']}".split(" ")
+        for i in range(0, len(words), 4):
+            yield " ".join(words[i:i + 4]) + (" " if i + 4 < len(words) else "")
+        usage["completion_tokens"] = out["usage"]["completion_tokens"]
+
+    async def _astream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> AsyncIterator[str]:
+        for chunk in self._stream_chunks(prompt, meta, usage):
+            yield chunk
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[Any]:
+        # Go through a local batch endpoint so batch runs exercise the same submit/poll/map path.
+        server = LocalBatchServer(lambda body: self.generate(body["prompt"], body["meta"]))
+        return server.run(requests, poll_s=poll_s)
@@ -1,11 +1,21 @@
-from .base import BaseAdapter
-from typing import Dict, Any
+from .base import BaseAdapter, split_prompt, split_rationale
+from .batch import BatchResult, collect_results, decode_jsonl, encode_jsonl, wait_for_batch
+from .clients import HttpOptions, shared_async_client, shared_client
+from .rate_limit import AdapterError
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import hashlib
 import os
 import openai
+from openai.types.chat import ChatCompletion
+
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
 
 class OpenAIAdapter(BaseAdapter):
-    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None):
-        super().__init__(model, temperature, top_p, max_tokens, tools)
+    provider = "openai"
+    supports_stream = True
+
+    def __init__(self, model: str, temperature: float, top_p: float, max_tokens: int, tools=None, http: Optional[HttpOptions] = None):
+        super().__init__(model, temperature, top_p, max_tokens, tools, http)
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError(
@@ -15,42 +25,125 @@ class OpenAIAdapter(BaseAdapter):
                 "2. Set it, e.g.: export OPENAI_API_KEY='YOUR_OPENAI_KEY_HERE'\n"
                 "3. Or use the mock adapter by changing 'provider: openai' to 'provider: mock' in your YAML"
             )
-        self.client = openai.OpenAI(api_key=api_key)
-    
-    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        self._api_key = api_key
+        self.client = shared_client(
+            self.provider,
+            api_key,
+            self.http,
+            lambda: openai.OpenAI(
+                api_key=api_key,
+                max_retries=0,
+                timeout=self.http.timeout_s,
+                http_client=openai.DefaultHttpxClient(limits=self.http.limits(), http2=self.http.http2),
+            ),
+        )
+
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        return shared_async_client(
+            self.provider,
+            self._api_key,
+            self.http,
+            lambda: openai.AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                timeout=self.http.timeout_s,
+                http_client=openai.DefaultAsyncHttpxClient(limits=self.http.limits(), http2=self.http.http2),
+            ),
+        )
+
+    def _request(self, prompt: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        request = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "max_tokens": self.max_tokens,
+        }
+        # OpenAI caches long prompt prefixes automatically; the scenarios already put
+        # the stable part first. Keying requests by that prefix routes calls sharing
+        # it to the same cache.
+        prefix, _ = split_prompt(prompt, meta)
+        if prefix:
+            request["prompt_cache_key"] = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]
+        return request
+
+    @staticmethod
+    def _usage(usage) -> Dict[str, int]:
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "cached_tokens": getattr(usage.prompt_tokens_details, "cached_tokens", None) or 0,
+        }
+
+    def _parse(self, response) -> Dict[str, Any]:
+        content = response.choices[0].message.content or ""
+        prediction, rationale = split_rationale(content)
+        return {
+            "content": prediction,
+            "rationale": rationale,
+            "usage": self._usage(response.usage),
+        }
+
+    def _stream_request(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        # Usage arrives in a final chunk, so a stream cancelled early has none.
+        return {**self._request(prompt, meta), "stream": True, "stream_options": {"include_usage": True}}
+
+    def _stream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> Iterator[str]:
+        stream = self.client.chat.completions.create(**self._stream_request(prompt, meta))
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=self.temperature,
-                top_p=self.top_p,
-                max_tokens=self.max_tokens
-            )
-            
-            content = response.choices[0].message.content or ""
-            
-            # Extract rationale (everything after "Rationale:" if present)
-            parts = content.split("Rationale:", 1)
-            if len(parts) == 2:
-                prediction = parts[0].strip()
-                rationale = parts[1].strip()
-            else:
-                prediction = content.strip()
-                rationale = "Generated scientific hypothesis using language model reasoning."
-            
-            return {
-                "content": prediction,
-                "rationale": rationale,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
-            }
-        except Exception as e:
-            # Fallback for errors
-            return {
-                "content": f"Error: {str(e)}",
-                "rationale": "Failed to generate response due to API error.",
-                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-            }
+            for chunk in stream:
+                if chunk.usage:
+                    usage.update(self._usage(chunk.usage))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+
+    async def _astream_chunks(self, prompt: str, meta: Dict[str, Any], usage: Dict[str, int]) -> AsyncIterator[str]:
+        stream = await self.async_client.chat.completions.create(**self._stream_request(prompt, meta))
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage.update(self._usage(chunk.usage))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._request(prompt, meta)
+        response = self._call(lambda: self.client.chat.completions.create(**request), prompt)
+        return self._parse(response)
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._request(prompt, meta)
+        response = await self._acall(lambda: self.async_client.chat.completions.create(**request), prompt)
+        return self._parse(response)
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[BatchResult]:
+        """Run the requests as one OpenAI Batch job (JSONL file -> /v1/chat/completions)."""
+        lines = [
+            {"custom_id": str(i), "method": "POST", "url": "/v1/chat/completions", "body": self._request(prompt, meta)}
+            for i, (prompt, meta) in enumerate(requests)
+        ]
+        upload = self._call_api(lambda: self.client.files.create(file=("batch.jsonl", encode_jsonl(lines)), purpose="batch"))
+        job = self._call_api(
+            lambda: self.client.batches.create(input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h")
+        )
+        job = wait_for_batch(lambda: self._call_api(lambda: self.client.batches.retrieve(job.id)), lambda j: j.status in _BATCH_DONE, poll_s)
+
+        found: Dict[int, BatchResult] = {}
+        for file_id in (job.output_file_id, job.error_file_id):
+            if not file_id:
+                continue
+            for line in decode_jsonl(self._call_api(lambda: self.client.files.content(file_id).text)):
+                i = int(line["custom_id"])
+                response = line.get("response") or {}
+                if line.get("error") or response.get("status_code") != 200:
+                    error = line.get("error") or (response.get("body") or {}).get("error")
+                    found[i] = AdapterError(f"Batch request failed: {error}")
+                else:
+                    found[i] = self._parse(ChatCompletion.model_validate(response["body"]))
+        return collect_results(len(requests), found, job.status)
@@ -0,0 +1,284 @@
+"""Shared rate limiting and retry/backoff for provider adapters.
+
+All adapters of a provider and model share one `ProviderLimits` per process: a
+requests-per-minute and a tokens-per-minute token bucket plus a cooldown that
+is set whenever the provider answers 429. Concurrent workers (threads or
+asyncio tasks) therefore pace themselves against a single quota instead of
+each discovering the limit on its own.
+
+Failed calls are retried with jittered exponential backoff, honouring the
+server's Retry-After header when present. Once retries are exhausted (or the
+error is not retryable) an `AdapterError` is raised so the evaluator can
+record the item as failed rather than scoring an error message as an answer.
+Exceptions that are not provider or transport failures (`is_provider_error`),
+i.e. bugs in adapter code, are re-raised unchanged instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .call_stats import add_retries
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_NAMES = ("Timeout", "Connection", "RateLimit", "Overloaded", "ResourceExhausted", "ServiceUnavailable")
+# Packages whose exceptions are provider or transport failures, whatever their status.
+_PROVIDER_PACKAGES = ("openai", "anthropic", "google", "grpc", "httpx", "httpcore", "requests", "urllib3", "aiohttp")
+
+
+class AdapterError(RuntimeError):
+    """A provider call failed permanently (after any retries)."""
+
+    def __init__(self, message: str, attempts: int = 1):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute / 60` per second.
+
+    `reserve()` never blocks: it debits the bucket (possibly below zero) and
+    returns how long the caller must wait, so the same bucket serves both
+    blocking and asyncio callers.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = float(per_minute) / 60.0
+        self.capacity = float(per_minute)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, per_minute: float) -> None:
+        with self._lock:
+            self.rate = float(per_minute) / 60.0
+            self.capacity = float(per_minute)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def reserve(self, n: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            # Never ask for more than a full bucket, or a single huge request would wait forever.
+            self._tokens -= min(float(n), self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def backoff(self, attempt: int, exc: BaseException) -> float:
+        """Delay before retry number `attempt` (0-based)."""
+        hinted = retry_after_seconds(exc)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        # "Equal jitter": keep half the exponential step, randomise the rest.
+        return cap / 2.0 + random.uniform(0.0, cap / 2.0)
+
+
+@dataclass
+class ProviderLimits:
+    """Process-wide pacing state for one provider."""
+
+    rpm: Optional[TokenBucket] = None
+    tpm: Optional[TokenBucket] = None
+    policy: RetryPolicy = field(default_factory=RetryPolicy)
+    _cooldown_until: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def reserve(self, tokens: int) -> float:
+        """Debit one request and `tokens` tokens; return seconds to wait before sending."""
+        wait = 0.0
+        rpm, tpm = self.rpm, self.tpm  # either may be reconfigured concurrently
+        if rpm is not None:
+            wait = max(wait, rpm.reserve(1))
+        if tpm is not None:
+            wait = max(wait, tpm.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._cooldown_until - time.monotonic())
+        return max(0.0, wait)
+
+    def cool_down(self, seconds: float) -> None:
+        """Pause every caller of this provider, e.g. after a 429."""
+        with self._lock:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + seconds)
+
+
+_LIMITS: Dict[Tuple[str, Optional[str]], ProviderLimits] = {}
+_LIMITS_LOCK = threading.Lock()
+
+
+def provider_limits(provider: str, model: Optional[str] = None) -> ProviderLimits:
+    """Pacing state shared by every adapter of (provider, model) in the process.
+
+    Providers enforce their quotas per model, and keying on it keeps one
+    config's budget from leaking into another model's runs in a sweep.
+    """
+    key = (provider, model)
+    with _LIMITS_LOCK:
+        if key not in _LIMITS:
+            _LIMITS[key] = ProviderLimits()
+        return _LIMITS[key]
+
+
+def _bucket(bucket: Optional[TokenBucket], per_minute: Optional[int]) -> Optional[TokenBucket]:
+    if not per_minute:
+        return None
+    if bucket is None:
+        return TokenBucket(per_minute)
+    bucket.set_rate(per_minute)
+    return bucket
+
+
+def configure_rate_limits(
+    provider: str,
+    rpm: Optional[int] = None,
+    tpm: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    model: Optional[str] = None,
+) -> ProviderLimits:
+    """Set the budgets of (provider, model) to exactly `rpm`/`tpm`; None removes a budget.
+
+    Existing buckets are updated in place so in-flight callers keep sharing them.
+    """
+    limits = provider_limits(provider, model)
+    with _LIMITS_LOCK:
+        limits.rpm = _bucket(limits.rpm, rpm)
+        limits.tpm = _bucket(limits.tpm, tpm)
+        if max_retries is not None:
+            limits.policy.max_retries = int(max_retries)
+    return limits
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code", "status"):
+        v = getattr(exc, attr, None)
+        if isinstance(v, int):
+            return v
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Parse Retry-After (seconds or HTTP date) / retry-after-ms from an SDK error's response."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return max(0.0, float(ms) / 1000.0)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    msg = str(exc)
+    return _status_code(exc) == 429 or "429" in msg or "quota" in msg.lower()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = _status_code(exc)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    if is_rate_limited(exc):
+        return True
+    name = type(exc).__name__
+    return any(tag in name for tag in _RETRYABLE_NAMES)
+
+
+def is_provider_error(exc: BaseException) -> bool:
+    """True for failures of the provider or the transport, False for bugs in adapter code.
+
+    Only provider errors are retried and turned into `AdapterError` (an error
+    row); a ``TypeError`` or ``KeyError`` in adapter code propagates unchanged.
+    """
+    if isinstance(exc, (OSError, asyncio.TimeoutError)):
+        return True
+    if _status_code(exc) is not None or is_retryable(exc):
+        return True
+    return type(exc).__module__.split(".", 1)[0] in _PROVIDER_PACKAGES
+
+
+def _after_failure(limits: ProviderLimits, attempt: int, exc: BaseException) -> Optional[float]:
+    """Return the delay before the next attempt, or None to give up."""
+    if attempt >= limits.policy.max_retries or not is_retryable(exc):
+        return None
+    delay = limits.policy.backoff(attempt, exc)
+    if is_rate_limited(exc):
+        limits.cool_down(delay)
+    return delay
+
+
+def call_with_retries(fn: Callable[[], T], limits: ProviderLimits, tokens: int) -> Tuple[T, int]:
+    """Call `fn` under the provider's budgets; return (result, attempts)."""
+    attempt = 0
+    while True:
+        wait = limits.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            result = fn()
+            add_retries(attempt)
+            return result, attempt + 1
+        except AdapterError:
+            add_retries(attempt)
+            raise
+        except Exception as e:
+            if not is_provider_error(e):
+                add_retries(attempt)
+                raise
+            delay = _after_failure(limits, attempt, e)
+            if delay is None:
+                add_retries(attempt)
+                raise AdapterError(f"{type(e).__name__}: {e}", attempts=attempt + 1) from e
+            time.sleep(delay)
+            attempt += 1
+
+
+async def acall_with_retries(fn: Callable[[], Awaitable[T]], limits: ProviderLimits, tokens: int) -> Tuple[T, int]:
+    """Asyncio counterpart of `call_with_retries`; waiting never blocks the event loop."""
+    attempt = 0
+    while True:
+        wait = limits.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            result = await fn()
+            add_retries(attempt)
+            return result, attempt + 1
+        except AdapterError:
+            add_retries(attempt)
+            raise
+        except Exception as e:
+            if not is_provider_error(e):
+                add_retries(attempt)
+                raise
+            delay = _after_failure(limits, attempt, e)
+            if delay is None:
+                add_retries(attempt)
+                raise AdapterError(f"{type(e).__name__}: {e}", attempts=attempt + 1) from e
+            await asyncio.sleep(delay)
+            attempt += 1
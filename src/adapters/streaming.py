@@ -0,0 +1,109 @@
+"""Streamed answers with early termination for structured outputs.
+
+With ``run.stream: true`` the evaluator wraps its adapter in a
+`StreamingAdapter`. Each call then goes through the provider's streaming
+endpoint. When a scenario names a completion check in ``meta["stop_when"]``
+(a key of `STOP_CHECKS`), the stream is cancelled as soon as the text
+received so far contains a finished answer. The prose a model keeps writing
+after a causal JSON object or an equation is then neither waited for nor
+billed.
+
+Each streamed call records its time to first token and whether the check
+cut it short. The per-item ``ttft_s`` and ``stopped_early`` columns come from
+`call_stats.record_stream()`. Check names rather than callables travel in
+``meta``, so requests stay JSON-serialisable for batch jobs.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseAdapter, StreamEnd
+from .call_stats import record_stream
+
+_DECODER = json.JSONDecoder()
+
+
+def json_object_end(text: str) -> Optional[int]:
+    """End of the first complete, valid JSON object in `text`."""
+    start = text.find("{")
+    while start != -1:
+        depth, in_str, escaped = 0, False, False
+        for i in range(start, len(text)):
+            c = text[i]
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_str = False
+            elif c == '"':
+                in_str = True
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        _DECODER.decode(text[start:i + 1])
+                        return i + 1
+                    except ValueError:
+                        break
+        else:
+            return None  # still open: wait for more text
+        start = text.find("{", start + 1)
+    return None
+
+
+def equation_line_end(text: str) -> Optional[int]:
+    """End of the first finished (newline-terminated) line containing an equation."""
+    pos = 0
+    while True:
+        nl = text.find("\n", pos)
+        if nl == -1:
+            return None
+        if "=" in text[pos:nl]:
+            return nl
+        pos = nl + 1
+
+
+STOP_CHECKS: Dict[str, StreamEnd] = {
+    "json_object": json_object_end,
+    "equation_line": equation_line_end,
+}
+
+
+class StreamingAdapter(BaseAdapter):
+    """Answers through `inner.generate_stream()`, cut at the check named in ``meta["stop_when"]``."""
+
+    def __init__(self, inner: BaseAdapter):
+        super().__init__(inner.model, inner.temperature, inner.top_p, inner.max_tokens, inner.tools, inner.http, limits=inner.limits)
+        self.inner = inner
+        self.provider = inner.provider
+
+    @staticmethod
+    def _end(meta: Dict[str, Any]) -> Optional[StreamEnd]:
+        name = (meta or {}).get("stop_when")
+        if name is None:
+            return None
+        if name not in STOP_CHECKS:
+            raise ValueError(f"Unknown stop_when check: {name!r} (expected one of {sorted(STOP_CHECKS)})")
+        return STOP_CHECKS[name]
+
+    @staticmethod
+    def _record(out: Dict[str, Any]) -> Dict[str, Any]:
+        info = out.get("stream") or {}
+        record_stream(info.get("ttft_s"), bool(info.get("stopped_early")))
+        return out
+
+    def generate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return self._record(self.inner.generate_stream(prompt, meta, self._end(meta)))
+
+    async def agenerate(self, prompt: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return self._record(await self.inner.agenerate_stream(prompt, meta, self._end(meta)))
+
+    def generate_batch(self, requests: List[Tuple[str, Dict[str, Any]]], poll_s: float = 30.0) -> List[Any]:
+        # Batch jobs have no streaming; their answers come back whole.
+        return self.inner.generate_batch(requests, poll_s=poll_s)
@@ -5,7 +5,7 @@ validates the YAML at load time and provides typed access to all settings.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 
 
 class ModelSpec(BaseModel):
@@ -17,6 +17,12 @@ class ModelSpec(BaseModel):
     top_p: float = 1.0
     max_tokens: int = 1024
     tools: List[str] = []   # e.g., ["python", "retrieval", "oracle"]
+    rpm: Optional[int] = None   # requests/minute budget shared by all calls to this provider + model (None: unlimited)
+    tpm: Optional[int] = None   # tokens/minute budget (prompt estimate + max_tokens per call)
+    max_retries: int = 5        # retries on 429/5xx/timeouts before the item is marked as failed
+    timeout_s: float = Field(600.0, gt=0, description="Per-request timeout")
+    max_connections: int = Field(100, ge=1, description="HTTP connections pooled (and kept alive) per provider client")
+    http2: bool = False         # needs `pip install 'httpx[http2]'`
 
 class ScenarioSpec(BaseModel):
     """Evaluation scenario selection and optional parameters."""
@@ -31,6 +37,20 @@ class DataSpec(BaseModel):
     path: Optional[str] = None
     limit: Optional[int] = 20
 
+class RunSpec(BaseModel):
+    """Execution settings that do not affect results (only how items are scheduled)."""
+
+    concurrency: int = Field(1, ge=1, description="Number of items evaluated in parallel")
+    backend: Literal["thread", "async", "batch"] = "thread"  # async: adapter.agenerate() on one event loop; batch: provider batch jobs
+    cache: Literal["off", "read", "readwrite"] = "off"  # persistent response cache (see src/adapters/cache.py)
+    cache_path: str = "results/cache/responses.sqlite"
+    cache_max_mb: int = Field(1024, ge=1)
+    batch_size: int = Field(1000, ge=1, description="Items per provider batch job (backend: batch)")
+    batch_poll_s: float = Field(30.0, gt=0, description="Seconds between batch job status checks")
+    stream: bool = False  # stream completions; cancel once the scenario's stop_when check passes (see src/adapters/streaming.py)
+    trace: bool = False  # span timings -> results/{run_id}_trace.json and *_p50_s/_p95_s/_p99_s in metrics.json
+    score_workers: int = Field(1, ge=1, description="Processes used by the scoring stage (see src/eval/scoring.py)")
+
 class ExperimentConfig(BaseModel):
     """Top-level experiment configuration validated from YAML."""
 
@@ -40,6 +60,7 @@ class ExperimentConfig(BaseModel):
     data: DataSpec
     model: ModelSpec
     scenario: ScenarioSpec
+    run: RunSpec = RunSpec()
     metrics: Dict[str, Any] = {
         "novelty": {"enabled": True},
         "generalization": {"enabled": True},
@@ -3,10 +3,11 @@ from __future__ import annotations
 import json
 import random
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
+from ..sample_store import SAMPLE_FORMATS, SampleWriter, sidecar_path
 from ..schemas import TaskItem
 
 
@@ -45,36 +46,41 @@ def _simulate_linear_sem(
 
     Each node value is: x_v = sum_{p in Pa(v)} w_{p,v} * x_p + eps
     Interventions set x_v = constant.
+
+    All `n` samples are computed at once, one node column at a time in
+    topological order. The random stream is consumed exactly as a per-sample
+    loop would (edge weights first, then noise sample-major over the
+    non-intervened nodes) and each column is accumulated parent by parent in
+    edge order, so outputs are bit-identical to the sample-by-sample
+    definition above for a given seed.
     """
     interventions = interventions or {}
 
     rs = np.random.RandomState(seed)
 
     # sample weights for edges
-    w: Dict[Tuple[str, str], float] = {}
-    for (u, v) in edges:
-        w[(u, v)] = float(rs.uniform(-2.0, 2.0))
+    weights = rs.uniform(-2.0, 2.0, size=len(edges))
+    w: Dict[Tuple[str, str], float] = {e: float(wt) for e, wt in zip(edges, weights)}
 
     parents = _parents(edges)
 
-    data: Dict[str, List[float]] = {v: [] for v in nodes}
+    # noise for every (sample, free node) pair, drawn sample-major
+    free = [v for v in nodes if v not in interventions]
+    eps = rs.normal(0.0, noise_scale, size=(n, len(free)))
+    eps_col = {v: j for j, v in enumerate(free)}
 
     # topological order is nodes order (edges only i<j)
-    for t in range(n):
-        x: Dict[str, float] = {}
-        for v in nodes:
-            if v in interventions:
-                x[v] = float(interventions[v])
-                continue
-            s = 0.0
-            for p in parents.get(v, []):
-                s += w[(p, v)] * x[p]
-            eps = float(rs.normal(0.0, noise_scale))
-            x[v] = s + eps
-        for v in nodes:
-            data[v].append(float(x[v]))
-
-    return data
+    cols: Dict[str, np.ndarray] = {}
+    for v in nodes:
+        if v in interventions:
+            cols[v] = np.full(n, float(interventions[v]))
+            continue
+        s = np.zeros(n)
+        for p in parents.get(v, []):
+            s = s + w[(p, v)] * cols[p]
+        cols[v] = s + eps[:, eps_col[v]]
+
+    return {v: cols[v].tolist() for v in nodes}
 
 
 @dataclass
@@ -90,6 +96,90 @@ class AutoBenchGenConfig:
     domain: str = "physics"
 
 
+def _skip_dag_draws(r: random.Random, n_tasks: int, n_nodes: int) -> None:
+    """Advance `r` past the DAG draws of the first `n_tasks` tasks.
+
+    `_sample_dag` makes exactly one `r.random()` call per node pair, and each
+    call consumes 64 bits of Mersenne Twister output, so the stream can be
+    fast-forwarded with `getrandbits` instead of replaying every draw.
+    """
+    remaining = n_tasks * (n_nodes * (n_nodes - 1) // 2)
+    chunk = 1_000_000
+    while remaining > 0:
+        step = min(remaining, chunk)
+        r.getrandbits(64 * step)
+        remaining -= step
+
+
+def _make_task(cfg: AutoBenchGenConfig, i: int, r: random.Random) -> TaskItem:
+    split = "iid" if i < (cfg.n_tasks // 2) else "ood"
+    edge_prob = cfg.edge_prob_iid if split == "iid" else cfg.edge_prob_ood
+
+    nodes = [chr(ord("A") + k) for k in range(cfg.n_nodes)]
+    edges = _sample_dag(nodes, edge_prob=edge_prob, r=r)
+
+    obs = _simulate_linear_sem(
+        nodes,
+        edges,
+        n=cfg.n_obs,
+        seed=cfg.seed * 100000 + i,
+        interventions=None,
+        noise_scale=cfg.noise_scale,
+    )
+
+    # define a menu of simple interventions do(V=+2.0)
+    intervention_menu: List[Dict[str, Any]] = []
+    for v in nodes:
+        int_data = _simulate_linear_sem(
+            nodes,
+            edges,
+            n=cfg.n_int,
+            seed=cfg.seed * 100000 + i + 999,
+            interventions={v: 2.0},
+            noise_scale=cfg.noise_scale,
+        )
+        intervention_menu.append(
+            {
+                "do": {v: 2.0},
+                "samples": int_data,
+            }
+        )
+
+    prompt = (
+        "You are performing interactive causal discovery. You are given an observational dataset, "
+        "and you may request one interventional dataset of the form do(V=2.0) from the oracle. "
+        "Infer the directed causal edges among nodes."
+    )
+
+    return TaskItem(
+        id=f"abgen-{split}-{i:04d}",
+        domain=cfg.domain,
+        task_type="causal",
+        input={
+            "prompt": prompt,
+            "nodes": nodes,
+            "observational": obs,
+            "intervention_menu": intervention_menu,
+        },
+        gold={"edges": [[u, v] for (u, v) in edges]},
+        split=split,
+    )
+
+
+def iter_autobench_tasks(cfg: AutoBenchGenConfig, start: int = 0, stop: Optional[int] = None) -> Iterator[TaskItem]:
+    """Lazily generate tasks with indices in [start, stop).
+
+    Any index range yields exactly the tasks a full run would produce at
+    those indices, so ranges can be generated independently (e.g. one shard
+    per worker process).
+    """
+    stop = cfg.n_tasks if stop is None else min(stop, cfg.n_tasks)
+    r = _rng(cfg.seed)
+    _skip_dag_draws(r, start, cfg.n_nodes)
+    for i in range(start, stop):
+        yield _make_task(cfg, i, r)
+
+
 def generate_autobench_tasks(cfg: AutoBenchGenConfig) -> List[TaskItem]:
     """Generate Auto-Bench-like interactive causal discovery tasks.
 
@@ -101,70 +191,39 @@ def generate_autobench_tasks(cfg: AutoBenchGenConfig) -> List[TaskItem]:
     Splits:
     - first half iid, second half ood (different graph density)
     """
-    r = _rng(cfg.seed)
-
-    items: List[TaskItem] = []
-    for i in range(cfg.n_tasks):
-        split = "iid" if i < (cfg.n_tasks // 2) else "ood"
-        edge_prob = cfg.edge_prob_iid if split == "iid" else cfg.edge_prob_ood
-
-        nodes = [chr(ord("A") + k) for k in range(cfg.n_nodes)]
-        edges = _sample_dag(nodes, edge_prob=edge_prob, r=r)
-
-        obs = _simulate_linear_sem(
-            nodes,
-            edges,
-            n=cfg.n_obs,
-            seed=cfg.seed * 100000 + i,
-            interventions=None,
-            noise_scale=cfg.noise_scale,
-        )
+    return list(iter_autobench_tasks(cfg))
 
-        # define a menu of simple interventions do(V=+2.0)
-        intervention_menu: List[Dict[str, Any]] = []
-        for v in nodes:
-            int_data = _simulate_linear_sem(
-                nodes,
-                edges,
-                n=cfg.n_int,
-                seed=cfg.seed * 100000 + i + 999,
-                interventions={v: 2.0},
-                noise_scale=cfg.noise_scale,
-            )
-            intervention_menu.append(
-                {
-                    "do": {v: 2.0},
-                    "samples": int_data,
-                }
-            )
-
-        prompt = (
-            "You are performing interactive causal discovery. You are given an observational dataset, "
-            "and you may request one interventional dataset of the form do(V=2.0) from the oracle. "
-            "Infer the directed causal edges among nodes."
-        )
 
-        items.append(
-            TaskItem(
-                id=f"abgen-{split}-{i:04d}",
-                domain=cfg.domain,
-                task_type="causal",
-                input={
-                    "prompt": prompt,
-                    "nodes": nodes,
-                    "observational": obs,
-                    "intervention_menu": intervention_menu,
-                },
-                gold={"edges": [[u, v] for (u, v) in edges]},
-                split=split,
-            )
-        )
+def _externalize_samples(d: Dict[str, Any], writer: SampleWriter) -> Dict[str, Any]:
+    inp = dict(d["input"])
+    if inp.get("observational") is not None:
+        inp["observational"] = writer.add(inp["observational"])
+    if inp.get("intervention_menu"):
+        inp["intervention_menu"] = [{**entry, "samples": writer.add(entry["samples"])} for entry in inp["intervention_menu"]]
+    return {**d, "input": inp}
 
-    return items
 
+def write_jsonl(path: str, items: Iterable[TaskItem], samples: str = "json") -> int:
+    """Stream tasks to `path` as JSONL; return the number written.
 
-def write_jsonl(path: str, items: List[TaskItem]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        for it in items:
-            d = it.model_dump()
-            f.write(json.dumps(d, ensure_ascii=False) + "\n")
+    With ``samples="npy"`` the observational and interventional sample tables
+    go to a float64 sidecar (`sample_store.sidecar_path(path)`) and the JSONL
+    holds references to them instead of inline float lists.
+    """
+    if samples not in SAMPLE_FORMATS:
+        raise ValueError(f"Unsupported samples format: {samples!r} (expected one of {SAMPLE_FORMATS})")
+
+    writer = SampleWriter(sidecar_path(path)) if samples == "npy" else None
+    n = 0
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            for it in items:
+                d = it.model_dump()
+                if writer is not None:
+                    d = _externalize_samples(d, writer)
+                f.write(json.dumps(d, ensure_ascii=False) + "\n")
+                n += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
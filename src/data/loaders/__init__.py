@@ -1,17 +1,19 @@
 """Benchmark data loaders.
 
 Each loader reads a JSONL dataset file and returns a list of `TaskItem` instances.
+The matching `iter_*` functions yield the same items lazily and stop reading
+once `limit` is reached; the evaluator uses those.
 The `LOADERS` dict maps loader names (used in experiment YAMLs) to wrapper classes
 that the evaluator can instantiate.
 """
 
-from .autobench_loader import load_autobench
-from .llm_srbench_loader import load_llm_srbench
-from .scihorizon_loader import load_scihorizon
-from .researchbench_loader import load_researchbench
-from .biodsa_loader import load_biodsa
-from .synthetic_loader import load_synthetic
-from .baisbench_loader import load_baisbench
+from .autobench_loader import iter_autobench, load_autobench
+from .llm_srbench_loader import iter_llm_srbench, load_llm_srbench
+from .scihorizon_loader import iter_scihorizon, load_scihorizon
+from .researchbench_loader import iter_researchbench, load_researchbench
+from .biodsa_loader import iter_biodsa, load_biodsa
+from .synthetic_loader import iter_synthetic, load_synthetic
+from .baisbench_loader import iter_baisbench, load_baisbench
 
 
 # ---------------------------------------------------------------------------
@@ -3,30 +3,74 @@
 from __future__ import annotations
 
 import json
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
 
+T = TypeVar("T")
 
-def read_json_or_jsonl(path: str) -> List[Dict[str, Any]]:
+
+def take(rows: Iterable[T], limit: Optional[int]) -> Iterator[T]:
+    """Yield at most `limit` rows (all rows if `limit` is falsy) without reading past them."""
+    it = iter(rows)
+    return islice(it, int(limit)) if limit else it
+
+
+def _iter_jsonl(p: Path) -> Iterator[Dict[str, Any]]:
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line)
+
+
+def _iter_manifest(p: Path) -> Iterator[Dict[str, Any]]:
+    # Sharded output of generate_autobench_dataset.py: shards are read in index order.
+    with p.open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    shards = sorted(manifest.get("shards") or [], key=lambda s: s.get("start", 0))
+    for shard in shards:
+        yield from _iter_jsonl(p.parent / shard["path"])
+
+
+def iter_json_or_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield records from a dataset file.
+
+    JSONL files (and ``*.manifest.json`` shard manifests) are streamed line by
+    line, so a consumer that stops early never reads the rest of the file.
+    A plain ``.json`` list has to be parsed in one go.
+    """
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Dataset path not found: {path}")
 
+    if p.name.lower().endswith(".manifest.json"):
+        return _iter_manifest(p)
+
     if p.suffix.lower() == ".jsonl":
-        rows: List[Dict[str, Any]] = []
-        with p.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                rows.append(json.loads(line))
-        return rows
+        return _iter_jsonl(p)
 
     if p.suffix.lower() == ".json":
         with p.open("r", encoding="utf-8") as f:
             data = json.load(f)
         if isinstance(data, list):
-            return data
+            return iter(data)
         raise ValueError("Expected a JSON list at top-level")
 
     raise ValueError("Unsupported dataset format. Use .jsonl or .json")
+
+
+def read_json_or_jsonl(path: str) -> List[Dict[str, Any]]:
+    return list(iter_json_or_jsonl(path))
+
+
+def iter_task_records(path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream TaskItem-compatible records, stopping after `limit`.
+
+    Files without a .json/.jsonl suffix are read as JSONL.
+    """
+    p = Path(path)
+    if p.exists() and p.suffix.lower() not in (".json", ".jsonl"):
+        return take(_iter_jsonl(p), limit)
+    return take(iter_json_or_jsonl(path), limit)
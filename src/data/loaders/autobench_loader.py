@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional, Any, Dict
+import os
+from typing import Any, Dict, Iterator, List, Optional
 
+from ..sample_store import bind_ref
 from ..schemas import TaskItem
-from ._json_helpers import read_json_or_jsonl
+from ._json_helpers import iter_json_or_jsonl, take
 
 
 def _coerce_edges(raw_edges: Any) -> List[list[str]]:
@@ -21,13 +23,53 @@ def _coerce_edges(raw_edges: Any) -> List[list[str]]:
     return edges
 
 
-def load_autobench(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
-    """Load Auto-Bench tasks.
+def _bind_samples(inp: Dict[str, Any], base_dir: str) -> Dict[str, Any]:
+    # Sample tables may live in a binary sidecar (`write_jsonl(..., samples="npy")`);
+    # their references stay lazy and are resolved where the samples are used.
+    inp = dict(inp)
+    inp["observational"] = bind_ref(inp.get("observational"), base_dir)
+    if inp.get("intervention_menu"):
+        inp["intervention_menu"] = [{**e, "samples": bind_ref(e.get("samples"), base_dir)} for e in inp["intervention_menu"]]
+    return inp
+
+
+def _to_task(i: int, r: Dict[str, Any], base_dir: str) -> TaskItem:
+    # Rows written by generate_autobench_dataset.py are already TaskItem-shaped.
+    if isinstance(r.get("input"), dict) and isinstance(r.get("gold"), dict):
+        return TaskItem(**{**r, "input": _bind_samples(r["input"], base_dir)})
+
+    rid = str(r.get("id") or f"ab-{i}")
+    domain = str(r.get("domain") or "physics")
+    nodes = r.get("nodes") or r.get("variables") or ["A", "B", "C"]
+    edges = _coerce_edges(r.get("edges") or r.get("gold_edges"))
+    split = str(r.get("split") or "test")
+    prompt = r.get("prompt")
+
+    return TaskItem(
+        id=rid,
+        domain=domain,
+        task_type="causal",
+        input={
+            "prompt": prompt,
+            "nodes": nodes,
+            "observations": r.get("observations"),
+            "interventions": r.get("interventions") or [],
+        },
+        gold={"edges": edges},
+        split=split,
+    )
+
+
+def iter_autobench(path: Optional[str] = None, limit: Optional[int] = 20) -> Iterator[TaskItem]:
+    """Lazily yield Auto-Bench tasks.
 
     Supported now:
     - Local JSONL/JSON subset mapped into TaskItem.
+    - Generated datasets (single JSONL or a ``*.manifest.json`` of shards),
+      with sample tables inline or in memory-mapped ``.samples.npy`` sidecars
+      (kept as lazy references; see `sample_store`).
 
-    If no `path` is provided, returns a small synthetic toy set (for smoke tests).
+    Reading stops as soon as `limit` tasks have been yielded.
     """
 
     if not path:
@@ -36,33 +78,11 @@ def load_autobench(path: Optional[str] = None, limit: Optional[int] = 20) -> Lis
             "Set data.path in the experiment YAML."
         )
 
-    rows = read_json_or_jsonl(path)
-    if limit:
-        rows = rows[: int(limit)]
-
-    items: List[TaskItem] = []
-    for i, r in enumerate(rows):
-        rid = str(r.get("id") or f"ab-{i}")
-        domain = str(r.get("domain") or "physics")
-        nodes = r.get("nodes") or r.get("variables") or ["A", "B", "C"]
-        edges = _coerce_edges(r.get("edges") or r.get("gold_edges"))
-        split = str(r.get("split") or "test")
-        prompt = r.get("prompt")
-
-        items.append(
-            TaskItem(
-                id=rid,
-                domain=domain,
-                task_type="causal",
-                input={
-                    "prompt": prompt,
-                    "nodes": nodes,
-                    "observations": r.get("observations"),
-                    "interventions": r.get("interventions") or [],
-                },
-                gold={"edges": edges},
-                split=split,
-            )
-        )
+    rows = iter_json_or_jsonl(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return (_to_task(i, r, base_dir) for i, r in enumerate(take(rows, limit)))
 
-    return items
+
+def load_autobench(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
+    """Load Auto-Bench tasks into a list (see `iter_autobench`)."""
+    return list(iter_autobench(path, limit))
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..schemas import TaskItem
-import json
+from ._json_helpers import iter_task_records
 
 
-def load_baisbench(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
-    """Load (a subset of) BaisBench.
+def iter_baisbench(path: Optional[str] = None, limit: Optional[int] = 20) -> Iterator[TaskItem]:
+    """Stream (a subset of) BaisBench.
 
     Requires a JSONL file where each line is a TaskItem-compatible record.
     """
@@ -17,11 +17,8 @@ def load_baisbench(path: Optional[str] = None, limit: Optional[int] = 20) -> Lis
             "Set data.path in the experiment YAML."
         )
 
-    items: List[TaskItem] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            items.append(TaskItem(**rec))
-            if limit and len(items) >= limit:
-                break
-    return items
+    return (TaskItem(**rec) for rec in iter_task_records(path, limit))
+
+
+def load_baisbench(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
+    return list(iter_baisbench(path, limit))
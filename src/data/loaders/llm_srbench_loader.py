@@ -1,10 +1,10 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..schemas import TaskItem
-import json
+from ._json_helpers import iter_task_records
 
-def load_llm_srbench(path: Optional[str]=None, limit: Optional[int]=20) -> List[TaskItem]:
+def iter_llm_srbench(path: Optional[str]=None, limit: Optional[int]=20) -> Iterator[TaskItem]:
     """
-    Load the official LLM-SRBench dataset from a JSONL file.
+    Stream the official LLM-SRBench dataset from a JSONL file.
     Each record should have fields: id, domain, task_type, input, gold, split.
     If the official dataset is not JSONL, add a conversion script.
     """
@@ -14,12 +14,9 @@ def load_llm_srbench(path: Optional[str]=None, limit: Optional[int]=20) -> List[
             "Set data.path in the experiment YAML."
         )
 
-    items = []
     # Official loader: expects JSONL file with TaskItem fields
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            items.append(TaskItem(**rec))
-            if limit and len(items) >= limit:
-                break
-    return items
+    return (TaskItem(**rec) for rec in iter_task_records(path, limit))
+
+
+def load_llm_srbench(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
+    return list(iter_llm_srbench(path, limit))
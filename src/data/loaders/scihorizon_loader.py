@@ -1,19 +1,16 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..schemas import TaskItem
-import json
+from ._json_helpers import iter_task_records
 
-def load_scihorizon(path: Optional[str]=None, limit: Optional[int]=20) -> List[TaskItem]:
+def iter_scihorizon(path: Optional[str]=None, limit: Optional[int]=20) -> Iterator[TaskItem]:
     if not path:
         raise ValueError(
             "SciHorizon loader requires a real dataset path (JSONL). "
             "Set data.path in the experiment YAML."
         )
 
-    items = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            rec = json.loads(line)
-            items.append(TaskItem(**rec))
-            if limit and len(items) >= limit:
-                break
-    return items
+    return (TaskItem(**rec) for rec in iter_task_records(path, limit))
+
+
+def load_scihorizon(path: Optional[str] = None, limit: Optional[int] = 20) -> List[TaskItem]:
+    return list(iter_scihorizon(path, limit))
@@ -0,0 +1,136 @@
+"""Binary sidecar storage for numeric sample matrices.
+
+Generated Auto-Bench tasks carry several ``{node: [float, ...]}`` sample
+tables each (observational data plus one table per intervention). Stored as
+JSON floats they dominate file size and parse time. With the ``npy`` format
+the tables are appended to one float64 ``.npy`` file next to the JSONL, and
+the JSONL keeps only a small reference in their place::
+
+    {"__samples__": {"file": "ab.samples.npy", "offset": 0, "shape": [64, 6], "columns": ["A", ...]}}
+
+The sidecar is a plain 1-D ``.npy`` array, so readers memory-map it and only
+touch the rows they resolve. Loaded items keep the reference (see
+`bind_ref`); samples are read where they are used, as a zero-copy
+`sample_matrix()` view or, for prompts, as lists via `resolve_samples()`.
+Values round-trip exactly (JSON floats are float64 too).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+
+SAMPLES_KEY = "__samples__"
+SAMPLE_FORMATS = ("json", "npy")
+
+# Fixed-size .npy v1.0 header, rewritten with the final length on close.
+_HEADER_LEN = 128
+
+
+def sidecar_path(jsonl_path: str) -> str:
+    stem, _ = os.path.splitext(jsonl_path)
+    return f"{stem}.samples.npy"
+
+
+def _npy_header(n_values: int) -> bytes:
+    d = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % n_values
+    body = d.ljust(_HEADER_LEN - 10 - 1) + "\n"
+    return np.lib.format.magic(1, 0) + len(body).to_bytes(2, "little") + body.encode("latin1")
+
+
+class SampleWriter:
+    """Append sample tables to a float64 ``.npy`` sidecar and hand back references."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(_npy_header(0))
+        self._n = 0
+
+    def add(self, table: Dict[str, List[float]]) -> Dict[str, Any]:
+        columns = list(table)
+        mat = np.ascontiguousarray(np.asarray([table[c] for c in columns], dtype="<f8").T)
+        self._f.write(mat.tobytes())
+        ref = {
+            "file": os.path.basename(self.path),
+            "offset": self._n,
+            "shape": [int(mat.shape[0]), len(columns)],
+            "columns": columns,
+        }
+        self._n += mat.size
+        return {SAMPLES_KEY: ref}
+
+    def close(self) -> None:
+        self._f.seek(0)
+        self._f.write(_npy_header(self._n))
+        self._f.close()
+
+    def __enter__(self) -> "SampleWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def is_sample_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and SAMPLES_KEY in value
+
+
+_ARRAYS: Dict[str, np.ndarray] = {}
+
+
+def _array(path: str) -> np.ndarray:
+    arr = _ARRAYS.get(path)
+    if arr is None:
+        # Memory-mapped once per process; racing threads at worst map it twice.
+        arr = _ARRAYS[path] = np.load(path, mmap_mode="r")
+    return arr
+
+
+def bind_ref(value: Any, base_dir: str) -> Any:
+    """Point a reference's sidecar at an absolute path (other values pass through).
+
+    Loaders keep references unresolved: they cost a few bytes per item in
+    memory, in `TaskItem` validation and in the predictions file. Code that
+    reads samples resolves them with `sample_matrix()` / `resolve_samples()`.
+    """
+    if not is_sample_ref(value):
+        return value
+    ref = value[SAMPLES_KEY]
+    return {SAMPLES_KEY: {**ref, "file": os.path.join(base_dir, ref["file"])}}
+
+
+def sample_matrix(value: Dict[str, Any]) -> np.ndarray:
+    """Read-only ``(n_samples, n_columns)`` view into the (bound) reference's sidecar."""
+    ref = value[SAMPLES_KEY]
+    n, c = ref["shape"]
+    start = int(ref["offset"])
+    return _array(ref["file"])[start : start + n * c].reshape(n, c)
+
+
+def sample_columns(value: Dict[str, Any]) -> List[str]:
+    return list(value[SAMPLES_KEY]["columns"])
+
+
+def sample_count(table: Any) -> int:
+    """Number of samples in a table, inline or referenced."""
+    if is_sample_ref(table):
+        return int(table[SAMPLES_KEY]["shape"][0])
+    return len(next(iter((table or {}).values()), []))
+
+
+def resolve_samples(obj: Any) -> Any:
+    """`obj` with every reference replaced by its ``{column: [float, ...]}`` table.
+
+    For code that needs plain JSON, e.g. a prompt embedding the raw samples.
+    """
+    if is_sample_ref(obj):
+        mat = sample_matrix(obj)
+        return {col: mat[:, j].tolist() for j, col in enumerate(sample_columns(obj))}
+    if isinstance(obj, dict):
+        return {k: resolve_samples(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [resolve_samples(v) for v in obj]
+    return obj
@@ -1,11 +1,30 @@
-"""Causal graph scoring: edge precision, recall, F1, and SHD."""
+"""Causal graph scoring: edge precision, recall, F1, and SHD.
+
+Graphs are scored as node-indexed boolean adjacency matrices (``A[i, j]``
+means edge i -> j). All metrics are array reductions, so a whole run can be
+scored at once by stacking its graphs into a ``(batch, n, n)`` tensor
+(`score_adjacency_batch`). `scoring.score_records` scores the causal items of
+each chunk of records in one `score_edge_batch` call; `score_predicted_edges`
+is a batch of one.
+
+SHD is the structural Hamming distance between the two graphs: the number of
+node pairs whose connection differs, so a reversed edge costs 1 (not a
+deletion plus an addition). Skeleton metrics ignore edge direction.
+
+An item without gold edges cannot be scored and gets all-zero metrics
+(``shd`` included), as before the adjacency scoring.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, Set
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
 
 from ..utils.text import extract_edges, normalize_edge
 
+Edge = Tuple[str, str]
+
 
 def gold_edges(item_gold) -> Set[str]:
     edges = item_gold.get("edges") or []
@@ -19,20 +38,100 @@ def gold_edges(item_gold) -> Set[str]:
     return out
 
 
-def score_predicted_edges(pred_text: str, gold: Set[str]) -> Dict[str, float]:
-    pred = set(extract_edges(pred_text))
-    if not gold:
-        return {"edge_precision": 0.0, "edge_recall": 0.0, "edge_f1": 0.0, "shd": 0.0}
+def _as_pairs(edges: Iterable) -> List[Edge]:
+    out: List[Edge] = []
+    for e in edges:
+        if isinstance(e, str):
+            u, v = e.split("->", 1)
+            out.append((u.strip(), v.strip()))
+        else:
+            out.append((str(e[0]), str(e[1])))
+    return out
+
+
+def node_index(*edge_sets: Iterable[Edge], nodes: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """Index the item's nodes first, then any other node an edge mentions."""
+    index: Dict[str, int] = {}
+    for n in nodes or []:
+        index.setdefault(str(n), len(index))
+    for edges in edge_sets:
+        for u, v in edges:
+            index.setdefault(u, len(index))
+            index.setdefault(v, len(index))
+    return index
+
+
+def adjacency(edges: Iterable[Edge], index: Dict[str, int], size: Optional[int] = None) -> np.ndarray:
+    n = len(index) if size is None else size
+    A = np.zeros((n, n), dtype=bool)
+    pairs = [(index[u], index[v]) for u, v in edges]
+    if pairs:
+        rows, cols = zip(*pairs)
+        A[list(rows), list(cols)] = True
+    return A
+
+
+def _prf(tp: np.ndarray, n_pred: np.ndarray, n_gold: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    precision = tp / np.maximum(1, n_pred)
+    recall = tp / np.maximum(1, n_gold)
+    denom = precision + recall
+    f1 = np.where(denom > 0, 2 * precision * recall / np.where(denom > 0, denom, 1.0), 0.0)
+    return precision, recall, f1
+
+
+def score_adjacency_batch(pred: np.ndarray, gold: np.ndarray, skeleton: bool = False) -> Dict[str, np.ndarray]:
+    """Score stacked ``(batch, n, n)`` boolean adjacency tensors; returns one array per metric."""
+    pred = np.asarray(pred, dtype=bool)
+    gold = np.asarray(gold, dtype=bool)
+    axes = (-2, -1)
+
+    tp = (pred & gold).sum(axis=axes)
+    precision, recall, f1 = _prf(tp, pred.sum(axis=axes), gold.sum(axis=axes))
+
+    # A node pair counts once however its connection differs (missing, extra or reversed).
+    diff = pred != gold
+    pair_diff = diff | np.swapaxes(diff, -1, -2)
+    n = pred.shape[-1]
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    shd = (pair_diff & upper).sum(axis=axes) + np.diagonal(diff, axis1=-2, axis2=-1).sum(axis=-1)
+
+    out = {"edge_precision": precision, "edge_recall": recall, "edge_f1": f1, "shd": shd.astype(float)}
+    if skeleton:
+        sp = (pred | np.swapaxes(pred, -1, -2)) & upper
+        sg = (gold | np.swapaxes(gold, -1, -2)) & upper
+        s_tp = (sp & sg).sum(axis=axes)
+        s_p, s_r, s_f1 = _prf(s_tp, sp.sum(axis=axes), sg.sum(axis=axes))
+        out.update({"skeleton_precision": s_p, "skeleton_recall": s_r, "skeleton_f1": s_f1})
+    return out
+
+
+def score_edge_batch(
+    preds: Sequence[Iterable],
+    golds: Sequence[Iterable],
+    nodes: Optional[Sequence[Optional[Sequence[str]]]] = None,
+    skeleton: bool = False,
+) -> List[Dict[str, float]]:
+    """Score many (predicted, gold) edge sets in one vectorized pass.
 
-    tp = len(pred & gold)
-    fp = len(pred - gold)
-    fn = len(gold - pred)
+    Edges may be ``"A->B"`` strings or ``(u, v)`` pairs. Graphs are padded to
+    the largest node count, which leaves every metric unchanged. Items with an
+    empty gold graph get all-zero metrics.
+    """
+    pred_pairs = [_as_pairs(p) for p in preds]
+    gold_pairs = [_as_pairs(g) for g in golds]
+    node_lists = nodes if nodes is not None else [None] * len(pred_pairs)
+    indexes = [node_index(g, p, nodes=ns) for p, g, ns in zip(pred_pairs, gold_pairs, node_lists)]
+    size = max((len(ix) for ix in indexes), default=0)
 
-    precision = tp / max(1, tp + fp)
-    recall = tp / max(1, tp + fn)
-    f1 = (2 * precision * recall / (precision + recall)) if (precision + recall) > 0 else 0.0
+    P = np.stack([adjacency(p, ix, size) for p, ix in zip(pred_pairs, indexes)]) if indexes else np.zeros((0, 0, 0), bool)
+    G = np.stack([adjacency(g, ix, size) for g, ix in zip(gold_pairs, indexes)]) if indexes else np.zeros((0, 0, 0), bool)
+    metrics = score_adjacency_batch(P, G, skeleton=skeleton)
+    return [
+        {k: float(v[i]) if gold_pairs[i] else 0.0 for k, v in metrics.items()}
+        for i in range(len(indexes))
+    ]
 
-    # SHD for directed graphs (simple): additions + deletions (no reversal handling beyond add/del).
-    shd = float(fp + fn)
 
-    return {"edge_precision": precision, "edge_recall": recall, "edge_f1": f1, "shd": shd}
+def score_predicted_edges(pred_text: str, gold: Set[str], nodes: Optional[Sequence[str]] = None, skeleton: bool = False) -> Dict[str, float]:
+    pred = set(extract_edges(pred_text, nodes))
+    return score_edge_batch([pred], [gold], [nodes], skeleton=skeleton)[0]
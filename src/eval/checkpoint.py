@@ -0,0 +1,80 @@
+"""Append-only checkpoint of per-item records.
+
+Every finished item's prediction record is appended as one JSON line to
+``results/{run_id}_predictions.jsonl`` (see `scoring.predictions_path`) and
+flushed immediately, so an interrupted run (provider outage, Ctrl-C, OOM)
+keeps all completed work. Resuming the run reloads the file and only sends
+items whose id is not in it yet to the model.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Set
+
+_BLOCK = 64 * 1024
+
+
+class ItemCheckpoint:
+    """Thread-safe JSONL writer/reader for completed item records."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Stream the completed records in file order, one line in memory at a time."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # cut short by a crash mid-write
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def ids(self) -> Set[str]:
+        """Return the ids of the completed items.
+
+        A trailing line cut short by a crash mid-write is dropped from the
+        file (so later appends start on a fresh line); that item is simply
+        evaluated again.
+        """
+        self._drop_partial_line()
+        return {str(row.get("id")) for row in self.records()}
+
+    def _drop_partial_line(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r+b") as f:
+            end = pos = f.seek(0, os.SEEK_END)
+            complete = 0
+            while pos > 0:
+                step = min(_BLOCK, pos)
+                f.seek(pos - step)
+                nl = f.read(step).rfind(b"\n")
+                if nl != -1:
+                    complete = pos - step + nl + 1
+                    break
+                pos -= step
+            if complete < end:
+                f.truncate(complete)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        line = json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
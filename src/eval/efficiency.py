@@ -1,6 +1,8 @@
 """Token efficiency scorer.
 
-Maps total token usage to a 0-1 score where lower usage is better.
+Maps total token usage to a 0-1 score where lower usage is better. Usage
+flagged ``usage_estimated`` (a stream cancelled before the provider reported
+its counts) is not scored: the item gets NaN, which means skip.
 """
 
 from __future__ import annotations
@@ -11,6 +13,8 @@ from typing import Any, Dict, Optional
 def efficiency_from_usage(usage: Optional[Dict[str, Any]]) -> float:
     """Return an efficiency score in [0, 1] based on total token count."""
     usage = usage or {}
+    if usage.get("usage_estimated"):
+        return float("nan")
     total = float(usage.get("total_tokens") or 0)
     if total <= 0:
         return 0.0
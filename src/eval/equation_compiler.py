@@ -0,0 +1,172 @@
+"""Safe, vectorized evaluation of predicted equations.
+
+A predicted law such as ``2*x + 1`` or ``3*sin(x) - x**2`` is parsed once
+into a Python AST, checked against a small whitelist (numbers, the input
+variables, arithmetic operators and a few NumPy functions), and compiled.
+The compiled expression is then evaluated over the whole sample array in one
+NumPy call instead of once per point. Compiled laws are cached by their
+whitespace-normalized text, so repeated candidates cost nothing.
+
+Anything outside the whitelist (attribute access, subscripts, names other
+than the inputs, comprehensions, ...) is rejected before evaluation, so no
+model output is ever passed to a bare ``eval``.
+"""
+
+from __future__ import annotations
+
+import ast
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+}
+_CONSTANTS: Dict[str, float] = {"pi": float(np.pi), "e": float(np.e)}
+
+_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARYOPS = (ast.UAdd, ast.USub)
+
+
+class EquationError(ValueError):
+    """The predicted law is not a supported arithmetic expression."""
+
+
+def normalize_law(pred: str) -> str:
+    """Strip a trailing ``# comment`` and a leading ``y =`` from a model answer."""
+    return (pred or "").split("#")[0].strip().replace("y=", "").replace("y =", "").strip()
+
+
+class _Validator(ast.NodeTransformer):
+    def __init__(self, variables: Tuple[str, ...]):
+        self.variables = variables
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        raise EquationError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node: ast.Expression) -> ast.AST:
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise EquationError(f"Unsupported constant: {node.value!r}")
+        # Float constants keep e.g. 9**9**9 from becoming an unbounded integer power.
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in self.variables or node.id in _CONSTANTS:
+            return node
+        raise EquationError(f"Unknown name: {node.id}")
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        if not isinstance(node.op, _BINOPS):
+            raise EquationError(f"Unsupported operator: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        if not isinstance(node.op, _UNARYOPS):
+            raise EquationError(f"Unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords or len(node.args) != 1:
+            raise EquationError("Unsupported function call")
+        node.args = [self.visit(node.args[0])]
+        return node
+
+
+class CompiledLaw:
+    """A validated law, callable on NumPy arrays."""
+
+    def __init__(self, source: str, variables: Tuple[str, ...]):
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise EquationError(f"Cannot parse law: {source!r}") from e
+        tree = ast.fix_missing_locations(_Validator(variables).visit(tree))
+        self.source = source
+        self.variables = variables
+        self._code = compile(tree, "<law>", "eval")
+        self._globals = {"__builtins__": {}, **_FUNCTIONS, **_CONSTANTS}
+
+    def __call__(self, **arrays: np.ndarray) -> np.ndarray:
+        """Evaluate over the given input arrays; the result has their common shape."""
+        try:
+            with np.errstate(all="ignore"):
+                out = np.asarray(eval(self._code, self._globals, arrays), dtype=np.float64)  # noqa: S307 - AST whitelisted above
+            if out.ndim == 0 or len(arrays) > 1:
+                # Constant laws (and laws ignoring some inputs) still yield one value per point.
+                out = np.broadcast_to(out, np.broadcast_shapes(*(np.shape(a) for a in arrays.values())))
+            return out
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise EquationError(f"Cannot evaluate law {self.source!r}: {e}") from e
+
+
+@lru_cache(maxsize=4096)
+def _compile_cached(source: str, variables: Tuple[str, ...]) -> CompiledLaw:
+    return CompiledLaw(source, variables)
+
+
+def compile_law(law: str, variables: Sequence[str] = ("x",)) -> CompiledLaw:
+    """Compile `law` (cached by its whitespace-normalized text); raises `EquationError`."""
+    return _compile_cached("".join(law.split()), tuple(variables))
+
+
+def evaluate_law(law: str, x: Any) -> np.ndarray:
+    """Evaluate `law` at every point of `x`; raises `EquationError` on bad or non-finite output."""
+    xs = np.asarray(x, dtype=np.float64)
+    y_hat = compile_law(law)(x=xs)
+    if not np.all(np.isfinite(y_hat)):
+        raise EquationError("Law is not finite on the sample points")
+    return y_hat
+
+
+def evaluate_candidates(laws: Sequence[str], x: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate many laws on the same points.
+
+    Returns ``(Y, ok)``: ``Y`` is an ``(n_laws, n_points)`` matrix (rows of
+    failed laws are NaN) and ``ok`` marks laws that compiled and stayed finite.
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    Y = np.full((len(laws), xs.size), np.nan)
+    for i, law in enumerate(laws):
+        try:
+            Y[i] = compile_law(law)(x=xs).ravel()
+        except EquationError:
+            continue
+    ok = np.all(np.isfinite(Y), axis=1) if xs.size else np.zeros(len(laws), dtype=bool)
+    return Y, ok
+
+
+def mse_rows(Y: np.ndarray, y: Any) -> np.ndarray:
+    """Per-row mean squared error of `Y` against targets `y` (NaN rows stay NaN)."""
+    return np.mean((Y - np.asarray(y, dtype=np.float64)) ** 2, axis=1)
+
+
+def fit_affine(Y: np.ndarray, y: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares ``a, b`` per row so that ``a * Y[i] + b`` best matches `y`.
+
+    Solved in closed form for all rows at once. Rows that are constant get
+    ``a = 1`` and only their offset fitted.
+    """
+    ys = np.asarray(y, dtype=np.float64)
+    y_mean = ys.mean()
+    f_mean = Y.mean(axis=1)
+    fc = Y - f_mean[:, None]
+    var = np.einsum("ij,ij->i", fc, fc)
+    cov = fc @ (ys - y_mean)
+    with np.errstate(all="ignore"):
+        a = np.where(var > 1e-12, cov / np.where(var > 1e-12, var, 1.0), 1.0)
+    b = y_mean - a * f_mean
+    return a, b
@@ -1,109 +1,367 @@
 """Core evaluation loop.
 
 The `Evaluator` class orchestrates data loading, prompt construction,
-LLM inference, and per-item scoring for a single experiment run.
+LLM inference, and per-item scoring for a single experiment run. Inference
+writes raw prediction records; scoring is a separate stage over those
+records (see `scoring.py`).
 """
 
-from typing import List, Tuple
+import asyncio
+import contextlib
+import contextvars
+import os
+import time
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 
 import pandas as pd
 
 from ..adapters import ADAPTERS
-from ..config import ExperimentConfig
+from ..adapters.base import BaseAdapter
+from ..adapters.cache import CachedAdapter, ResponseCache
+from ..adapters.call_stats import CallStats, collect_call_stats, timed_call
+from ..adapters.clients import HttpOptions, aclose_loop_clients
+from ..adapters.rate_limit import AdapterError, configure_rate_limits
+from ..adapters.streaming import StreamingAdapter
+from ..config import ExperimentConfig, ModelSpec
 from ..data.loaders import (
-    load_autobench,
-    load_baisbench,
-    load_biodsa,
-    load_llm_srbench,
-    load_researchbench,
-    load_scihorizon,
-    load_synthetic,
+    iter_autobench,
+    iter_baisbench,
+    iter_biodsa,
+    iter_llm_srbench,
+    iter_researchbench,
+    iter_scihorizon,
+    iter_synthetic,
 )
 from ..data.schemas import TaskItem
-from ..eval.judge_science import score_item
-from ..eval.metrics_science import summarize_metrics
+from ..eval.checkpoint import ItemCheckpoint
+from ..eval.metrics_science import summarize_metrics, summarize_throughput
+from ..eval.novelty import CorpusSketch
+from ..eval.scoring import novelty_sketch, predictions_path, score_records
 from ..scenarios import SCENARIOS
 from ..tools.tool_registry import ToolRegistry
 from ..utils.logging import get_logger
 from ..utils.paths import data_path
 from ..utils.random_seed import fix_seed
+from ..utils.tracing import Tracer, activate, deactivate, span
+
+T = TypeVar("T")
 
 LOADER_MAP = {
-    "autobench": load_autobench,
-    "llm_srbench": load_llm_srbench,
-    "scihorizon": load_scihorizon,
-    "researchbench": load_researchbench,
-    "baisbench": load_baisbench,
-    "biodsa": load_biodsa,
-    "synthetic": load_synthetic,
+    "autobench": iter_autobench,
+    "llm_srbench": iter_llm_srbench,
+    "scihorizon": iter_scihorizon,
+    "researchbench": iter_researchbench,
+    "baisbench": iter_baisbench,
+    "biodsa": iter_biodsa,
+    "synthetic": iter_synthetic,
 }
 
 
+def _ordered_map(pool: ThreadPoolExecutor, fn: Callable[[TaskItem], T], items: Iterable[TaskItem], window: int) -> Iterator[T]:
+    """Like `pool.map`, but pulls at most `window` items ahead of the oldest unfinished one.
+
+    `Executor.map` drains its whole input up front; this keeps a lazily
+    loaded dataset lazy while still yielding results in item order.
+    """
+    pending: Deque = deque()
+    for item in items:
+        # Each task runs in a copy of the caller's context, so it sees the run's active tracer.
+        pending.append(pool.submit(contextvars.copy_context().run, fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_adapter(model: ModelSpec) -> BaseAdapter:
+    """Instantiate the provider adapter for a model spec; budgets are shared by every adapter of the provider and model."""
+    configure_rate_limits(model.provider, rpm=model.rpm, tpm=model.tpm, max_retries=model.max_retries, model=model.model)
+    http = HttpOptions(timeout_s=model.timeout_s, max_connections=model.max_connections, http2=model.http2)
+    return ADAPTERS[model.provider](model.model, model.temperature, model.top_p, model.max_tokens, model.tools, http)
+
+
 class Evaluator:
-    """Run all tasks through the configured scenario + adapter and collect scores."""
+    """Run all tasks through the configured scenario + adapter and collect scores.
+
+    Items are consumed from an iterator (the loaders stream them), so only
+    the items currently in flight are held in memory.
+    """
 
-    def __init__(self, cfg: ExperimentConfig, run_id: str):
+    def __init__(
+        self,
+        cfg: ExperimentConfig,
+        run_id: str,
+        resume: bool = False,
+        items: Optional[Iterable[TaskItem]] = None,
+        adapter: Optional[BaseAdapter] = None,
+    ):
         self.cfg = cfg
         self.logger = get_logger("evaluator", run_id)
         fix_seed(cfg.random_seed)
 
-        # Data
-        loader = LOADER_MAP[cfg.data.loader]
-        self.items: List[TaskItem] = loader(cfg.data.path, cfg.data.limit)
+        # Raw predictions are streamed to an append-only file that doubles as the
+        # checkpoint; on resume, items already in it are not sent to the model again.
+        self.checkpoint = ItemCheckpoint(predictions_path(run_id))
+        self.completed: Set[str] = self.checkpoint.ids() if resume else set()
+        # Failed calls are not checkpointed; their records wait here for scoring.
+        self.errors: Dict[str, Dict[str, Any]] = {}
+        if resume:
+            self.logger.info("Resuming %s: %d items already scored", run_id, len(self.completed))
+
+        # Data: a lazy iterator unless the caller passes items in
+        if items is None:
+            items = LOADER_MAP[cfg.data.loader](cfg.data.path, cfg.data.limit)
+        self.items: Iterable[TaskItem] = items
 
         # Scenario (prompt/workflow strategy)
         self.scenario = SCENARIOS[cfg.scenario.name](cfg.scenario.params)
 
-        # Model adapter (LLM provider)
-        adapter_cls = ADAPTERS[cfg.model.provider]
-        self.adapter = adapter_cls(
-            cfg.model.model,
-            cfg.model.temperature,
-            cfg.model.top_p,
-            cfg.model.max_tokens,
-            cfg.model.tools,
-        )
+        # Model adapter (LLM provider), unless the caller shares one across runs
+        self.adapter = adapter if adapter is not None else build_adapter(cfg.model)
+
+        # Optional streaming with early termination, below the cache so only whole answers are cached
+        if cfg.run.stream:
+            self.adapter = StreamingAdapter(self.adapter)
+
+        # Optional persistent response cache in front of the provider
+        self.cache: Optional[ResponseCache] = None
+        if cfg.run.cache != "off":
+            self.cache = ResponseCache(cfg.run.cache_path, mode=cfg.run.cache, max_bytes=cfg.run.cache_max_mb * 1024 * 1024)
+            self.adapter = CachedAdapter(self.adapter, cfg.model.provider, self.cache)
 
         # Offline tools available to agentic scenarios
         self.tool_registry = ToolRegistry.from_config(
             tool_names=cfg.model.tools,
             corpus_path=data_path("corpus", "mini_science_corpus.jsonl"),
+            index_path=os.path.join("results", "cache", "retrieval_bm25.pkl"),
         )
 
-    def run(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        rows = []
-        enabled_tools = self.tool_registry.list_enabled(self.cfg.model.tools)
+        # Optional novelty against the whole retrieval corpus (metrics.novelty.corpus: true)
+        self.novelty_sketch: Optional[CorpusSketch] = novelty_sketch(cfg.metrics, self.tool_registry.retrieval)
 
-        for item in self.items:
-            item_dict = item.model_dump()
+        # Optional span tracing (run.trace / --trace); see src/utils/tracing.py
+        self.tracer: Optional[Tracer] = Tracer() if cfg.run.trace else None
+
+        # Wall time of the inference stage and the resulting run-level throughput
+        self.inference_s: float = 0.0
+        self.throughput: Dict[str, Any] = {}
+
+    def _meta(self, item: TaskItem, item_dict: Dict[str, Any]) -> Dict[str, Any]:
+        meta = {"task_type": item.task_type, "domain": item.domain, "id": item.id, "split": item.split}
+        if hasattr(self.scenario, "stop_when"):
+            # Completion check for streamed answers (see src/adapters/streaming.py).
+            meta["stop_when"] = self.scenario.stop_when(item_dict)
+        return meta
+
+    @staticmethod
+    def _stats(start: float, calls: CallStats) -> Dict[str, Any]:
+        return {"latency_s": time.perf_counter() - start, **calls.as_row()}
+
+    def _record(self, item_dict: Dict[str, Any], prompt: Optional[str], out: Dict[str, Any], stats: Dict[str, Any]) -> str:
+        """Append a finished item's prediction record to the checkpoint; only its id stays in memory."""
+        self.checkpoint.append({"id": item_dict["id"], "item": item_dict, "prompt": prompt, "output": out, "stats": stats})
+        return str(item_dict["id"])
+
+    def _error(self, item_dict: Dict[str, Any], prompt: Optional[str], error: Any, stats: Dict[str, Any]) -> str:
+        self.logger.warning("Item %s failed: %s", item_dict["id"], error)
+        self.errors[str(item_dict["id"])] = {"id": item_dict["id"], "item": item_dict, "prompt": prompt, "error": str(error), "stats": stats}
+        return str(item_dict["id"])
 
-            meta = {"task_type": item.task_type, "domain": item.domain, "id": item.id, "split": item.split}
+    def _evaluate_item(self, item: TaskItem, enabled_tools: List[str]) -> str:
+        """Run a single item through the scenario/adapter, record its prediction and return its id."""
+        if item.id in self.completed:
+            return item.id
+
+        start = time.perf_counter()
+        with span("item", id=item.id), collect_call_stats() as calls:
+            item_dict = item.model_dump()
 
             # If the scenario supports agentic execution with tools, use it.
-            if hasattr(self.scenario, "run"):
-                out = self.scenario.run(item_dict, self.adapter, self.tool_registry, enabled_tools)
-                prompt = None
-            else:
-                prompt = self.scenario.make_prompt(item_dict)
-                out = self.adapter.generate(prompt, meta)
-
-            score = score_item(item, out)
-            row = {
-                "id": item.id,
-                "domain": item.domain,
-                "task_type": item.task_type,
-                "split": item.split,
-                "prompt": prompt,
-                "prediction": out.get("content"),
-                "rationale": out.get("rationale"),
-                "agent_plan": (out.get("agent", {}) or {}).get("plan"),
-                "agent_tool": ((out.get("agent", {}) or {}).get("tool_call", {}) or {}).get("tool"),
-                "agent_tool_ok": ((out.get("agent", {}) or {}).get("tool_obs", {}) or {}).get("ok"),
-                **score,
-                **(out.get("usage", {}) or {}),
-            }
-            rows.append(row)
-
-        per_item_df = pd.DataFrame(rows)
+            agentic = hasattr(self.scenario, "run")
+            prompt = None
+            try:
+                if agentic:
+                    out = self.scenario.run(item_dict, self.adapter, self.tool_registry, enabled_tools)
+                else:
+                    with span("prompt"):
+                        prompt = self.scenario.make_prompt(item_dict)
+                    with span("adapter"), timed_call():
+                        out = self.adapter.generate(prompt, self._meta(item, item_dict))
+                    if hasattr(self.scenario, "parse_output"):
+                        with span("parse"):
+                            out = self.scenario.parse_output(item_dict, out)
+            except AdapterError as e:
+                # Not checkpointed, so a resumed run retries the item.
+                return self._error(item_dict, prompt, e, self._stats(start, calls))
+
+            return self._record(item_dict, prompt, out, self._stats(start, calls))
+
+    async def _aevaluate_item(self, item: TaskItem, enabled_tools: List[str]) -> str:
+        """Async counterpart of `_evaluate_item` using `adapter.agenerate()`."""
+        if item.id in self.completed:
+            return item.id
+
+        start = time.perf_counter()
+        with span("item", id=item.id), collect_call_stats() as calls:
+            item_dict = item.model_dump()
+
+            agentic = hasattr(self.scenario, "run")
+            prompt = None
+            try:
+                if hasattr(self.scenario, "arun"):
+                    out = await self.scenario.arun(item_dict, self.adapter, self.tool_registry, enabled_tools)
+                elif agentic:
+                    # Scenario has no async protocol; keep the event loop free while it runs.
+                    out = await asyncio.to_thread(self.scenario.run, item_dict, self.adapter, self.tool_registry, enabled_tools)
+                else:
+                    with span("prompt"):
+                        prompt = self.scenario.make_prompt(item_dict)
+                    with span("adapter"), timed_call():
+                        out = await self.adapter.agenerate(prompt, self._meta(item, item_dict))
+                    if hasattr(self.scenario, "parse_output"):
+                        with span("parse"):
+                            out = self.scenario.parse_output(item_dict, out)
+            except AdapterError as e:
+                return self._error(item_dict, prompt, e, self._stats(start, calls))
+
+            return self._record(item_dict, prompt, out, self._stats(start, calls))
+
+    def _finalize(self, ids: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Scoring stage: score the run's items, in order `ids`, over `run.score_workers` processes.
+
+        Prediction records are streamed back from the checkpoint file rather
+        than held in memory; only failed items' records are kept.
+        """
+        self.logger.info("Generated %d predictions; scoring with %d worker(s)", len(ids), self.cfg.run.score_workers)
+        wanted = set(ids) - set(self.errors)
+        saved = (r for r in self.checkpoint.records() if str(r.get("id")) in wanted)
+        with span("scoring", n=len(ids)):
+            rows = score_records(chain(saved, self.errors.values()), workers=self.cfg.run.score_workers, corpus_sketch=self.novelty_sketch)
+        by_id = {str(row["id"]): row for row in rows}
+        per_item_df = pd.DataFrame([by_id[i] for i in ids if i in by_id])
         summary_df = summarize_metrics(per_item_df)
+        # Throughput counts only the items generated by this invocation, not ones loaded on
+        # resume; run_config() merges it with the earlier invocations' (merge_throughput).
+        fresh = per_item_df[~per_item_df["id"].astype(str).isin(self.completed)] if len(per_item_df) else per_item_df
+        self.throughput = summarize_throughput(fresh, self.inference_s)
         return summary_df, per_item_df
+
+    def _run_batch(self) -> List[str]:
+        """Evaluate items as provider batch jobs of `run.batch_size` prompts each.
+
+        Only single-prompt scenarios can be batched: every prompt must be
+        known before any answer comes back.
+        """
+        if hasattr(self.scenario, "run"):
+            raise ValueError(f"run.backend 'batch' needs a single-prompt scenario; {self.cfg.scenario.name!r} is agentic")
+
+        ids: List[str] = []
+        pending: List[Tuple[Dict[str, Any], str, Dict[str, Any]]] = []
+
+        def _flush() -> None:
+            self.logger.info("Submitting a batch of %d prompts", len(pending))
+            start = time.perf_counter()
+            with span("adapter_batch", n=len(pending)):
+                outs = self.adapter.generate_batch(
+                    [(prompt, meta) for _, prompt, meta in pending],
+                    poll_s=self.cfg.run.batch_poll_s,
+                )
+            # Every item of a job waits for the whole job.
+            job_s = time.perf_counter() - start
+            stats = {"latency_s": job_s, "adapter_calls": 1, "retries": 0, "adapter_latency_s": job_s}
+            for (item_dict, prompt, _), out in zip(pending, outs):
+                if isinstance(out, AdapterError):
+                    self._error(item_dict, prompt, out, dict(stats))
+                    continue
+                if hasattr(self.scenario, "parse_output"):
+                    out = self.scenario.parse_output(item_dict, out)
+                self._record(item_dict, prompt, out, dict(stats))
+            pending.clear()
+
+        for item in self.items:
+            ids.append(item.id)
+            if item.id in self.completed:
+                continue
+            item_dict = item.model_dump()
+            with span("prompt"):
+                prompt = self.scenario.make_prompt(item_dict)
+            pending.append((item_dict, prompt, self._meta(item, item_dict)))
+            if len(pending) >= self.cfg.run.batch_size:
+                _flush()
+        if pending:
+            _flush()
+        return ids
+
+    async def arun(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Evaluate all items on the running event loop.
+
+        `run.concurrency` workers pull items from the shared iterator, so at
+        most that many are loaded and in flight at once. Items are scored in
+        item order, so the output matches `run()`.
+        """
+        enabled_tools = self.tool_registry.list_enabled(self.cfg.model.tools)
+        items = enumerate(self.items)
+        done: Dict[int, str] = {}
+
+        async def _worker() -> None:
+            # Advancing the iterator never awaits, so workers cannot race on it.
+            for idx, item in items:
+                done[idx] = await self._aevaluate_item(item, enabled_tools)
+
+        with self._tracing():
+            start = time.perf_counter()
+            try:
+                with span("inference"):
+                    await asyncio.gather(*(_worker() for _ in range(self.cfg.run.concurrency)))
+            finally:
+                # Async clients belong to this loop; close their connections before it ends.
+                await aclose_loop_clients()
+            self.inference_s = time.perf_counter() - start
+            return self._finalize([done[i] for i in range(len(done))])
+
+    @contextlib.contextmanager
+    def _tracing(self) -> Iterator[None]:
+        """Make this run's tracer (if any) the active one while evaluating."""
+        if self.tracer is None:
+            yield
+            return
+        token = activate(self.tracer)
+        try:
+            yield
+        finally:
+            deactivate(token)
+
+    def run(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if self.cfg.run.backend == "async":
+            self.logger.info("Evaluating items on asyncio with concurrency=%d", self.cfg.run.concurrency)
+            return asyncio.run(self.arun())
+
+        with self._tracing():
+            if self.cfg.run.backend == "batch":
+                self.logger.info("Evaluating items as provider batch jobs of up to %d prompts", self.cfg.run.batch_size)
+                start = time.perf_counter()
+                with span("inference"):
+                    ids = self._run_batch()
+                self.inference_s = time.perf_counter() - start
+                return self._finalize(ids)
+
+            enabled_tools = self.tool_registry.list_enabled(self.cfg.model.tools)
+            concurrency = self.cfg.run.concurrency
+
+            start = time.perf_counter()
+            with span("inference"):
+                if concurrency > 1:
+                    # Items are independent, so fan them out over a bounded thread pool.
+                    # Results come back in submission order, which keeps per_item_df
+                    # identical to a sequential run.
+                    self.logger.info("Evaluating items with concurrency=%d", concurrency)
+                    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="item") as pool:
+                        ids = list(_ordered_map(pool, lambda it: self._evaluate_item(it, enabled_tools), self.items, window=2 * concurrency))
+                else:
+                    ids = [self._evaluate_item(item, enabled_tools) for item in self.items]
+            self.inference_s = time.perf_counter() - start
+
+            return self._finalize(ids)
@@ -6,25 +6,26 @@ appends cross-cutting metrics (novelty, reasoning depth, efficiency).
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 
 from ..data.schemas import TaskItem
-from .causal_metrics import gold_edges, score_predicted_edges
-from .novelty import novelty_against_retrieved_docs
+from ..utils.text import extract_edges
+from .causal_metrics import gold_edges, score_edge_batch
+from .equation_compiler import evaluate_candidates, evaluate_law, mse_rows, normalize_law
+from .novelty import CorpusSketch, novelty_against_corpus, novelty_against_retrieved_docs
 from .reasoning import reasoning_depth_from_trace
 from .efficiency import efficiency_from_usage
 
 
 def _score_equation(item: TaskItem, pred: str) -> Dict[str, Any]:
-    # very simple numeric check using eval with restricted globals (demo only)
+    # Numeric check: the law is compiled once (restricted AST, no eval of raw
+    # model output) and evaluated over all x at once.
     xs, ys = item.input["x"], item.input["y"]
     try:
-        law = pred.split("#")[0].strip().replace("y=", "").replace("y =", "").strip()
-        # evaluate numeric equivalence roughly (MSE)
-        y_hat = [eval(law, {"__builtins__": {}}, {"x": x}) for x in xs]  # TODO: replace with sympy for safety
-        mse = float(np.mean([(a - b) ** 2 for a, b in zip(ys, y_hat)]))
+        y_hat = evaluate_law(normalize_law(pred), xs)
+        mse = float(np.mean((np.asarray(ys, dtype=np.float64) - y_hat) ** 2))
         acc = 1.0 if mse < 1e-6 else max(0.0, 1.0 - min(mse, 10.0) / 10.0)
     except Exception:
         acc = 0.0
@@ -32,9 +33,31 @@ def _score_equation(item: TaskItem, pred: str) -> Dict[str, Any]:
     return {"acc": acc, "mse": mse, "consistency_pass": acc > 0.8}
 
 
-def _score_causal(item: TaskItem, pred: str) -> Dict[str, Any]:
-    g = gold_edges(item.gold)
-    m = score_predicted_edges(pred, g)
+def _score_equation_candidates(item: TaskItem, candidates: List[str]) -> Dict[str, Any]:
+    # Best-of-N: every candidate is evaluated into one (n, n_points) matrix and
+    # all MSEs come from a single vectorized pass.
+    xs, ys = item.input["x"], item.input["y"]
+    mse = np.full(len(candidates), 1e6)
+    try:
+        Y, ok = evaluate_candidates(candidates, xs)
+        if ok.any():
+            mse[ok] = mse_rows(Y[ok], ys)
+    except Exception:
+        ok = np.zeros(len(candidates), dtype=bool)
+    best = int(np.argmin(mse)) if candidates else -1
+    best_mse = float(mse[best]) if candidates else 1e6
+    acc = 0.0 if not ok.any() else (1.0 if best_mse < 1e-6 else max(0.0, 1.0 - min(best_mse, 10.0) / 10.0))
+    return {
+        "acc": acc,
+        "mse": best_mse,
+        "consistency_pass": acc > 0.8,
+        "n_candidates": len(candidates),
+        "n_valid_candidates": int(ok.sum()),
+        "best_candidate": candidates[best] if candidates else None,
+    }
+
+
+def _causal_row(m: Dict[str, float]) -> Dict[str, Any]:
     # Primary accuracy = F1 (balanced)
     acc = float(m.get("edge_f1", 0.0))
     return {
@@ -43,10 +66,23 @@ def _score_causal(item: TaskItem, pred: str) -> Dict[str, Any]:
         "edge_recall": float(m["edge_recall"]),
         "edge_f1": float(m["edge_f1"]),
         "shd": float(m.get("shd", 0.0)),
+        "skeleton_f1": float(m["skeleton_f1"]),
         "consistency_pass": acc >= 0.8,
     }
 
 
+def _score_causal(item: TaskItem, pred: str) -> Dict[str, Any]:
+    return score_causal_batch([item], [pred])[0]
+
+
+def score_causal_batch(items: Sequence[TaskItem], preds: Sequence[str]) -> List[Dict[str, Any]]:
+    """Causal scores of many items from one stacked adjacency pass (see `causal_metrics`)."""
+    nodes = [item.input.get("nodes") for item in items]
+    pred_edges = [extract_edges(pred, ns) for pred, ns in zip(preds, nodes)]
+    metrics = score_edge_batch(pred_edges, [gold_edges(item.gold) for item in items], nodes, skeleton=True)
+    return [_causal_row(m) for m in metrics]
+
+
 def _score_qa(item: TaskItem, pred: str) -> Dict[str, Any]:
     gold = item.gold.get("answer", "").lower().replace(" ", "")
     got = (pred or "").lower().replace(" ", "")
@@ -58,17 +94,31 @@ def _score_default(item: TaskItem, pred: str) -> Dict[str, Any]:
     return {"acc": 0.0, "consistency_pass": False}
 
 
-def score_item(item: TaskItem, model_out: Dict[str, Any]) -> Dict[str, Any]:
-    pred = (model_out.get("content") or "").strip()
+def prediction_text(model_out: Dict[str, Any]) -> str:
+    return (model_out.get("content") or "").strip()
 
+
+def _score_task(item: TaskItem, model_out: Dict[str, Any], pred: str) -> Dict[str, Any]:
     if item.task_type == "equation":
-        base = _score_equation(item, pred)
-    elif item.task_type == "causal":
-        base = _score_causal(item, pred)
-    elif item.task_type == "qa":
-        base = _score_qa(item, pred)
-    else:
-        base = _score_default(item, pred)
+        candidates = model_out.get("candidates")
+        return _score_equation(item, pred) if candidates is None else _score_equation_candidates(item, candidates)
+    if item.task_type == "causal":
+        return _score_causal(item, pred)
+    if item.task_type == "qa":
+        return _score_qa(item, pred)
+    return _score_default(item, pred)
+
+
+def score_item(
+    item: TaskItem,
+    model_out: Dict[str, Any],
+    corpus_sketch: Optional[CorpusSketch] = None,
+    base: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Score one item; `base` passes in task scores already computed in a batch (`score_causal_batch`)."""
+    pred = prediction_text(model_out)
+    if base is None:
+        base = _score_task(item, model_out, pred)
 
     # Offline, reproducible proxies tied to agent behavior.
     retrieved_docs = None
@@ -81,9 +131,14 @@ def score_item(item: TaskItem, model_out: Dict[str, Any]) -> Dict[str, Any]:
     reasoning_depth = reasoning_depth_from_trace(model_out)
     efficiency = efficiency_from_usage(model_out.get("usage"))
 
+    extra: Dict[str, Any] = {}
+    if corpus_sketch is not None:
+        extra["novelty_corpus"] = novelty_against_corpus(pred, corpus_sketch)
+
     return {
         **base,
         "novelty": float(novelty),
         "reasoning_depth": float(reasoning_depth),
         "efficiency": float(efficiency),
+        **extra,
     }
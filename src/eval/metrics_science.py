@@ -1,13 +1,31 @@
 """Metric aggregation across task items.
 
-Groups per-item scores by (task_type, split) and computes means.
+Groups per-item scores by (task_type, split) and computes means, plus
+latency percentiles and throughput when the items carry call statistics.
+Token-based figures (``tokens_per_s``, ``cached_token_rate``) leave out items
+whose usage is only estimated (``usage_estimated``, a cancelled stream).
 """
 
+from typing import Any, Dict, Optional
+
 import pandas as pd
 
+_GROUP = ['task_type', 'split']
+
+
+def _measured(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows whose token counts came from the provider rather than an estimate."""
+    if 'usage_estimated' not in df.columns:
+        return df
+    return df[~df['usage_estimated'].fillna(0).astype(bool)]
+
 
 def summarize_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate per-item metrics into a summary table."""
+    """Aggregate per-item metrics into a summary table.
+
+    Items whose provider call failed carry an ``error`` message and no scores;
+    means skip them and they are counted in ``error_rate`` instead.
+    """
     agg_map = {
         'acc': 'mean',
         'novelty': 'mean',
@@ -17,7 +35,92 @@ def summarize_metrics(df: pd.DataFrame) -> pd.DataFrame:
     }
     if 'shd' in df.columns:
         agg_map['shd'] = 'mean'
+    if 'skeleton_f1' in df.columns:
+        agg_map['skeleton_f1'] = 'mean'
+    if 'novelty_corpus' in df.columns:
+        agg_map['novelty_corpus'] = 'mean'
+    if 'n_candidates' in df.columns:
+        # Equation search: best-of-N MSE (median, since failed laws score 1e6).
+        agg_map['mse'] = 'median'
+        agg_map['n_candidates'] = 'mean'
+    agg_map = {c: f for c, f in agg_map.items() if c in df.columns}
+    if 'consistency_pass' in df.columns:
+        df = df.assign(consistency_pass=df['consistency_pass'].astype(float))
+    if 'error' in df.columns:
+        df = df.assign(error_rate=df['error'].notna().astype(float))
+        agg_map['error_rate'] = 'mean'
+
+    if 'retries' in df.columns:
+        agg_map['retries'] = 'mean'
+    if 'ttft_s' in df.columns:
+        # Streamed runs: time to first token and how many calls a completion check cut short.
+        agg_map['ttft_s'] = 'mean'
+        agg_map['stopped_early'] = 'mean'
 
-    agg = df.groupby(['task_type','split'], dropna=False).agg(agg_map).reset_index()
-    agg = agg.rename(columns={'acc':'mean_acc','consistency_pass':'consistency_rate', 'shd': 'mean_shd'})
+    agg = df.groupby(_GROUP, dropna=False).agg(agg_map).reset_index()
+    agg = agg.rename(columns={'acc':'mean_acc','consistency_pass':'consistency_rate', 'shd': 'mean_shd',
+                            'mse': 'median_mse', 'n_candidates': 'mean_n_candidates', 'retries': 'mean_retries',
+                            'ttft_s': 'mean_ttft_s', 'stopped_early': 'mean_stopped_early'})
+    if 'latency_s' in df.columns:
+        agg = agg.merge(_latency_stats(df), on=_GROUP, how='left')
+    if 'cached_tokens' in df.columns and 'prompt_tokens' in df.columns:
+        # Share of prompt tokens the provider served from its prompt cache.
+        sums = _measured(df).groupby(_GROUP, dropna=False)[['cached_tokens', 'prompt_tokens']].sum()
+        rate = (sums['cached_tokens'] / sums['prompt_tokens'].where(sums['prompt_tokens'] > 0)).rename('cached_token_rate')
+        agg = agg.merge(rate.reset_index(), on=_GROUP, how='left')
     return agg
+
+
+def _latency_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-group item latency percentiles and per-request token throughput (failed calls included)."""
+    grouped = df.groupby(_GROUP, dropna=False)
+    lat = grouped['latency_s'].quantile([0.5, 0.95, 0.99]).unstack()
+    lat.columns = ['p50_latency_s', 'p95_latency_s', 'p99_latency_s']
+    if 'total_tokens' in df.columns and 'adapter_latency_s' in df.columns:
+        sums = _measured(df).groupby(_GROUP, dropna=False)[['total_tokens', 'adapter_latency_s']].sum()
+        lat['tokens_per_s'] = sums['total_tokens'] / sums['adapter_latency_s'].where(sums['adapter_latency_s'] > 0)
+    return lat.reset_index()
+
+
+def _throughput(n: int, tokens: Optional[float], wall_s: float, estimated: int) -> Dict[str, Any]:
+    return {
+        'inference_wall_s': float(wall_s),
+        'n_items': int(n),
+        'total_tokens': tokens,
+        'items_per_s': n / wall_s if wall_s > 0 else None,
+        'tokens_per_s': tokens / wall_s if tokens is not None and wall_s > 0 else None,
+        'usage_estimated_items': int(estimated),
+    }
+
+
+def summarize_throughput(df: pd.DataFrame, wall_s: float) -> Dict[str, Any]:
+    """Run-level throughput: items and tokens generated per second of inference wall time.
+
+    The wall time covers every item, so tokens/s is only reported when no
+    item's usage is estimated; ``usage_estimated_items`` counts those that are.
+    """
+    n = int(len(df))
+    estimated = n - len(_measured(df))
+    tokens = float(df['total_tokens'].sum()) if 'total_tokens' in df.columns and not estimated else None
+    return _throughput(n, tokens, wall_s, estimated)
+
+
+def merge_throughput(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Throughput of a resumed run: the items and tokens of all invocations over their summed wall time."""
+    if not previous:
+        return current
+    wall = float(previous.get('inference_wall_s') or 0.0)
+    # Blocks written before the counts were stored only carry rates.
+    n = previous.get('n_items')
+    if n is None:
+        n = round((previous.get('items_per_s') or 0.0) * wall)
+    tokens = previous.get('total_tokens')
+    if tokens is None and previous.get('tokens_per_s') is not None:
+        tokens = previous['tokens_per_s'] * wall
+    merged_tokens = tokens + current['total_tokens'] if tokens is not None and current['total_tokens'] is not None else None
+    return _throughput(
+        int(n) + current['n_items'],
+        merged_tokens,
+        wall + current['inference_wall_s'],
+        int(previous.get('usage_estimated_items') or 0) + current['usage_estimated_items'],
+    )
@@ -1,7 +1,71 @@
 from __future__ import annotations
 
-import hashlib
-from typing import Any, Dict, Optional
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..utils.io import atomic_pickle
+
+# Character n-gram size and sampling stride of the copy-detection proxy.
+_N = 30
+_STRIDE = 5
+_BASE = np.uint64(0x100000001B3)
+# Below this much document text, plain substring sets beat hashing.
+_HASH_MIN_CHARS = 4096
+
+
+def _codes(s: str) -> np.ndarray:
+    return np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def gram_hashes(s: str, n: int = _N, stride: int = _STRIDE) -> np.ndarray:
+    """Rabin-Karp hashes of the character n-grams of `s` starting every `stride` chars.
+
+    The polynomial hash (mod 2**64) is computed for all start positions at once
+    by Horner's rule over the n offsets, so memory stays O(len(s) / stride)
+    instead of materialising every substring.
+    """
+    c = _codes(s)
+    m = (len(c) - n) // stride + 1
+    if m <= 0:
+        return np.empty(0, dtype=np.uint64)
+    h = c[0 : stride * m : stride].copy()
+    for k in range(1, n):
+        h *= _BASE
+        h += c[k : k + stride * m : stride]
+    return h
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finaliser: spreads polynomial-hash bits before value sampling.
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def sampled_gram_hashes(s: str, sample: int) -> np.ndarray:
+    """Hashes of n-grams at every position, keeping about 1 in `sample` by hash value.
+
+    Sampling by value (not position) keeps the same grams wherever they occur,
+    so a prediction and a document agree on which grams to compare.
+    """
+    h = _mix(gram_hashes(s, stride=1))
+    return h[h % np.uint64(sample) == 0]
+
+
+def _count_present(sorted_keys: np.ndarray, values: np.ndarray) -> int:
+    """How many of `sorted_keys` occur in `values` (binary search; `values` is never sorted)."""
+    if len(sorted_keys) == 0 or len(values) == 0:
+        return 0
+    pos = np.minimum(np.searchsorted(sorted_keys, values), len(sorted_keys) - 1)
+    seen = np.zeros(len(sorted_keys), dtype=bool)
+    seen[pos[sorted_keys[pos] == values]] = True
+    return int(seen.sum())
 
 
 def novelty_against_retrieved_docs(prediction: str, retrieved_docs: Optional[list[dict[str, Any]]]) -> float:
@@ -21,18 +85,87 @@ def novelty_against_retrieved_docs(prediction: str, retrieved_docs: Optional[lis
     pred = prediction.lower()
     doc_text = "\n".join((d.get("text", "") or "") for d in retrieved_docs).lower()
 
-    # Simple n-gram overlap (character 30-grams) for copy detection.
-    n = 30
-    if len(pred) < n or len(doc_text) < n:
+    # Simple n-gram overlap (character 30-grams) for copy detection, on
+    # rolling hashes rather than substring sets.
+    if len(pred) < _N or len(doc_text) < _N:
         return 0.8
 
-    def grams(s: str) -> set[str]:
-        return {s[i : i + n] for i in range(0, len(s) - n + 1, 5)}
-
-    g_pred = grams(pred)
-    g_doc = grams(doc_text)
-    overlap = len(g_pred & g_doc) / max(1, len(g_pred))
+    if len(doc_text) < _HASH_MIN_CHARS:
+        # Short inputs: a few dozen substrings, cheaper than the NumPy call overhead.
+        g_pred_set = {pred[i : i + _N] for i in range(0, len(pred) - _N + 1, _STRIDE)}
+        g_doc_set = {doc_text[i : i + _N] for i in range(0, len(doc_text) - _N + 1, _STRIDE)}
+        overlap = len(g_pred_set & g_doc_set) / max(1, len(g_pred_set))
+    else:
+        g_pred = np.unique(gram_hashes(pred))
+        overlap = _count_present(g_pred, gram_hashes(doc_text)) / max(1, len(g_pred))
 
     # Higher overlap => less novelty
     novelty = 1.0 - min(1.0, overlap)
     return float(max(0.0, min(1.0, novelty)))
+
+
+@dataclass
+class CorpusSketch:
+    """Sorted, value-sampled 30-gram hashes of every document in a corpus.
+
+    Small enough to keep in memory and to check any prediction against the
+    whole corpus with one `searchsorted`, which the per-item set comparison
+    cannot do.
+    """
+
+    hashes: np.ndarray
+    sample: int
+    n_docs: int
+    source: Dict[str, Any]
+
+    @classmethod
+    def build(cls, docs: List[Dict[str, Any]], source: Dict[str, Any], sample: int = 4, batch: int = 2048) -> "CorpusSketch":
+        parts = [np.empty(0, dtype=np.uint64)]
+        for start in range(0, len(docs), batch):
+            # Hash a batch of documents as one NUL-joined string, then drop the
+            # grams that straddle a document boundary.
+            text = "\0".join((d.get("text", "") or "").lower() for d in docs[start : start + batch])
+            h = gram_hashes(text, stride=1)
+            if len(h) == 0:
+                continue
+            seps = np.concatenate(([0], np.cumsum(_codes(text) == 0)))
+            h = _mix(h[seps[_N:] == seps[: len(h)]])
+            parts.append(h[h % np.uint64(sample) == 0])
+        return cls(hashes=np.unique(np.concatenate(parts)), sample=sample, n_docs=len(docs), source=source)
+
+    @classmethod
+    def cached(cls, path: str, docs: List[Dict[str, Any]], source: Dict[str, Any], sample: int = 4) -> "CorpusSketch":
+        """Load the sketch pickled at `path` if it matches `source`, else build and store it."""
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    sketch = pickle.load(f)
+                if isinstance(sketch, cls) and sketch.source == source and sketch.sample == sample:
+                    return sketch
+            except Exception:
+                pass
+        sketch = cls.build(docs, source, sample)
+        atomic_pickle(sketch, path)
+        return sketch
+
+    def containment(self, text: str) -> Optional[float]:
+        """Fraction of the text's sampled grams found in the corpus (None if it has none)."""
+        g = np.unique(sampled_gram_hashes(text, self.sample))
+        if len(g) == 0 or len(self.hashes) == 0:
+            return None if len(g) == 0 else 0.0
+        pos = np.searchsorted(self.hashes, g)
+        found = self.hashes[np.minimum(pos, len(self.hashes) - 1)] == g
+        return float(found.mean())
+
+
+def novelty_against_corpus(prediction: str, sketch: CorpusSketch) -> float:
+    """Novelty proxy against the whole corpus, on the same 0..1 scale as above."""
+    if not prediction:
+        return 0.0
+    pred = prediction.lower()
+    if len(pred) < _N:
+        return 0.8
+    overlap = sketch.containment(pred)
+    if overlap is None:
+        return 0.8
+    return float(max(0.0, min(1.0, 1.0 - overlap)))
@@ -8,10 +8,22 @@ Produces four artifacts per run:
 """
 
 import json
+import os
+from typing import Any, Dict, Optional
 
 import pandas as pd
 from tabulate import tabulate
 
+
+def load_metrics(run_id: str) -> Dict[str, Any]:
+    """The run's saved ``metrics.json``, or ``{}`` if it has none yet."""
+    path = f"results/{run_id}_metrics.json"
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def _flatten_summary(summary_df: pd.DataFrame) -> dict:
     """Flatten summary metrics by (task_type, split) into a single dict.
 
@@ -37,7 +49,13 @@ def _flatten_summary(summary_df: pd.DataFrame) -> dict:
             out[f"{m}__{key}"] = v
     return out
 
-def save_reports(summary_df: pd.DataFrame, per_item_df: pd.DataFrame, run_id: str):
+def save_reports(
+    summary_df: pd.DataFrame,
+    per_item_df: pd.DataFrame,
+    run_id: str,
+    timing: Optional[Dict[str, Any]] = None,
+    throughput: Optional[Dict[str, Any]] = None,
+):
     summary_path = f"results/{run_id}_summary.csv"
     items_path = f"results/{run_id}_items.csv"
     md_path = f"results/{run_id}_report.md"
@@ -53,6 +71,12 @@ def save_reports(summary_df: pd.DataFrame, per_item_df: pd.DataFrame, run_id: st
         "tools_used_any": bool(per_item_df.get("agent_tool").notna().any()) if per_item_df is not None and "agent_tool" in per_item_df.columns else None,
         "summary_flat": _flatten_summary(summary_df),
     }
+    if throughput:
+        # Run-level items/s and tokens/s over the inference wall time.
+        metrics["throughput"] = throughput
+    if timing:
+        # Span durations from a traced run (see src/utils/tracing.py), e.g. adapter_p95_s.
+        metrics["timing_flat"] = timing
     with open(metrics_path, "w", encoding="utf-8") as f:
         json.dump(metrics, f, ensure_ascii=False, indent=2)
 
@@ -0,0 +1,187 @@
+"""Scoring stage: turn raw prediction records into scored item rows.
+
+Inference and scoring are separate stages. The evaluator writes one
+prediction record per item to ``results/{run_id}_predictions.jsonl``::
+
+    {"id": ..., "item": {TaskItem fields}, "prompt": ..., "output": {adapter/scenario output},
+     "stats": {"latency_s", "adapter_calls", "retries", "adapter_latency_s"}}
+
+and `score_records` scores them afterwards, optionally across a process pool
+(``run.score_workers``) so CPU-heavy metrics use every core instead of
+serialising with API calls. The causal items of each chunk of records are
+scored together in one stacked adjacency pass (`score_causal_batch`).
+Because the record carries the item and the raw
+output, `score_run.py` can re-score an old run with updated metrics without
+calling any model.
+
+Records for failed calls carry ``"error"`` instead of ``"output"``; they are
+not written to the predictions file (a resumed run retries them) and score
+to an error row.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..data.schemas import TaskItem
+from ..tools.retrieval_tool import RetrievalTool
+from ..utils.tracing import Tracer, activate, current_tracer, deactivate, span
+from .judge_science import prediction_text, score_causal_batch, score_item
+from .novelty import CorpusSketch
+
+
+def predictions_path(run_id: str, results_dir: str = "results") -> str:
+    return os.path.join(results_dir, f"{run_id}_predictions.jsonl")
+
+
+def novelty_sketch(metrics: Dict[str, Any], retrieval: RetrievalTool) -> Optional[CorpusSketch]:
+    """Corpus sketch for ``metrics.novelty.corpus: true``, cached next to the retrieval index."""
+    novelty_cfg = metrics.get("novelty") or {}
+    if not (novelty_cfg.get("enabled", True) and novelty_cfg.get("corpus")):
+        return None
+    index = retrieval.index()
+    return CorpusSketch.cached(
+        os.path.join("results", "cache", "novelty_sketch.pkl"),
+        index.docs,
+        index.source,
+        sample=int(novelty_cfg.get("sketch_sample", 4)),
+    )
+
+
+def build_row(
+    item: TaskItem,
+    prompt: Optional[str],
+    out: Dict[str, Any],
+    corpus_sketch: Optional[CorpusSketch] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    base: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    score = score_item(item, out, corpus_sketch, base)
+    return {
+        "id": item.id,
+        "domain": item.domain,
+        "task_type": item.task_type,
+        "split": item.split,
+        "prompt": prompt,
+        "prediction": out.get("content"),
+        "rationale": out.get("rationale"),
+        "agent_plan": (out.get("agent", {}) or {}).get("plan"),
+        "agent_tool": ((out.get("agent", {}) or {}).get("tool_call", {}) or {}).get("tool"),
+        "agent_tool_ok": ((out.get("agent", {}) or {}).get("tool_obs", {}) or {}).get("ok"),
+        **score,
+        **(out.get("usage", {}) or {}),
+        **(stats or {}),
+        "error": None,
+    }
+
+
+def error_row(item: TaskItem, prompt: Optional[str], error: str, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Score columns are left out (NaN) so a failed call is not averaged in as a wrong answer.
+    return {
+        "id": item.id,
+        "domain": item.domain,
+        "task_type": item.task_type,
+        "split": item.split,
+        "prompt": prompt,
+        "prediction": None,
+        "rationale": None,
+        **(stats or {}),
+        "error": error,
+    }
+
+
+def score_record(record: Dict[str, Any], corpus_sketch: Optional[CorpusSketch] = None, base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    item = TaskItem(**record["item"])
+    if record.get("error") is not None:
+        return error_row(item, record.get("prompt"), record["error"], record.get("stats"))
+    return build_row(item, record.get("prompt"), record["output"], corpus_sketch, record.get("stats"), base)
+
+
+def score_chunk(records: List[Dict[str, Any]], corpus_sketch: Optional[CorpusSketch] = None) -> List[Dict[str, Any]]:
+    """Score records in order; their causal items go through one `score_causal_batch` call."""
+    causal = [i for i, r in enumerate(records) if r.get("error") is None and r["item"].get("task_type") == "causal"]
+    bases: Dict[int, Dict[str, Any]] = {}
+    if causal:
+        with span("score_causal_batch", n=len(causal)):
+            scored = score_causal_batch(
+                [TaskItem(**records[i]["item"]) for i in causal],
+                [prediction_text(records[i]["output"]) for i in causal],
+            )
+        bases = dict(zip(causal, scored))
+    rows = []
+    for i, r in enumerate(records):
+        with span("score", id=r["id"]):
+            rows.append(score_record(r, corpus_sketch, bases.get(i)))
+    return rows
+
+
+# Per-process state of pool workers: the sketch is shipped once, not with every record.
+_WORKER_SKETCH: Optional[CorpusSketch] = None
+
+
+def _init_worker(corpus_sketch: Optional[CorpusSketch]) -> None:
+    global _WORKER_SKETCH
+    _WORKER_SKETCH = corpus_sketch
+
+
+def _score_in_worker(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return score_chunk(records, _WORKER_SKETCH)
+
+
+def _score_traced_in_worker(records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    # Spans cannot be recorded across processes; trace here and let the parent add them.
+    tracer = Tracer()
+    token = activate(tracer)
+    try:
+        rows = score_chunk(records, _WORKER_SKETCH)
+    finally:
+        deactivate(token)
+    return rows, tracer.events, os.getpid()
+
+
+def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_records(
+    records: Iterable[Dict[str, Any]],
+    workers: int = 1,
+    corpus_sketch: Optional[CorpusSketch] = None,
+    chunk_size: int = 256,
+) -> List[Dict[str, Any]]:
+    """Score prediction records in order; ``workers > 1`` fans out over processes.
+
+    `records` is consumed lazily, at most `chunk_size` at a time, so it can
+    stream straight from a predictions file.
+    """
+    chunks = _chunks(records, chunk_size)
+    first = next(chunks, [])
+    if workers <= 1 or len(first) <= 1:
+        rows = []
+        for chunk in chain([first], chunks):
+            rows.extend(score_chunk(chunk, corpus_sketch))
+        return rows
+    # Each worker task is a slice of the chunk, so its causal items still share one batch.
+    per_task = max(1, chunk_size // (workers * 4))
+    tracer = current_tracer()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpus_sketch,)) as pool:
+        for chunk in chain([first], chunks):
+            tasks = [chunk[i:i + per_task] for i in range(0, len(chunk), per_task)]
+            if tracer is None:
+                for part in pool.map(_score_in_worker, tasks):
+                    rows.extend(part)
+                continue
+            for part, events, pid in pool.map(_score_traced_in_worker, tasks):
+                for e in events:
+                    tracer.add(e["name"], int(e["ts"] * 1000), int(e["dur"] * 1000), lane=pid, pid=pid, args=e.get("args"))
+                rows.extend(part)
+    return rows
@@ -9,6 +9,7 @@ from .tool_assisted import ToolAssisted
 from .decomposition import Decomposition
 from .interactive import Interactive
 from .agentic_tool_use import AgenticToolUse
+from .equation_search import EquationSearch
 
 SCENARIOS = {
     "closed_book": ClosedBook,
@@ -16,4 +17,5 @@ SCENARIOS = {
     "decomposition": Decomposition,
     "interactive": Interactive,
     "agentic_tool_use": AgenticToolUse,
+    "equation_search": EquationSearch,
 }
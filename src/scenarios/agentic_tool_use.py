@@ -1,7 +1,74 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+import statistics
+from typing import Any, Dict, Generator, List, Tuple
+
+import numpy as np
+
+from ..adapters.call_stats import timed_call
+from ..data.sample_store import is_sample_ref, resolve_samples, sample_columns, sample_count, sample_matrix
+from ..utils.tracing import span
+
+
+def _is_numeric_list(v: Any) -> bool:
+    return isinstance(v, list) and bool(v) and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in v)
+
+
+def _summarize_numbers(xs: List[float], head: int) -> Dict[str, Any]:
+    """Replace a long numeric sample list with summary statistics plus its first values."""
+    return {
+        "n": len(xs),
+        "mean": round(statistics.fmean(xs), 4),
+        "std": round(statistics.pstdev(xs), 4),
+        "min": round(min(xs), 4),
+        "max": round(max(xs), 4),
+        "head": [round(float(x), 4) for x in xs[:head]],
+    }
+
+
+def _brief(obj: Any, depth: int = 3) -> Any:
+    """Shape-only summary of an older observation: scalars kept, collections reduced to sizes."""
+    if isinstance(obj, str):
+        return obj if len(obj) <= 80 else obj[:77] + "..."
+    if isinstance(obj, list):
+        if len(obj) <= 3 and all(not isinstance(v, (list, dict)) for v in obj):
+            return [_brief(v) for v in obj]
+        if _is_numeric_list(obj):
+            return f"[{len(obj)} numbers, mean {statistics.fmean(obj):.4g}]"
+        return f"[{len(obj)} items]"
+    if isinstance(obj, dict):
+        if depth <= 0:
+            return f"{{{len(obj)} keys}}"
+        return {k: _brief(v, depth - 1) for k, v in obj.items()}
+    return obj
+
+
+def _summarize_column(col: np.ndarray, head: int) -> Any:
+    """`_summarize_numbers` for a sample column read straight from a sidecar."""
+    if len(col) <= head:
+        return col.tolist()
+    return {
+        "n": len(col),
+        "mean": round(float(col.mean()), 4),
+        "std": round(float(col.std()), 4),
+        "min": round(float(col.min()), 4),
+        "max": round(float(col.max()), 4),
+        "head": [round(float(x), 4) for x in col[:head]],
+    }
+
+
+def _compact(obj: Any, head: int) -> Any:
+    if is_sample_ref(obj):
+        mat = sample_matrix(obj)
+        return {c: _summarize_column(mat[:, j], head) for j, c in enumerate(sample_columns(obj))}
+    if _is_numeric_list(obj) and len(obj) > head:
+        return _summarize_numbers(obj, head)
+    if isinstance(obj, dict):
+        return {k: _compact(v, head) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_compact(v, head) for v in obj]
+    return obj
 
 
 class AgenticToolUse:
@@ -15,12 +82,57 @@ class AgenticToolUse:
     Notes:
     - We keep this deterministic/offline; no web access.
     - This is a lightweight protocol; you can later replace with a richer agent framework.
+    - Every prompt of an item starts with the same instructions + TASK block and
+      ends with what changes per step (MEMORY, tool budget, action request).
+      `meta["cache_prefix_chars"]` marks the shared prefix so adapters can let
+      the provider cache it (see `split_prompt` in adapters/base.py).
+    - Plan steps and causal final answers are single JSON objects, so with
+      ``run.stream: true`` their streams stop once the object closes
+      (``meta["stop_when"] = "json_object"``).
+
+    Params:
+    - prompt_encoding: "full" (default) embeds the task and memory verbatim as JSON;
+      "compact" summarizes numeric samples (n/mean/std/min/max + first `sample_head`
+      values), lists the intervention menu without its samples (they are returned
+      by the oracle), and inlines only the newest tool observation; earlier
+      ones are listed by handle (obs1, obs2, ...) with a shape-only summary.
     """
 
     def __init__(self, params: Dict[str, Any] | None = None):
         self.params = params or {}
         self.max_steps = int(self.params.get("max_steps", 3))
         self.max_tool_calls = int(self.params.get("max_tool_calls", self.max_steps))
+        self.prompt_encoding = str(self.params.get("prompt_encoding", "full"))
+        if self.prompt_encoding not in ("full", "compact"):
+            raise ValueError(f"Unknown prompt_encoding: {self.prompt_encoding!r} (expected 'full' or 'compact')")
+        self.sample_head = int(self.params.get("sample_head", 5))
+
+    def _encode_task(self, item: Dict[str, Any]) -> str:
+        if self.prompt_encoding == "full":
+            return json.dumps(resolve_samples(item), ensure_ascii=False)
+
+        inp = dict(item.get("input") or {})
+        menu = inp.get("intervention_menu")
+        if isinstance(menu, list):
+            inp["intervention_menu"] = [
+                {"index": i, "do": entry.get("do"), "n": sample_count(entry.get("samples"))}
+                for i, entry in enumerate(menu)
+            ]
+        return json.dumps(_compact({**item, "input": inp}, self.sample_head), ensure_ascii=False)
+
+    def _encode_memory(self, memory: List[Dict[str, Any]]) -> str:
+        if self.prompt_encoding == "full":
+            return json.dumps(memory, ensure_ascii=False)
+        # Only the newest observation is inlined; earlier ones were shown in full
+        # at their own step and are referred to by handle with a brief summary,
+        # so a step's prompt no longer re-encodes every earlier observation.
+        entries = [
+            {"handle": f"obs{i + 1}", "tool": m.get("tool"), "payload": m.get("payload"), "summary": _brief(m.get("observation"))}
+            for i, m in enumerate(memory[:-1])
+        ]
+        if memory:
+            entries.append({"handle": f"obs{len(memory)}", **_compact(memory[-1], self.sample_head)})
+        return json.dumps(entries, ensure_ascii=False)
 
     def _system_instructions(self, item: Dict[str, Any], enabled_tools: list[str]) -> str:
         t = item.get("task_type")
@@ -48,27 +160,41 @@ class AgenticToolUse:
             + format_doc
         )
 
-    def _tool_call_prompt(self, item: Dict[str, Any], enabled_tools: list[str], memory: List[Dict[str, Any]], remaining: int) -> str:
+    def _prompt_prefix(self, item: Dict[str, Any], enabled_tools: list[str], task_text: str) -> str:
+        # Identical for every call on an item (plan steps and final answer), so
+        # providers can serve it from their prompt cache; everything that changes
+        # between steps goes after it.
+        return self._system_instructions(item, enabled_tools) + f"\nTASK:\n{task_text}\n\n"
+
+    def _tool_call_prompt(self, prefix: str, memory: List[Dict[str, Any]], remaining: int) -> str:
         return (
-            self._system_instructions(item, enabled_tools)
-            + "\nDecide the next action. Output ONLY JSON in one of these forms:\n"
-            "1) Tool call: {\"tool\": <name>, \"payload\": {...}}\n"
-            "2) Stop tool use and answer: {\"tool\": null, \"payload\": {}}\n\n"
+            prefix
+            + f"MEMORY (previous tool observations):\n{self._encode_memory(memory)}\n\n"
             f"Remaining tool calls allowed: {remaining}\n\n"
-            f"TASK:\n{json.dumps(item, ensure_ascii=False)}\n\n"
-            f"MEMORY (previous tool observations):\n{json.dumps(memory, ensure_ascii=False)}\n"
+            "Decide the next action. Output ONLY JSON in one of these forms:\n"
+            "1) Tool call: {\"tool\": <name>, \"payload\": {...}}\n"
+            "2) Stop tool use and answer: {\"tool\": null, \"payload\": {}}\n"
         )
 
-    def _final_prompt(self, item: Dict[str, Any], memory: List[Dict[str, Any]]) -> str:
+    def _final_prompt(self, prefix: str, memory: List[Dict[str, Any]]) -> str:
         return (
-            self._system_instructions(item, enabled_tools=[])
-            + "\nNow produce your FINAL answer.\n"
-            + "Use the evidence in MEMORY.\n\n"
-            f"TASK:\n{json.dumps(item, ensure_ascii=False)}\n\n"
-            f"MEMORY:\n{json.dumps(memory, ensure_ascii=False)}\n"
+            prefix
+            + f"MEMORY:\n{self._encode_memory(memory)}\n\n"
+            "Now produce your FINAL answer. Do not call any more tools.\n"
+            "Use the evidence in MEMORY.\n"
         )
 
-    def run(self, item: Dict[str, Any], adapter, tool_registry, enabled_tools: list[str]) -> Dict[str, Any]:
+    def _steps(self, item: Dict[str, Any], tool_registry, enabled_tools: list[str]) -> Generator[Tuple[str, Dict[str, Any]], Dict[str, Any], Dict[str, Any]]:
+        """Agent loop as a generator: yields (prompt, meta) requests and receives adapter outputs.
+
+        Keeping the protocol free of I/O lets `run()` and `arun()` share it and
+        only differ in how they call the adapter.
+        """
+        # The task never changes during the loop: serialize it once per item,
+        # as part of the cacheable prompt prefix shared by every call.
+        prefix = self._prompt_prefix(item, enabled_tools, self._encode_task(item))
+        base_meta = {"task_type": item.get("task_type"), "domain": item.get("domain"), "cache_prefix_chars": len(prefix)}
+
         memory: List[Dict[str, Any]] = []
         tool_calls = 0
         traces: List[Dict[str, Any]] = []
@@ -84,42 +210,44 @@ class AgenticToolUse:
 
         # Multi-step tool loop
         for step in range(self.max_steps):
-            remaining = max(0, self.max_tool_calls - tool_calls)
-            if remaining <= 0:
-                break
+            with span("plan_step", step=step):
+                remaining = max(0, self.max_tool_calls - tool_calls)
+                if remaining <= 0:
+                    break
 
-            plan_prompt = self._tool_call_prompt(item, enabled_tools, memory, remaining)
-            plan_out = adapter.generate(plan_prompt, {"phase": f"plan_{step}", "task_type": item.get("task_type"), "domain": item.get("domain")})
-            _add_usage(plan_out.get("usage"))
+                plan_prompt = self._tool_call_prompt(prefix, memory, remaining)
+                plan_out = yield plan_prompt, {"phase": f"plan_{step}", "stop_when": "json_object", **base_meta}
+                _add_usage(plan_out.get("usage"))
 
-            plan_text = (plan_out.get("content") or "").strip()
-            tool_call: Dict[str, Any] = {"tool": None, "payload": {}}
-            try:
-                tool_call = json.loads(plan_text)
-            except Exception:
-                tool_call = {"tool": None, "payload": {"raw": plan_text}}
+                plan_text = (plan_out.get("content") or "").strip()
+                tool_call: Dict[str, Any] = {"tool": None, "payload": {}}
+                try:
+                    tool_call = json.loads(plan_text)
+                except Exception:
+                    tool_call = {"tool": None, "payload": {"raw": plan_text}}
 
-            tool_name = tool_call.get("tool")
-            if tool_name not in enabled_tools:
-                tool_name = None
+                tool_name = tool_call.get("tool")
+                if tool_name not in enabled_tools:
+                    tool_name = None
 
-            if not tool_name:
-                traces.append({"step": step, "plan": plan_text, "tool": None})
-                break
+                if not tool_name:
+                    traces.append({"step": step, "plan": plan_text, "tool": None})
+                    break
 
-            payload = tool_call.get("payload") or {}
-            if tool_name == "oracle":
-                payload = {**payload, "item": item}
+                payload = tool_call.get("payload") or {}
+                if tool_name == "oracle":
+                    payload = {**payload, "item": item}
 
-            tool_obs = tool_registry.run(tool_name, payload)
-            tool_calls += 1
+                tool_obs = tool_registry.run(tool_name, payload)
+                tool_calls += 1
 
-            memory.append({"tool": tool_name, "payload": tool_call.get("payload") or {}, "observation": tool_obs})
-            traces.append({"step": step, "plan": plan_text, "tool": tool_name, "tool_obs": tool_obs})
+                memory.append({"tool": tool_name, "payload": tool_call.get("payload") or {}, "observation": tool_obs})
+                traces.append({"step": step, "plan": plan_text, "tool": tool_name, "tool_obs": tool_obs})
 
         # Final answer
-        final_prompt = self._final_prompt(item, memory)
-        final_out = adapter.generate(final_prompt, {"phase": "final", "task_type": item.get("task_type"), "domain": item.get("domain")})
+        final_prompt = self._final_prompt(prefix, memory)
+        final_stop = "json_object" if item.get("task_type") == "causal" else None
+        final_out = yield final_prompt, {"phase": "final", "stop_when": final_stop, **base_meta}
         _add_usage(final_out.get("usage"))
 
         return {
@@ -132,3 +260,25 @@ class AgenticToolUse:
             },
             "usage": usage or final_out.get("usage", {}),
         }
+
+    def run(self, item: Dict[str, Any], adapter, tool_registry, enabled_tools: list[str]) -> Dict[str, Any]:
+        steps = self._steps(item, tool_registry, enabled_tools)
+        try:
+            prompt, meta = next(steps)
+            while True:
+                with span("adapter", phase=meta.get("phase")), timed_call():
+                    out = adapter.generate(prompt, meta)
+                prompt, meta = steps.send(out)
+        except StopIteration as done:
+            return done.value
+
+    async def arun(self, item: Dict[str, Any], adapter, tool_registry, enabled_tools: list[str]) -> Dict[str, Any]:
+        steps = self._steps(item, tool_registry, enabled_tools)
+        try:
+            prompt, meta = next(steps)
+            while True:
+                with span("adapter", phase=meta.get("phase")), timed_call():
+                    out = await adapter.agenerate(prompt, meta)
+                prompt, meta = steps.send(out)
+        except StopIteration as done:
+            return done.value
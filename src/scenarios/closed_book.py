@@ -4,6 +4,12 @@ from typing import Any, Dict, Optional
 
 
 class ClosedBook:
+    """Params:
+    - stop_early: with ``run.stream: true``, stop equation answers after the
+      equation line. The rationale is then not generated, so reasoning_depth
+      scores the default rationale.
+    """
+
     def __init__(self, params: Optional[Dict[str, Any]] = None):
         self.params = params or {}
 
@@ -24,3 +30,8 @@ class ClosedBook:
         if t == "qa":
             return "Answer concisely: " + item["input"]["question"]
         return "Propose a testable hypothesis for the given goal."
+
+    def stop_when(self, item: Dict[str, Any]) -> Optional[str]:
+        if self.params.get("stop_early") and item["task_type"] == "equation":
+            return "equation_line"
+        return None
@@ -0,0 +1,104 @@
+"""Equation-search scenario: ask for N candidate laws and keep the best.
+
+For ``task_type == "equation"`` the model is asked for several candidate
+laws, one per line. `parse_output` turns the answer into a ``candidates``
+list (optionally refitting each law's scale and offset to the data by least
+squares), and the scorer evaluates all candidates in one batch and reports
+best-of-N accuracy and MSE. Other task types fall back to `ClosedBook`.
+
+Params:
+  n_candidates: number of laws to ask for and keep (default 10)
+  refine:       "none" (default) or "affine", which replaces each law f(x) by
+                a*f(x) + b with a, b fitted to the item's samples
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from ..eval.equation_compiler import EquationError, compile_law, evaluate_candidates, fit_affine, normalize_law
+from .closed_book import ClosedBook
+
+# "- ", "* ", "1. ", "2) ", "(3) " list markers; the trailing space keeps "-x" and "1.5*x" intact.
+_BULLET = re.compile(r"^\s*(?:[-*•]|\(?\d+[.):])\s+")
+_TARGET = re.compile(r"\bx\b")
+
+
+def _is_law(line: str, law: str) -> bool:
+    """An equation line ("y = ...") or a bare expression in x that the restricted compiler accepts."""
+    if not law or ("=" not in line and not _TARGET.search(law)):
+        return False
+    try:
+        compile_law(law)
+    except EquationError:
+        return False
+    return True
+
+
+def parse_candidates(content: str, limit: int) -> List[str]:
+    """Candidate laws from a one-per-line answer, without bullets, numbering or duplicates.
+
+    Prose lines ("Here are 10 candidate laws:", the rationale) are skipped
+    rather than taking up one of the `limit` slots.
+    """
+    seen = set()
+    out: List[str] = []
+    for line in (content or "").splitlines():
+        stripped = _BULLET.sub("", line)
+        law = normalize_law(stripped)
+        if not _is_law(stripped, law):
+            continue
+        key = "".join(law.split())
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(law)
+        if len(out) >= limit:
+            break
+    return out
+
+
+class EquationSearch(ClosedBook):
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        super().__init__(params)
+        self.n_candidates = int(self.params.get("n_candidates", 10))
+        self.refine = str(self.params.get("refine", "none"))
+        if self.refine not in ("none", "affine"):
+            raise ValueError(f"Unsupported refine mode: {self.refine!r} (expected 'none' or 'affine')")
+
+    def make_prompt(self, item: Dict[str, Any]) -> str:
+        if item["task_type"] != "equation":
+            return super().make_prompt(item)
+        return (
+            "You are a scientist. Given x and y samples, propose "
+            f"{self.n_candidates} different candidate symbolic relationships y=f(x), "
+            "most plausible first. Write one equation per line as 'y = ...' using x, numbers, "
+            "+ - * / ** and sin, cos, tan, exp, log, sqrt, abs. "
+            "After the equations, add a line starting with 'Rationale:' and a brief rationale.\n"
+            f"x={item['input']['x']}\ny={item['input']['y']}"
+        )
+
+    def stop_when(self, item: Dict[str, Any]) -> Optional[str]:
+        # The answer is N equation lines; the first one finishing it is not the end.
+        if item["task_type"] == "equation":
+            return None
+        return super().stop_when(item)
+
+    def _refine(self, laws: List[str], item: Dict[str, Any]) -> List[str]:
+        xs, ys = item["input"]["x"], item["input"]["y"]
+        Y, ok = evaluate_candidates(laws, xs)
+        if not ok.any():
+            return laws
+        a, b = fit_affine(Y[ok], ys)
+        refined = list(laws)
+        for i, ai, bi in zip(ok.nonzero()[0], a, b):
+            refined[i] = f"{float(ai)!r}*({laws[i]}) + ({float(bi)!r})"
+        return refined
+
+    def parse_output(self, item: Dict[str, Any], out: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the parsed (and optionally refined) ``candidates`` to the model output."""
+        if item["task_type"] != "equation":
+            return out
+        laws = parse_candidates(out.get("content") or "", self.n_candidates)
+        if laws and self.refine == "affine":
+            laws = self._refine(laws, item)
+        return {**out, "candidates": laws}
@@ -2,6 +2,8 @@
 
 from typing import Any, Dict, Optional
 
+from ..data.sample_store import resolve_samples
+
 
 class Interactive:
     def __init__(self, params: Optional[Dict[str, Any]] = None):
@@ -11,5 +13,5 @@ class Interactive:
         return (
             "Interactive discovery (simulated): propose the next intervention and expected outcome, "
             "then revise the hypothesis accordingly.\n"
-            f"Inputs: {item['input']}"
+            f"Inputs: {resolve_samples(item['input'])}"
         )
@@ -2,6 +2,8 @@
 
 from typing import Any, Dict, Optional
 
+from ..data.sample_store import resolve_samples
+
 
 class ToolAssisted:
     def __init__(self, params: Optional[Dict[str, Any]] = None):
@@ -10,5 +12,5 @@ class ToolAssisted:
     def make_prompt(self, item: Dict[str, Any]) -> str:
         # In a real run, you would allow calculator/code tools. Here we just change instructions.
         return "Use careful calculations when needed. " + (
-            item.get("prompt") or "Solve the task: " + str(item["input"])
+            item.get("prompt") or "Solve the task: " + str(resolve_samples(item["input"]))
         )
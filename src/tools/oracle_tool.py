@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from ..data.sample_store import resolve_samples
+
 
 @dataclass
 class OracleTool:
@@ -11,6 +13,9 @@ class OracleTool:
     The task instance already contains an "intervention_menu" with precomputed
     interventional datasets. This tool simply returns the requested one.
 
+    Sample tables kept as sidecar references are resolved only for the entry
+    returned, since it becomes an observation in the agent's prompt.
+
     Payload format:
       {"node": "A"}  -> returns the menu entry with do(A=2.0)
       or {"index": 0}
@@ -31,7 +36,7 @@ class OracleTool:
                 idx_int = int(idx)
                 if idx_int < 0 or idx_int >= len(menu):
                     return {"ok": False, "error": "index out of range"}
-                return {"ok": True, "intervention": menu[idx_int]}
+                return {"ok": True, "intervention": resolve_samples(menu[idx_int])}
             except Exception as e:
                 return {"ok": False, "error": str(e)}
 
@@ -40,8 +45,8 @@ class OracleTool:
             for entry in menu:
                 do = entry.get("do") or {}
                 if node in do:
-                    return {"ok": True, "intervention": entry}
+                    return {"ok": True, "intervention": resolve_samples(entry)}
             return {"ok": False, "error": f"No intervention for node {node}"}
 
         # default: return first one
-        return {"ok": True, "intervention": menu[0], "defaulted": True}
+        return {"ok": True, "intervention": resolve_samples(menu[0]), "defaulted": True}
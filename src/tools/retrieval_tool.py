@@ -1,21 +1,113 @@
 from __future__ import annotations
 
+import heapq
 import json
-from dataclasses import dataclass
+import math
+import os
+import pickle
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.io import atomic_pickle
+
+_INDEX_VERSION = 1
+
+
+def _tokenize(text: str) -> List[str]:
+    t = (text or "").lower().replace("/", " ").replace("=", " ").replace("*", " ")
+    return [w for w in t.split() if len(w) > 2]
+
+
+class _Partition:
+    """Inverted index over a subset of the corpus (all docs, or one domain).
+
+    Postings are stored as parallel int arrays (doc ids, term frequencies),
+    which keeps the index small in memory and fast to pickle.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_len: Dict[int, int] = {}
+        self.avgdl = 0.0
+
+    def add(self, doc_id: int, tfs: Counter) -> None:
+        self.doc_len[doc_id] = sum(tfs.values())
+        for term, tf in tfs.items():
+            plist = self.postings.get(term)
+            if plist is None:
+                plist = self.postings[term] = (array("I"), array("I"))
+            plist[0].append(doc_id)
+            plist[1].append(tf)
+
+    def finish(self) -> None:
+        self.avgdl = (sum(self.doc_len.values()) / len(self.doc_len)) if self.doc_len else 0.0
+
+    def score(self, q_terms: List[str], k1: float, b: float) -> Dict[int, float]:
+        n_docs = len(self.doc_len)
+        avgdl = max(self.avgdl, 1e-9)
+        scores: Dict[int, float] = {}
+        for term in q_terms:
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            doc_ids, tfs = plist
+            df = len(doc_ids)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in zip(doc_ids, tfs):
+                norm = k1 * (1.0 - b + b * self.doc_len[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        return scores
+
+
+@dataclass
+class _BM25Index:
+    docs: List[Dict[str, Any]]
+    all_docs: _Partition
+    by_domain: Dict[str, _Partition]
+    source: Dict[str, Any]  # identity of the corpus file the index was built from
+
+    @classmethod
+    def build(cls, docs: List[Dict[str, Any]], source: Dict[str, Any]) -> "_BM25Index":
+        all_docs = _Partition()
+        by_domain: Dict[str, _Partition] = {}
+        for doc_id, d in enumerate(docs):
+            tfs = Counter(_tokenize(f"{d.get('title','')}\n{d.get('text','')}"))
+            all_docs.add(doc_id, tfs)
+            dom = str(d.get("domain", "")).lower()
+            part = by_domain.get(dom)
+            if part is None:
+                part = by_domain[dom] = _Partition()
+            part.add(doc_id, tfs)
+        all_docs.finish()
+        for part in by_domain.values():
+            part.finish()
+        return cls(docs=docs, all_docs=all_docs, by_domain=by_domain, source=source)
 
 
 @dataclass
 class RetrievalTool:
     """Tiny offline retrieval tool over a local JSONL corpus.
 
-    Scoring is simple keyword overlap (no heavy dependencies). This keeps the
-    benchmark harness reproducible and offline.
+    The corpus is read once into an inverted index (term -> postings with term
+    frequencies, plus one partition per domain) and ranked with BM25; top-k
+    uses a heap, so a query only touches documents that share a term with it.
+    No heavy dependencies, so the harness stays reproducible and offline.
+
+    If `index_path` is set, the built index is pickled there and reused on the
+    next start as long as the corpus file's size and mtime are unchanged.
     """
 
     corpus_path: str
     name: str = "retrieval"
+    index_path: Optional[str] = None
+    k1: float = 1.5
+    b: float = 0.75
+    _index: Optional[_BM25Index] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def _load(self) -> List[Dict[str, Any]]:
         docs: List[Dict[str, Any]] = []
@@ -30,20 +122,55 @@ class RetrievalTool:
                 docs.append(json.loads(line))
         return docs
 
+    def _source(self) -> Dict[str, Any]:
+        p = Path(self.corpus_path)
+        st = p.stat() if p.exists() else None
+        return {
+            "version": _INDEX_VERSION,
+            "corpus": str(p.resolve()),
+            "size": st.st_size if st else None,
+            "mtime_ns": st.st_mtime_ns if st else None,
+        }
+
+    def _read_persisted(self, source: Dict[str, Any]) -> Optional[_BM25Index]:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return None
+        try:
+            with open(self.index_path, "rb") as f:
+                index = pickle.load(f)
+        except Exception:
+            return None
+        return index if isinstance(index, _BM25Index) and index.source == source else None
+
+    def _persist(self, index: _BM25Index) -> None:
+        if not self.index_path:
+            return
+        atomic_pickle(index, self.index_path)
+
+    def index(self) -> _BM25Index:
+        """Return the corpus index, building (or loading) it on first use."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    source = self._source()
+                    index = self._read_persisted(source)
+                    if index is None:
+                        index = _BM25Index.build(self._load(), source)
+                        self._persist(index)
+                    self._index = index
+        return self._index
+
     def search(self, query: str, k: int = 3, domain: Optional[str] = None) -> List[Dict[str, Any]]:
-        q = (query or "").lower()
-        q_terms = {t for t in q.replace("/", " ").replace("=", " ").replace("*", " ").split() if len(t) > 2}
+        index = self.index()
+        q_terms = sorted(set(_tokenize(query)))
+        if domain:
+            part = index.by_domain.get(str(domain).lower())
+            if part is None:
+                return []
+        else:
+            part = index.all_docs
 
-        scored: List[tuple[float, Dict[str, Any]]] = []
-        for d in self._load():
-            if domain and str(d.get("domain", "")).lower() != str(domain).lower():
-                continue
-            text = f"{d.get('title','')}\n{d.get('text','')}".lower()
-            terms = {t for t in text.split() if len(t) > 2}
-            overlap = len(q_terms & terms)
-            score = float(overlap) / max(1.0, float(len(q_terms)))
-            if score > 0:
-                scored.append((score, d))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [d for _, d in scored[:k]]
+        scores = part.score(q_terms, self.k1, self.b)
+        # Ties keep corpus order, matching a stable sort by score.
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [index.docs[doc_id] for doc_id, score in top if score > 0]
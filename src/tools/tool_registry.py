@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from ..utils.tracing import span
 from .python_tool import PythonTool
 from .retrieval_tool import RetrievalTool
 from .oracle_tool import OracleTool
@@ -17,11 +18,12 @@ class ToolRegistry:
     oracle: OracleTool
 
     @classmethod
-    def from_config(cls, tool_names: List[str] | None, corpus_path: str) -> "ToolRegistry":
+    def from_config(cls, tool_names: List[str] | None, corpus_path: str, index_path: Optional[str] = None) -> "ToolRegistry":
         # Always construct tools, but scenarios can choose to use them based on tool_names.
+        # The retrieval index is built lazily on the first search.
         return cls(
             python=PythonTool(),
-            retrieval=RetrievalTool(corpus_path=corpus_path),
+            retrieval=RetrievalTool(corpus_path=corpus_path, index_path=index_path),
             oracle=OracleTool(),
         )
 
@@ -38,21 +40,22 @@ class ToolRegistry:
         return enabled
 
     def run(self, tool: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        if tool == "python":
-            return self.python.run(code=str(payload.get("code", "")), variables=payload.get("variables"))
-        if tool == "retrieval":
-            return {
-                "ok": True,
-                "docs": self.retrieval.search(
-                    query=str(payload.get("query", "")),
-                    k=int(payload.get("k", 3)),
-                    domain=payload.get("domain"),
-                ),
-            }
-        if tool == "oracle":
-            # Oracle needs access to the current task instance; pass it via payload['item'].
-            item = payload.get("item")
-            if not isinstance(item, dict):
-                return {"ok": False, "error": "oracle payload must include item dict under key 'item'"}
-            return self.oracle.run(item=item, payload=payload)
-        return {"ok": False, "error": f"Unknown tool: {tool}"}
+        with span("tool", tool=tool):
+            if tool == "python":
+                return self.python.run(code=str(payload.get("code", "")), variables=payload.get("variables"))
+            if tool == "retrieval":
+                return {
+                    "ok": True,
+                    "docs": self.retrieval.search(
+                        query=str(payload.get("query", "")),
+                        k=int(payload.get("k", 3)),
+                        domain=payload.get("domain"),
+                    ),
+                }
+            if tool == "oracle":
+                # Oracle needs access to the current task instance; pass it via payload['item'].
+                item = payload.get("item")
+                if not isinstance(item, dict):
+                    return {"ok": False, "error": "oracle payload must include item dict under key 'item'"}
+                return self.oracle.run(item=item, payload=payload)
+            return {"ok": False, "error": f"Unknown tool: {tool}"}
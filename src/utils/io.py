@@ -2,6 +2,8 @@
 
 import json
 import os
+import pickle
+import tempfile
 from typing import Any, Dict, List
 
 
@@ -14,3 +16,22 @@ def write_jsonl(path: str, rows: List[Dict[str, Any]]):
     with open(path, "w", encoding="utf-8") as f:
         for r in rows:
             f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def atomic_pickle(obj: Any, path: str) -> None:
+    """Pickle `obj` to `path` via a uniquely named temp file in the same directory.
+
+    Readers never see a partial file, and concurrent writers of the same path
+    (e.g. configs of a sweep building the same index) each replace it whole.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as f:
+        tmp = f.name
+        try:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, path)
@@ -5,14 +5,19 @@ import os
 
 
 def get_logger(name: str, run_id: str) -> logging.Logger:
-    """Return a logger that writes to both a run-specific file and stderr."""
+    """Return a logger that writes to both a run-specific file and stderr.
+
+    Loggers are keyed by run, so runs sharing a process (``run_sweep.py``)
+    each write to their own log file.
+    """
     os.makedirs("logs", exist_ok=True)
-    logger = logging.getLogger(name)
+    logger = logging.getLogger(f"{name}.{run_id}")
     logger.setLevel(logging.INFO)
+    logger.propagate = False  # run IDs may contain dots, which would nest one run's logger under another
     if not logger.handlers:
         fh = logging.FileHandler(f"logs/{run_id}.log", encoding="utf-8")
         ch = logging.StreamHandler()
-        fmt = logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+        fmt = logging.Formatter(f'%(asctime)s [%(levelname)s] {name}: %(message)s')
         fh.setFormatter(fmt); ch.setFormatter(fmt)
         logger.addHandler(fh); logger.addHandler(ch)
     return logger
@@ -0,0 +1,165 @@
+"""Run IDs and run manifests (``results/{run_id}_manifest.yaml``).
+
+The manifest records the exact config a run started from plus an environment
+snapshot (Python, platform, git commit, installed packages), so a result can
+be traced back to the code and settings that produced it. `--resume` and
+`score_run.py` read the config back from it.
+"""
+
+import copy
+import functools
+import importlib.metadata
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from ..config import ExperimentConfig
+
+
+def slug(s: str) -> str:
+    return (s or "").strip().lower().replace(" ", "-").replace("_", "-")
+
+
+def make_run_id(cfg: ExperimentConfig, ts: Optional[int] = None) -> str:
+    """Thesis-grade run_id: timestamp + cfg.name + structured tags so downstream aggregation is reliable.
+
+    Example:
+      1700000000_autobench-study_autobench_openai_gpt4_agentic-tool-use
+    """
+    ts = int(time.time()) if ts is None else ts
+    tag_parts = [
+        slug(cfg.name),
+        slug(cfg.data.loader),
+        slug(cfg.model.provider),
+        slug(cfg.model.model),
+        slug(cfg.scenario.name),
+    ]
+    tag_parts = [p for p in tag_parts if p]
+    return f"{ts}_" + "_".join(tag_parts)
+
+
+def _git_dir(start: str = ".") -> Optional[str]:
+    path = os.path.abspath(start)
+    while True:
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _git_head(git_dir: str) -> Optional[str]:
+    """Resolve HEAD from the files under .git (loose ref, then packed-refs) without running git."""
+    with open(os.path.join(git_dir, "HEAD"), "r", encoding="utf-8") as f:
+        head = f.read().strip()
+    if not head.startswith("ref: "):
+        return head or None
+    ref = head[5:]
+    ref_path = os.path.join(git_dir, *ref.split("/"))
+    if os.path.exists(ref_path):
+        with open(ref_path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    packed = os.path.join(git_dir, "packed-refs")
+    if os.path.exists(packed):
+        with open(packed, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    return None
+
+
+# Pathspecs leaving run outputs out of the dirty check (also in .gitignore).
+_RUN_OUTPUTS = (":(top,exclude)results", ":(top,exclude)logs")
+
+
+def git_metadata() -> dict:
+    """Return git commit + dirty flag if available; otherwise None values.
+
+    The commit is read from ``.git`` directly. The dirty flag needs one
+    ``git status``; new untracked source files count as dirty, but run
+    outputs in ``results/`` and ``logs/`` are excluded so they do not mark
+    every run as dirty.
+    """
+    try:
+        git_dir = _git_dir()
+        commit = _git_head(git_dir) if git_dir else None
+    except OSError:
+        commit = None
+    try:
+        if commit is None:
+            # Worktrees and submodules keep .git as a file; let git resolve those.
+            commit = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode("utf-8").strip()
+    except Exception:
+        return {"commit": None, "dirty": None}
+    try:
+        status = subprocess.check_output(
+            ["git", "status", "--porcelain", "--", ":/", *_RUN_OUTPUTS], stderr=subprocess.DEVNULL
+        ).decode("utf-8").strip()
+        dirty = bool(status)
+    except Exception:
+        dirty = None
+    return {"commit": commit, "dirty": dirty}
+
+
+def installed_packages() -> Optional[List[str]]:
+    """Best-effort dependency snapshot in ``pip freeze`` format, read in-process via importlib.metadata."""
+    try:
+        found: Dict[str, str] = {}
+        for dist in importlib.metadata.distributions():
+            name = dist.metadata["Name"]
+            if name:
+                found.setdefault(name, f"{name}=={dist.version}")
+        return sorted(found.values(), key=str.lower)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _env_snapshot() -> Dict[str, Any]:
+    return {
+        "python": sys.version,
+        "executable": sys.executable,
+        "platform": platform.platform(),
+        "git": git_metadata(),
+        "pip_freeze": installed_packages(),
+    }
+
+
+def env_snapshot() -> Dict[str, Any]:
+    """Environment recorded in every manifest; collected once per interpreter."""
+    return copy.deepcopy(_env_snapshot())
+
+
+def build_manifest(run_id: str, cfg_path: str, raw_cfg: dict, env: Optional[Dict[str, Any]] = None) -> dict:
+    return {
+        "run_id": run_id,
+        "timestamp": int(time.time()),
+        "config_path": os.path.abspath(cfg_path),
+        "config": raw_cfg,
+        "env": env if env is not None else env_snapshot(),
+    }
+
+
+def manifest_path(run_id: str, results_dir: str = "results") -> str:
+    return os.path.join(results_dir, f"{run_id}_manifest.yaml")
+
+
+def write_manifest(run_id: str, manifest: dict) -> None:
+    with open(manifest_path(run_id), "w", encoding="utf-8") as f:
+        yaml.safe_dump(manifest, f, sort_keys=False, allow_unicode=True)
+
+
+def load_manifest(run_id: str) -> dict:
+    path = manifest_path(run_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Run {run_id} not found: {path} does not exist")
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
@@ -2,40 +2,104 @@
 
 from __future__ import annotations
 
+import json
 import re
-from typing import List, Tuple
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+try:  # optional, faster JSON parsing
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+_NAME = r"[A-Za-z][A-Za-z0-9_]*"
+
+# One pass over the text for every supported edge notation:
+#   A->B / A → B     (chains like A->B->C yield both edges: the target is a lookahead)
+#   (A,B)
+#   ["A","B"]        (JSON pairs inside otherwise unparseable text)
+# A source name never starts right after a letter: such a start could only
+# match where the start of the same word already did, so skipping it just
+# saves rescanning every word of prose character by character.
+_EDGE_RE = re.compile(
+    rf"(?<![A-Za-z])(?P<u>{_NAME})\s*(?:->|→)\s*(?=(?P<v>{_NAME}))"
+    rf"|\(\s*(?P<pu>{_NAME})\s*,\s*(?P<pv>{_NAME})\s*\)"
+    rf"|\[\s*\"(?P<ju>{_NAME})\"\s*,\s*\"(?P<jv>{_NAME})\"\s*\]"
+)
+_FENCE_RE = re.compile(r"^```[A-Za-z]*\s*|\s*```$")
+_JSON_DECODER = json.JSONDecoder()
 
 
 def normalize_edge(u: str, v: str) -> str:
     return f"{u.strip()}->{v.strip()}"
 
 
-def extract_edges(text: str) -> List[str]:
-    """Extract directed edges from free-form model text.
+def _loads(s: str) -> Any:
+    return _orjson.loads(s) if _orjson is not None else json.loads(s)
+
+
+def _edges_from_json(obj: Any) -> Optional[List[Tuple[str, str]]]:
+    edges = obj.get("edges") if isinstance(obj, dict) else obj
+    if not isinstance(edges, list):
+        return None
+    out: List[Tuple[str, str]] = []
+    for e in edges:
+        if isinstance(e, (list, tuple)) and len(e) == 2:
+            out.append((str(e[0]), str(e[1])))
+        elif isinstance(e, str) and "->" in e:
+            u, v = e.split("->", 1)
+            out.append((u, v))
+        elif isinstance(e, dict) and "from" in e and "to" in e:
+            out.append((str(e["from"]), str(e["to"])))
+    return out
+
+
+def _parse_json_edges(text: str) -> Optional[List[Tuple[str, str]]]:
+    """Edges from a JSON answer (whole text, fenced, or an embedded {"edges": ...} object)."""
+    s = text.strip()
+    if s.startswith("```"):
+        s = _FENCE_RE.sub("", s)
+    if s[:1] in ("{", "["):
+        try:
+            return _edges_from_json(_loads(s))
+        except ValueError:
+            pass
+    key = text.find('"edges"')
+    start = text.rfind("{", 0, key) if key >= 0 else -1
+    if start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            return _edges_from_json(obj)
+        except ValueError:
+            pass
+    return None
 
-    Supports patterns like:
+
+def extract_edges(text: str, nodes: Optional[Collection[str]] = None) -> List[str]:
+    """Extract directed edges from model text.
+
+    Strict JSON (``{"edges": [["A","B"], ...]}``, as AgenticToolUse asks for) is
+    tried first; otherwise one precompiled regex scans the text once for:
     - A->B
-    - A -> B
+    - A -> B (and A → B, A -> B -> C)
     - (A,B)
-    - A,B
+    - ["A","B"]
 
-    Returns normalized strings "A->B".
+    Returns normalized strings "A->B", de-duplicated in first-seen order. If
+    `nodes` is given, edges with an endpoint outside it are dropped.
     """
     if not text:
         return []
 
-    t = text.replace("→", "->")
-
-    edges: List[Tuple[str, str]] = []
-
-    # A->B patterns
-    for m in re.finditer(r"([A-Za-z][A-Za-z0-9_]*)\s*->\s*([A-Za-z][A-Za-z0-9_]*)", t):
-        edges.append((m.group(1), m.group(2)))
-
-    # (A,B) patterns
-    for m in re.finditer(r"\(\s*([A-Za-z][A-Za-z0-9_]*)\s*,\s*([A-Za-z][A-Za-z0-9_]*)\s*\)", t):
-        edges.append((m.group(1), m.group(2)))
-
-    # {A,B} heuristic: only if it looks like edge list "{A,B} {B,C}" is too ambiguous; skip.
+    pairs = _parse_json_edges(text)
+    if pairs is None:
+        # findall returns one tuple per match with exactly one (u, v) group pair set.
+        pairs = [(u or pu or ju, v or pv or jv) for u, v, pu, pv, ju, jv in _EDGE_RE.findall(text)]
 
-    return [normalize_edge(u, v) for u, v in edges]
+    allowed = set(nodes) if nodes else None
+    seen: Dict[str, None] = {}
+    for u, v in pairs:
+        u, v = u.strip(), v.strip()
+        if allowed is not None and (u not in allowed or v not in allowed):
+            continue
+        seen.setdefault(normalize_edge(u, v), None)
+    return list(seen)
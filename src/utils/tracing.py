@@ -0,0 +1,156 @@
+"""Lightweight span tracing for run phases.
+
+Code marks a phase with ``with span("adapter", phase="final"): ...``. Spans
+are recorded by the `Tracer` active in the current context (a contextvar, so
+concurrent runs in one process each see their own, and asyncio tasks inherit
+it). With no active tracer `span()` returns a shared no-op object, so
+instrumented code costs one contextvar lookup per span when tracing is off.
+
+Spans nest by time: item -> plan_step -> adapter / tool, and score. A tracer
+writes them as a Chrome trace (``chrome://tracing`` / https://ui.perfetto.dev)
+and summarises durations per span name as p50/p95/p99.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_CURRENT: ContextVar[Optional["Tracer"]] = ContextVar("tracer", default=None)
+
+
+def _lane() -> int:
+    """Trace row for the caller: its asyncio task if any, else its thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer:
+    """Collects completed spans (thread-safe) for one run."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start_ns: int, dur_ns: int, lane: Optional[int] = None, pid: Optional[int] = None, args: Optional[Dict[str, Any]] = None) -> None:
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start_ns / 1000.0,
+            "dur": dur_ns / 1000.0,
+            "pid": pid if pid is not None else os.getpid(),
+            "tid": lane if lane is not None else _lane(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def extend(self, events: List[Dict[str, Any]]) -> None:
+        """Add already-recorded events, e.g. those of an earlier invocation of a resumed run."""
+        with self._lock:
+            self.events.extend(events)
+
+    def durations(self) -> Dict[str, np.ndarray]:
+        """Span durations in seconds, by span name."""
+        by_name: Dict[str, List[float]] = {}
+        with self._lock:
+            for e in self.events:
+                by_name.setdefault(e["name"], []).append(e["dur"] / 1e6)
+        return {k: np.asarray(v) for k, v in by_name.items()}
+
+    def summary(self) -> Dict[str, float]:
+        """Flat ``{span}_count``, ``{span}_total_s`` and ``{span}_p50_s/_p95_s/_p99_s`` values."""
+        out: Dict[str, float] = {}
+        for name, d in sorted(self.durations().items()):
+            p50, p95, p99 = np.percentile(d, [50, 95, 99])
+            out.update({
+                f"{name}_count": int(len(d)),
+                f"{name}_total_s": float(d.sum()),
+                f"{name}_p50_s": float(p50),
+                f"{name}_p95_s": float(p95),
+                f"{name}_p99_s": float(p99),
+            })
+        return out
+
+    def write_chrome_trace(self, path: str) -> None:
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, end - self.start, args=self.args)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **args: Any):
+    """Context manager timing the enclosed block as a span of the active tracer (if any)."""
+    tracer = _CURRENT.get()
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, args)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _CURRENT.get()
+
+
+def activate(tracer: Optional[Tracer]) -> Token:
+    """Make `tracer` the active one in this context; pass the token to `deactivate` to restore."""
+    return _CURRENT.set(tracer)
+
+
+def deactivate(token: Token) -> None:
+    _CURRENT.reset(token)
+
+
+def trace_path(run_id: str, results_dir: str = "results") -> str:
+    return os.path.join(results_dir, f"{run_id}_trace.json")
+
+
+def read_chrome_trace(path: str) -> List[Dict[str, Any]]:
+    """Events of a trace written by `Tracer.write_chrome_trace`; none if the file is missing."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("traceEvents", [])
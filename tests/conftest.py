@@ -0,0 +1,33 @@
+"""Shared fixtures for the offline test suite (mock adapter, synthetic data; no API keys)."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import ExperimentConfig  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in a scratch directory so results/ and logs/ of the test stay out of the repo."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "results").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def make_config():
+    def _make(name="test", limit=6, **run):
+        return ExperimentConfig(
+            name=name,
+            random_seed=42,
+            data={"loader": "synthetic", "limit": limit},
+            model={"provider": "mock", "model": "mock-1", "tools": []},
+            scenario={"name": "closed_book"},
+            run=run,
+        )
+
+    return _make
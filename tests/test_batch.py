@@ -0,0 +1,87 @@
+"""Batch backend: submit -> wait_for_batch -> results in request order, and its error paths."""
+
+import pytest
+
+from src.adapters.batch import LocalBatchServer, collect_results, wait_for_batch
+from src.adapters.mock_adapter import MockAdapter
+from src.adapters.rate_limit import AdapterError
+from src.eval.evaluator import Evaluator
+
+
+def _echo(body):
+    if body["prompt"] == "boom":
+        raise ValueError("bad request")
+    return {"content": body["prompt"].upper(), "meta_id": body["meta"]["id"]}
+
+
+def test_local_batch_returns_results_in_request_order():
+    server = LocalBatchServer(_echo, polls_until_done=3)
+    requests = [(f"p{i}", {"id": i}) for i in range(5)]
+
+    results = server.run(requests, poll_s=0.0)
+
+    assert [r["content"] for r in results] == ["P0", "P1", "P2", "P3", "P4"]
+    assert [r["meta_id"] for r in results] == [0, 1, 2, 3, 4]
+
+
+def test_local_batch_maps_failed_requests_to_adapter_errors():
+    server = LocalBatchServer(_echo)
+
+    results = server.run([("a", {"id": 0}), ("boom", {"id": 1}), ("c", {"id": 2})], poll_s=0.0)
+
+    assert results[0]["content"] == "A" and results[2]["content"] == "C"
+    assert isinstance(results[1], AdapterError)
+    assert "bad request" in str(results[1])
+
+
+def test_wait_for_batch_polls_until_done():
+    states = iter(["validating", "in_progress", "completed"])
+    polls = []
+
+    def poll():
+        polls.append(1)
+        return next(states)
+
+    assert wait_for_batch(poll, lambda s: s == "completed", poll_s=0.0) == "completed"
+    assert len(polls) == 3
+
+
+def test_wait_for_batch_times_out_with_adapter_error():
+    with pytest.raises(AdapterError, match="not finished"):
+        wait_for_batch(lambda: "in_progress", lambda s: s == "completed", poll_s=0.0, timeout_s=0.0)
+
+
+def test_collect_results_reports_missing_requests():
+    results = collect_results(3, {0: {"content": "x"}, 2: {"content": "z"}}, status="expired")
+
+    assert results[0] == {"content": "x"} and results[2] == {"content": "z"}
+    assert isinstance(results[1], AdapterError)
+    assert "expired" in str(results[1])
+
+
+def test_mock_batch_matches_interactive_answers():
+    adapter = MockAdapter("mock-1", 0.0, 1.0, 64)
+    requests = [("solve", {"task_type": t, "id": str(i)}) for i, t in enumerate(["equation", "causal", "qa"])]
+
+    batched = adapter.generate_batch(requests, poll_s=0.0)
+
+    assert [b["content"] for b in batched] == [adapter.generate(p, m)["content"] for p, m in requests]
+
+
+class _PartlyFailingBatch(MockAdapter):
+    def generate_batch(self, requests, poll_s=30.0):
+        results = super().generate_batch(requests, poll_s=poll_s)
+        return [AdapterError("request expired") if m["id"] == "syn-cg-1" else r for r, (_, m) in zip(results, requests)]
+
+
+def test_batch_backend_scores_in_item_order_and_keeps_failures_as_error_rows(workdir, make_config):
+    cfg = make_config(backend="batch", batch_size=2, batch_poll_s=0.001)
+
+    _, per_item = Evaluator(cfg, "batch", adapter=_PartlyFailingBatch("mock-1", 0.0, 1.0, 64)).run()
+
+    assert list(per_item["id"]) == [f"syn-{t}-{i}" for i, t in enumerate(["eq", "cg", "qa"] * 2)]
+    failed = per_item.set_index("id").loc["syn-cg-1"]
+    assert failed["error"] == "request expired"
+    assert per_item["error"].notna().sum() == 1
+    # Failed requests are not checkpointed, so a resumed run retries them.
+    assert "syn-cg-1" not in Evaluator(cfg, "batch", resume=True).completed
@@ -0,0 +1,71 @@
+"""Checkpoint and resume: completed items are kept and never sent to the model again."""
+
+import json
+
+from src.adapters.mock_adapter import MockAdapter
+from src.eval.checkpoint import ItemCheckpoint
+from src.eval.evaluator import Evaluator
+from src.eval.scoring import predictions_path
+
+
+class _CountingAdapter(MockAdapter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ids = []
+
+    def generate(self, prompt, meta):
+        self.ids.append(meta["id"])
+        return super().generate(prompt, meta)
+
+
+def test_checkpoint_drops_a_line_cut_short_by_a_crash(tmp_path):
+    path = str(tmp_path / "predictions.jsonl")
+    checkpoint = ItemCheckpoint(path)
+    checkpoint.append({"id": "a", "output": {}})
+    checkpoint.append({"id": "b", "output": {}})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "c", "outp')
+
+    assert checkpoint.ids() == {"a", "b"}
+    # The partial line is truncated, so the next append starts on a fresh line.
+    checkpoint.append({"id": "c", "output": {}})
+    assert [r["id"] for r in checkpoint.records()] == ["a", "b", "c"]
+
+
+def test_resume_only_evaluates_missing_items(workdir, make_config):
+    cfg = make_config(limit=6)
+    first = _CountingAdapter("mock-1", 0.0, 1.0, 64)
+    _, full = Evaluator(cfg, "resume", adapter=first).run()
+    assert len(first.ids) == 6
+
+    # Simulate a crash after three items, the last one half written.
+    path = predictions_path("resume")
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:3])
+        f.write(lines[3][:20])
+
+    second = _CountingAdapter("mock-1", 0.0, 1.0, 64)
+    evaluator = Evaluator(cfg, "resume", resume=True, adapter=second)
+    _, resumed = evaluator.run()
+
+    done = [json.loads(line)["id"] for line in lines[:3]]
+    assert sorted(second.ids) == sorted(set(full["id"]) - set(done))
+    assert list(resumed["id"]) == list(full["id"])
+    assert list(resumed["acc"]) == list(full["acc"])
+    # Throughput counts only the items generated by this invocation.
+    assert evaluator.throughput["n_items"] == 3
+
+
+def test_resume_of_a_finished_run_calls_no_model(workdir, make_config):
+    cfg = make_config(limit=4)
+    Evaluator(cfg, "finished", adapter=_CountingAdapter("mock-1", 0.0, 1.0, 64)).run()
+
+    adapter = _CountingAdapter("mock-1", 0.0, 1.0, 64)
+    evaluator = Evaluator(cfg, "finished", resume=True, adapter=adapter)
+    _, per_item = evaluator.run()
+
+    assert adapter.ids == []
+    assert len(per_item) == 4
+    assert evaluator.throughput["n_items"] == 0
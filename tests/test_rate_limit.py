@@ -0,0 +1,119 @@
+"""Shared rate limits and retries: what is retried, what becomes an error row, what propagates."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.adapters import rate_limit
+from src.adapters.bounded import BoundedAdapter
+from src.adapters.cache import CachedAdapter
+from src.adapters.mock_adapter import MockAdapter
+from src.adapters.rate_limit import (
+    AdapterError,
+    ProviderLimits,
+    RetryPolicy,
+    TokenBucket,
+    acall_with_retries,
+    call_with_retries,
+    configure_rate_limits,
+    provider_limits,
+)
+from src.adapters.streaming import StreamingAdapter
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _limits(max_retries=3):
+    return ProviderLimits(policy=RetryPolicy(max_retries=max_retries, base_delay=0.001, max_delay=0.001))
+
+
+def _failing(errors, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def test_retryable_provider_errors_are_retried():
+    fn, calls = _failing([_ProviderError(503), ConnectionError("reset")])
+
+    assert call_with_retries(fn, _limits(), tokens=0) == ("ok", 3)
+    assert len(calls) == 3
+
+
+def test_non_retryable_provider_error_becomes_adapter_error():
+    fn, calls = _failing([_ProviderError(400)])
+
+    with pytest.raises(AdapterError, match="HTTP 400"):
+        call_with_retries(fn, _limits(), tokens=0)
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_max_retries():
+    fn, calls = _failing([_ProviderError(503)] * 10)
+
+    with pytest.raises(AdapterError) as info:
+        call_with_retries(fn, _limits(max_retries=2), tokens=0)
+    assert info.value.attempts == 3
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("bug", [TypeError("bad arg"), KeyError("choices"), AttributeError("no attr")])
+def test_bugs_in_adapter_code_propagate_unchanged(bug):
+    fn, calls = _failing([bug])
+
+    with pytest.raises(type(bug)):
+        call_with_retries(fn, _limits(), tokens=0)
+    assert len(calls) == 1
+
+
+def test_async_bugs_propagate_and_provider_errors_are_retried():
+    async def bug():
+        raise KeyError("choices")
+
+    errors = [_ProviderError(429)]
+
+    async def flaky():
+        if errors:
+            raise errors.pop()
+        return "ok"
+
+    with pytest.raises(KeyError):
+        asyncio.run(acall_with_retries(bug, _limits(), tokens=0))
+    assert asyncio.run(acall_with_retries(flaky, _limits(), tokens=0)) == ("ok", 2)
+
+
+def test_token_bucket_reports_wait_once_empty():
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_configure_rate_limits_sets_budgets_exactly_per_model():
+    limits = configure_rate_limits("test-provider", rpm=100, tpm=None, model="a")
+    assert limits.rpm is not None and limits.tpm is None
+    assert provider_limits("test-provider", "b").rpm is None
+
+    configure_rate_limits("test-provider", rpm=None, model="a")
+    assert provider_limits("test-provider", "a").rpm is None
+
+
+def test_wrapper_adapters_share_inner_limits_without_registering_their_own():
+    inner = MockAdapter("wrapped-model", 0.0, 1.0, 64)
+    before = set(rate_limit._LIMITS)
+
+    wrapped = BoundedAdapter(CachedAdapter(StreamingAdapter(inner), "mock", cache=None), threading.BoundedSemaphore(1))
+
+    assert wrapped.limits is inner.limits
+    assert set(rate_limit._LIMITS) == before